@@ -0,0 +1,49 @@
+# ============================================================================
+# POSTGRESQL BACKEND - Django's PostgreSQL backend, timing new connections
+# ============================================================================
+# Opening a PostgreSQL connection (TCP, TLS and authentication) costs far
+# more than the queries our views run. This backend logs how long each new
+# connection took and keeps running totals, so the effect of
+# DB_CONNECTION_MODE (see config/settings.py) can be read from the logs.
+# With the connection pool, "connecting" is checking a connection out of
+# the pool, which is exactly the cost a request pays.
+
+import logging
+import time
+
+from django.db.backends.postgresql import base
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL connection wrapper that records connect time.
+
+    Attributes:
+        connect_count (int): Connections opened by this wrapper
+        connect_time (float): Total seconds spent opening them
+        last_connect_time (float): Seconds spent opening the latest one
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connect_count = 0
+        self.connect_time = 0.0
+        self.last_connect_time = 0.0
+
+    def get_new_connection(self, conn_params):
+        start = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        elapsed = time.perf_counter() - start
+
+        self.connect_count += 1
+        self.connect_time += elapsed
+        self.last_connect_time = elapsed
+        logger.info(
+            "Opened database connection %s in %.1f ms "
+            "(%d opened, %.1f ms average)",
+            self.alias, elapsed * 1000, self.connect_count,
+            self.connect_time / self.connect_count * 1000,
+        )
+        return connection
@@ -0,0 +1,68 @@
+# ============================================================================
+# GUNICORN CONFIG - Server profiles for the web process
+# ============================================================================
+# SERVER_PROFILE picks how the site is served:
+#   wsgi   sync gunicorn workers running config.wsgi, each handling
+#          GUNICORN_THREADS requests at a time (default)
+#   asgi   uvicorn workers under gunicorn running config.asgi; the booking,
+#          contact and autocomplete views are then async, so one worker
+#          keeps serving while requests wait on the database
+# WEB_CONCURRENCY sets the number of worker processes in both profiles.
+#
+# Workers start warm (see core/warmup.py): with GUNICORN_PRELOAD=1 (default)
+# the master loads the app and compiles templates and URLs once before
+# forking; otherwise each worker does so after loading it. Each worker then
+# opens its connections before taking requests.
+#
+# APP_PROFILE (config/settings.py) picks what the workers serve: the whole
+# site, only the public pages, or only the admin. Running the public and
+# admin profiles as separate apps keeps the admin's apps out of the public
+# workers.
+#
+# Usage:
+#     gunicorn -c config/gunicorn.conf.py
+#     SERVER_PROFILE=asgi gunicorn -c config/gunicorn.conf.py
+#     APP_PROFILE=public gunicorn -c config/gunicorn.conf.py
+
+import os
+
+SERVER_PROFILE = os.environ.get("SERVER_PROFILE", "wsgi")
+
+if SERVER_PROFILE == "wsgi":
+    wsgi_app = "config.wsgi:application"
+    threads = int(os.environ.get("GUNICORN_THREADS", 1))
+elif SERVER_PROFILE == "asgi":
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    raise RuntimeError(
+        f"Unknown SERVER_PROFILE {SERVER_PROFILE!r}, expected wsgi or asgi."
+    )
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+
+def when_ready(server):
+    """Warm the preloaded app in the master, before any worker forks."""
+    if preload_app:
+        from core import warmup
+
+        timings = warmup.warm_up_process()
+        server.log.info("Warm-up (master): %s", warmup.format_timings(timings))
+
+
+def post_worker_init(worker):
+    """Warm a worker after it has loaded the app, before it serves."""
+    from core import warmup
+
+    timings = [] if preload_app else warmup.warm_up_process()
+    # The sync worker serves requests on this thread; threaded and async
+    # workers serve them on other threads, with their own connections
+    timings += warmup.warm_up_connections(
+        serving_thread=SERVER_PROFILE == "wsgi" and threads == 1
+    )
+    worker.log.info(
+        "Warm-up (worker %s): %s", worker.pid, warmup.format_timings(timings)
+    )
@@ -11,9 +11,11 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 import sys
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 if os.path.isfile("env.py"):
     import env
@@ -48,6 +50,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
     "allauth",
     "allauth.account",
     "allauth.socialaccount",
@@ -62,6 +65,41 @@ INSTALLED_APPS = [
     "core",
 ]
 
+# App profile: what this process serves, so public and admin traffic can
+# run as separate deployments (e.g. two Heroku apps sharing the database,
+# with the admin one answering on its own host) from the same settings:
+#   full     the whole site (default; also for manage.py commands)
+#   public   the visitor pages, booking and contact views and the accounts
+#            pages, without the admin, Summernote and autocomplete apps, so
+#            public workers neither import nor keep them in memory
+#   admin    admin/, summernote/ and the admin's autocomplete views
+# No middleware is admin-only, so both profiles keep the same MIDDLEWARE.
+# Run migrations and collectstatic under "full", which has every app's
+# models and static files. "python manage.py startup_report --profile
+# public --profile admin" compares the profiles' startup cost.
+APP_PROFILE = os.environ.get("APP_PROFILE", "full")
+
+if APP_PROFILE not in ("full", "public", "admin"):
+    raise ImproperlyConfigured(f"Unknown APP_PROFILE {APP_PROFILE!r}.")
+
+SERVE_PUBLIC = APP_PROFILE in ("full", "public")
+SERVE_ADMIN = APP_PROFILE in ("full", "admin")
+
+# Apps only the admin uses. Social accounts have no providers configured,
+# so the public login page does not need them.
+ADMIN_ONLY_APPS = [
+    "django.contrib.admin",
+    "allauth.socialaccount",
+    "django_summernote",
+    "dal",
+    "dal_select2",
+]
+
+if not SERVE_ADMIN:
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS if app not in ADMIN_ONLY_APPS
+    ]
+
 # Site ID for django.contrib.sites
 SITE_ID = 1
 LOGIN_REDIRECT_URL = "/"
@@ -69,18 +107,21 @@ LOGOUT_REDIRECT_URL = "/"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media/")
-DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.PerformanceMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
+    "core.middleware.CatalogVersionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "core.middleware.FlashMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -90,7 +131,9 @@ ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Django's backend, timing renders for PerformanceMiddleware
+        "BACKEND": "core.template_backends.TimedDjangoTemplates",
+        "NAME": "django",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -108,11 +151,217 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# https://docs.djangoproject.com/en/5.2/ref/databases/#persistent-connections
+# Opening a connection costs more than the queries of most views, so
+# connections are reused. DB_CONNECTION_MODE picks how:
+#   persistent  each gunicorn thread keeps its connection for
+#               DB_CONN_MAX_AGE seconds, health-checked before reuse (default)
+#   pool        a psycopg 3 connection pool per worker, one connection per
+#               thread (psycopg-pool, pinned in requirements.txt)
+#   pgbouncer   persistent connections to PgBouncer in transaction pooling
+#               mode, with server-side cursors disabled as it requires
+#   none        a new connection for every request
+# Connections opened add up to WEB_CONCURRENCY x GUNICORN_THREADS per dyno,
+# which must stay below the database's connection limit.
+
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 2))
+GUNICORN_THREADS = int(os.environ.get("GUNICORN_THREADS", 1))
+
+# Server profile (config/gunicorn.conf.py): "wsgi" runs sync gunicorn
+# workers, "asgi" runs uvicorn workers under gunicorn. config/asgi.py sets
+# ASYNC_VIEWS, which routes the booking, contact and autocomplete URLs to
+# their async versions in core/async_views.py and core/autocomplete.py.
+SERVER_PROFILE = os.environ.get("SERVER_PROFILE", "wsgi")
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "0") == "1"
+
+DB_CONNECTION_MODE = os.environ.get("DB_CONNECTION_MODE", "persistent")
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 600))
+
+if DB_CONNECTION_MODE not in ("persistent", "pool", "pgbouncer", "none"):
+    raise ImproperlyConfigured(
+        f"Unknown DB_CONNECTION_MODE {DB_CONNECTION_MODE!r}."
+    )
+
+DATABASES = {
+    "default": dj_database_url.parse(
+        os.environ.get("DATABASE_URL"),
+        conn_max_age=(
+            DB_CONN_MAX_AGE
+            if DB_CONNECTION_MODE in ("persistent", "pgbouncer") else 0
+        ),
+        conn_health_checks=DB_CONNECTION_MODE != "none",
+        disable_server_side_cursors=DB_CONNECTION_MODE == "pgbouncer",
+    )
+}
 
-DATABASES = {"default": dj_database_url.parse(os.environ.get("DATABASE_URL"))}
+if SERVER_PROFILE == "asgi" and DB_CONNECTION_MODE == "persistent":
+    # Under ASGI each request gets its own connection object, so kept-open
+    # connections would pile up instead of being reused; use "pool" there
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    # Same backend, logging how long each new connection takes
+    DATABASES["default"]["ENGINE"] = "config.db.postgresql"
+    if DB_CONNECTION_MODE == "pool":
+        if importlib.util.find_spec("psycopg_pool") is None:
+            raise ImproperlyConfigured(
+                'DB_CONNECTION_MODE "pool" needs psycopg-pool: '
+                'pip install -r requirements.txt.'
+            )
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "min_size": 1,
+            "max_size": GUNICORN_THREADS,
+            # Seconds a request waits for a free connection before failing
+            "timeout": 10,
+        }
 
 if "test" in sys.argv:
     DATABASES["default"]["ENGINE"] = "django.db.backends.sqlite3"
+    DATABASES["default"].pop("OPTIONS", None)
+
+# Queries one request may run before it is logged (or, in tests, fails).
+# Views with a different need declare it with core.middleware.query_budget.
+QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", 30))
+QUERY_BUDGET_RAISE = "test" in sys.argv
+
+# Request timing (core.middleware.PerformanceMiddleware): Server-Timing
+# headers for staff, and a log line for requests slower than
+# PERF_SLOW_REQUEST_MS milliseconds. Off unless PERF_INSTRUMENTATION=1.
+PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "0") == "1"
+PERF_SLOW_REQUEST_MS = int(os.environ.get("PERF_SLOW_REQUEST_MS", 500))
+
+
+# Caching
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The cache must be shared by every process that serves the site: it holds
+# the catalog version an admin save bumps and the rate limit counters.
+# Redis is required on Heroku (detected by the DYNO variable), where each
+# dyno has its own disk; with separate public and admin apps (APP_PROFILE),
+# attach the same Redis add-on to both. Elsewhere, without REDIS_URL, a
+# file-based cache is shared by the workers of this one machine.
+
+ON_HEROKU = "DYNO" in os.environ
+
+if ON_HEROKU and not os.environ.get("REDIS_URL"):
+    raise ImproperlyConfigured(
+        "REDIS_URL must be set on Heroku: the cache has to be shared by "
+        "every dyno."
+    )
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get(
+                "CACHE_DIR", "/tmp/helpful-living-cache"
+            ),
+        }
+    }
+
+if "test" in sys.argv:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Seconds the shared cache keeps the service catalog (None = until changed)
+CATALOG_CACHE_TIMEOUT = None
+
+# Seconds rendered service fragments are kept. Keys include the service's
+# updated_on, RELEASE_VERSION and a hash of the template, so this only
+# bounds how long superseded fragments linger.
+SERVICE_FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds a guest access token stays mapped to its booking id, so repeat
+# visits from an emailed link find the booking by primary key
+BOOKING_TOKEN_CACHE_TIMEOUT = 60 * 5
+
+# Rate limits of guest POSTs (core.ratelimit): per scope, the requests
+# allowed per client IP and per access-token prefix, as (requests, seconds)
+# over a sliding window. RATELIMIT_BACKEND keeps the counters in the shared
+# cache, which needs Redis (file-based cache increments are neither atomic
+# nor shared between machines), or per process with
+# core.ratelimit.LocalRateLimitBackend, the default without REDIS_URL.
+# RATELIMIT_PROXY_COUNT is the number of proxies in front of the app that
+# append to X-Forwarded-For: Heroku's router is one, so it defaults to 1
+# there; elsewhere, unless set, clients are told apart by REMOTE_ADDR.
+FILE_BASED_CACHE = CACHES["default"]["BACKEND"].endswith(".FileBasedCache")
+
+RATELIMIT_ENABLED = os.environ.get("RATELIMIT_ENABLED", "1") == "1"
+RATELIMIT_BACKEND = os.environ.get(
+    "RATELIMIT_BACKEND",
+    "core.ratelimit.LocalRateLimitBackend" if FILE_BASED_CACHE
+    else "core.ratelimit.CacheRateLimitBackend",
+)
+if (RATELIMIT_BACKEND == "core.ratelimit.CacheRateLimitBackend"
+        and FILE_BASED_CACHE):
+    raise ImproperlyConfigured(
+        "core.ratelimit.CacheRateLimitBackend needs REDIS_URL: counters in "
+        "the file-based cache are neither atomic nor shared."
+    )
+RATELIMIT_PROXY_COUNT = int(
+    os.environ.get("RATELIMIT_PROXY_COUNT", 1 if ON_HEROKU else 0)
+)
+RATELIMIT_TOKEN_PREFIX_LENGTH = 8
+RATELIMITS = {
+    # Access key lookups on booking_info
+    "access_key": {"ip": (20, 60), "token": (10, 60)},
+    # edit_booking and cancel_booking
+    "booking_change": {"ip": (20, 60), "token": (10, 60)},
+    "contact": {"ip": (5, 10 * 60)},
+}
+
+# Identifies the deployed release (set by Heroku's dyno metadata), so
+# conditional GET validators change when templates do
+RELEASE_VERSION = os.environ.get("HEROKU_RELEASE_VERSION", "")
+
+# Seconds clients and shared caches may reuse public API responses before
+# revalidating them with their ETag
+API_CACHE_MAX_AGE = 60
+
+# Dotted path of the admin autocomplete search backend. When unset, the
+# trigram backend is used on PostgreSQL and the contains backend elsewhere.
+AUTOCOMPLETE_SEARCH_BACKEND = os.environ.get("AUTOCOMPLETE_SEARCH_BACKEND")
+
+# Maximum number of bookings whose time windows may overlap on one day
+BOOKING_SLOT_CAPACITY = int(os.environ.get("BOOKING_SLOT_CAPACITY", 3))
+
+# Contact form write-behind spool (core/spool.py): a Redis list under
+# CONTACT_SPOOL_KEY, shared by the web dynos and drained by the worker dyno
+# (`manage.py flush_contacts --loop`). Messages are inserted once BATCH_SIZE
+# are queued or the oldest has waited MAX_DELAY seconds. Without a Redis URL
+# each message is inserted as it is submitted, and no worker is needed.
+CONTACT_SPOOL_URL = os.environ.get(
+    "CONTACT_SPOOL_URL", os.environ.get("REDIS_URL", "")
+)
+CONTACT_SPOOL_KEY = os.environ.get("CONTACT_SPOOL_KEY", "core:contacts")
+
+if "test" in sys.argv:
+    # Tests insert directly; the spool tests bring their own Redis
+    CONTACT_SPOOL_URL = ""
+CONTACT_SPOOL_BATCH_SIZE = 100
+CONTACT_SPOOL_MAX_DELAY = 2.0
+
+
+# Sessions
+# Booking outcomes travel in a signed flash cookie (core/flash.py), so guests
+# need no session. With ANONYMOUS_SESSIONS=0, sessions are only saved once a
+# user logs in and anonymous traffic makes no session writes at all. The
+# default keeps anonymous sessions because allauth's password reset needs
+# one: the link's key is moved into the session of the signed-out visitor
+# before the new password form is shown, and would otherwise be lost.
+
+ANONYMOUS_SESSIONS = os.environ.get("ANONYMOUS_SESSIONS", "1") == "1"
+if not ANONYMOUS_SESSIONS:
+    SESSION_ENGINE = "core.sessions"
 
 
 # Password validation
@@ -182,8 +431,24 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
-# WhiteNoise configuration
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# Media on Cloudinary; static files fingerprinted and compressed by
+# WhiteNoise, which serves the fingerprinted names as immutable (cached for
+# a year). The front-end bundles in static/dist/ come from build_assets,
+# run before collectstatic (see bin/post_compile).
+STORAGES = {
+    "default": {
+        "BACKEND": "cloudinary_storage.storage.MediaCloudinaryStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+if "test" in sys.argv:
+    # Tests render templates without running collectstatic first
+    STORAGES["staticfiles"]["BACKEND"] = (
+        "django.contrib.staticfiles.storage.StaticFilesStorage"
+    )
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -194,3 +459,26 @@ CSRF_TRUSTED_ORIGINS = [
     "https://*.codeinstitute-ide.net/",
     "https://*.herokuapp.com",
 ]
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+# Project loggers (connection timing, query budgets) write to the console,
+# which Heroku collects.
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "config": {
+            "handlers": ["console"],
+            "level": os.environ.get("LOG_LEVEL", "INFO"),
+        },
+        "core": {
+            "handlers": ["console"],
+            "level": os.environ.get("LOG_LEVEL", "INFO"),
+        },
+    },
+}
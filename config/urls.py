@@ -1,15 +1,28 @@
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 
-urlpatterns = [
-    path("admin/", admin.site.urls),
-    path("accounts/", include("allauth.urls")),
-    path("summernote/", include("django_summernote.urls")),
-    path("", include("core.urls")),
-]
-
-# Custom error handlers
-handler404 = 'core.views.handler404'
-handler403 = 'core.views.handler403'
-handler500 = 'core.views.handler500'
-handler400 = 'core.views.handler400'
+# Which parts are routed depends on APP_PROFILE (see config/settings.py).
+# The admin is imported here, not at the top, so public workers never load
+# it.
+urlpatterns = []
+
+if settings.SERVE_ADMIN:
+    from django.contrib import admin
+
+    urlpatterns += [
+        path("admin/", admin.site.urls),
+        path("summernote/", include("django_summernote.urls")),
+        path("", include("core.admin_urls")),
+    ]
+
+if settings.SERVE_PUBLIC:
+    urlpatterns += [
+        path("accounts/", include("allauth.urls")),
+        path("", include("core.urls")),
+    ]
+
+    # Custom error handlers; their templates link to the public pages
+    handler404 = 'core.views.handler404'
+    handler403 = 'core.views.handler403'
+    handler500 = 'core.views.handler500'
+    handler400 = 'core.views.handler400'
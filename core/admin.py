@@ -1,8 +1,80 @@
-from django.contrib import admin
+import io
+from itertools import batched
+
+from django.contrib import admin, messages
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from .models import Service, ClientList, Booking, Contact
-from . import forms
+from . import admin_forms, resolvers, scheduling
+from .pagination import EstimatedCountPaginator
+from .transfer import BOOKING_FIELDS, CLIENT_FIELDS, RowWriter, slugs_by_owner
 from django_summernote.admin import SummernoteModelAdmin
 
+# Bookings fetched per round trip by the CSV export
+EXPORT_CHUNK_SIZE = 2_000
+
+
+def export_booking_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield one core.transfer row per booking in a queryset.
+
+    Bookings are read as tuples through QuerySet.iterator(), which uses a
+    server-side cursor on PostgreSQL, and service slugs are looked up once
+    per chunk. Memory use stays flat whatever the number of bookings.
+
+    Args:
+        queryset (QuerySet): Bookings to export, in export order
+        chunk_size (int): Rows fetched per round trip
+
+    Yields:
+        dict: Row keyed by core.transfer.COLUMNS
+    """
+    columns = (
+        ("pk", "client_id")
+        + tuple(f"client__{field}" for field in CLIENT_FIELDS)
+        + BOOKING_FIELDS
+    )
+    rows = queryset.values_list(*columns).iterator(chunk_size=chunk_size)
+    for chunk in batched(rows, chunk_size):
+        linked = slugs_by_owner(
+            ClientList.linked_services.through, "clientlist_id",
+            [values[1] for values in chunk],
+        )
+        booked = slugs_by_owner(
+            Booking.services.through, "booking_id",
+            [values[0] for values in chunk],
+        )
+        for values in chunk:
+            booking_pk, client_pk = values[:2]
+            row = dict(zip(CLIENT_FIELDS + BOOKING_FIELDS, values[2:]))
+            row["linked_services"] = linked[client_pk]
+            row["services"] = booked[booking_pk]
+            row["booking_date"] = row["booking_date"].isoformat()
+            yield row
+
+
+def stream_csv(rows):
+    """
+    Render rows as CSV text, one piece per batch of rows.
+
+    Args:
+        rows (iterable): Rows keyed by core.transfer.COLUMNS
+
+    Yields:
+        str: The header line, then the CSV lines of each batch
+    """
+    buffer = io.StringIO()
+    writer = RowWriter(buffer, "csv")
+    for batch in batched(rows, EXPORT_CHUNK_SIZE):
+        for row in batch:
+            writer.write(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, when nothing was selected
+    yield buffer.getvalue()
+
 
 # Register your models here.
 
@@ -20,17 +92,20 @@ class ServiceAdmin(SummernoteModelAdmin):
 
 @admin.register(ClientList)
 class ClientListAdmin(admin.ModelAdmin):
-    form = forms.ClientListAdminForm
+    form = admin_forms.ClientListAdminForm
     list_display = ("first_name", "last_name", "email", "phone_number", "is_client")
     search_fields = ["first_name", "last_name", "email", "phone_number"]
     list_filter = (
         "is_client",
     )
+    # Large tables: estimate the row count instead of counting twice
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
-    form = forms.BookingAdminForm
+    form = admin_forms.BookingAdminForm
     list_display = (
         "client__first_name",
         "client__last_name",
@@ -50,6 +125,85 @@ class BookingAdmin(admin.ModelAdmin):
         "booking_date",
         "client__is_client"
     )
+    # Join the client into the changelist query instead of one query per row
+    list_select_related = ("client",)
+    # Backed by the booking_date_created_idx index
+    date_hierarchy = "booking_date"
+    # Large tables: estimate the row count instead of counting twice
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = admin_forms.BookingActionForm
+
+    # Confirming and rescheduling run as one UPDATE, whatever the selection
+    # size. That bypasses Booking signals, so rescheduling drops the cached
+    # guest lookups of the moved bookings itself once the transaction
+    # commits.
+
+    def confirm_selected(self, request, queryset):
+        """Action to confirm selected bookings"""
+        with transaction.atomic():
+            updated = queryset.update(
+                is_confirmed=True, updated_on=timezone.now()
+            )
+        self.message_user(request, f"{updated} booking(s) confirmed.")
+    confirm_selected.short_description = "Confirm selected bookings"
+
+    def reschedule_selected(self, request, queryset):
+        """Action to move selected bookings to the chosen date"""
+        form = self.action_form(request.POST, auto_id=None)
+        form.fields["action"].choices = self.get_action_choices(request)
+        if not form.is_valid() or not form.cleaned_data["reschedule_date"]:
+            errors = form.errors.get("reschedule_date")
+            self.message_user(
+                request,
+                errors[0] if errors else "Choose a date to reschedule to.",
+                messages.ERROR,
+            )
+            return
+        new_date = form.cleaned_data["reschedule_date"]
+        try:
+            with transaction.atomic():
+                scheduling.reserve_day(new_date, queryset)
+                digests = list(
+                    queryset.values_list("token_digest", flat=True)
+                )
+                updated = queryset.update(
+                    booking_date=new_date, updated_on=timezone.now()
+                )
+                transaction.on_commit(
+                    lambda: resolvers.forget_token_bookings(digests)
+                )
+        except scheduling.SlotUnavailable as error:
+            self.message_user(request, str(error), messages.ERROR)
+            return
+        self.message_user(
+            request, f"{updated} booking(s) moved to {new_date:%d %b %Y}."
+        )
+    reschedule_selected.short_description = "Reschedule selected bookings"
+
+    def cancel_selected(self, request, queryset):
+        """Action to cancel selected bookings, keeping their clients"""
+        with transaction.atomic():
+            # Runs the cascades and post_delete signals
+            cancelled = queryset.delete()[1].get(Booking._meta.label, 0)
+        self.message_user(request, f"{cancelled} booking(s) cancelled.")
+    cancel_selected.short_description = "Cancel selected bookings"
+
+    def export_csv(self, request, queryset):
+        """Action to download selected bookings in the import format"""
+        response = StreamingHttpResponse(
+            stream_csv(export_booking_rows(queryset)),
+            content_type="text/csv",
+        )
+        stamp = timezone.localtime().strftime("%Y%m%d-%H%M")
+        response["Content-Disposition"] = (
+            f'attachment; filename="bookings-{stamp}.csv"'
+        )
+        return response
+    export_csv.short_description = "Export selected bookings as CSV"
+
+    actions = [confirm_selected, reschedule_selected, cancel_selected,
+               export_csv]
 
 
 @admin.register(Contact)
@@ -58,6 +212,9 @@ class ContactAdmin(admin.ModelAdmin):
     search_fields = ["name", "email", "message"]
     list_filter = ("is_read", "created_on")
     readonly_fields = ("created_on",)
+    # Large tables: estimate the row count instead of counting twice
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     def mark_as_read(self, request, queryset):
         """Action to mark selected messages as read"""
@@ -0,0 +1,191 @@
+# ============================================================================
+# ADMIN FORMS MODULE - Form classes for the admin interface
+# ============================================================================
+# Admin forms with Select2 autocomplete widgets and the bookings changelist
+# action form. Only core/admin.py imports this module, so processes that
+# do not serve the admin (APP_PROFILE=public) never load the admin or
+# django-autocomplete-light.
+
+import uuid
+
+from dal import autocomplete  # Django Autocomplete Light for Select2 widgets
+from django import forms
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AdminDateWidget
+from django.utils import timezone
+
+from .models import ClientList, Booking
+
+
+def create_autocomplete_form(
+    model_class, autocomplete_fields=None, readonly_fields=None
+):
+    """
+    Factory function to create ModelForm classes with autocomplete widgets.
+
+    This function dynamically generates form classes with Select2 autocomplete
+    widgets for foreign key and many-to-many fields. It's used in the admin
+    interface to provide user-friendly dropdown selection with search
+    functionality.
+
+    Args:
+        model_class (Model): The Django model class to create a form for
+        autocomplete_fields (dict, optional): Mapping of field names to
+                                            autocomplete configurations.
+                                            Format:
+                                            {'field_name': {
+                                                'url': 'autocomplete-url',
+                                                'multiple': True/False
+                                            }}
+        readonly_fields (list, optional): List of field names to make read-only
+                                        with special styling
+
+    Returns:
+        type: A dynamically created ModelForm class with autocomplete widgets
+
+    Example:
+        MyForm = create_autocomplete_form(
+            MyModel,
+            autocomplete_fields={
+                'user': {'url': 'user-autocomplete', 'multiple': False}
+            },
+            readonly_fields=['access_token']
+        )
+    """
+    if autocomplete_fields is None:
+        autocomplete_fields = {}
+    if readonly_fields is None:
+        readonly_fields = []
+
+    # Build widgets dictionary for form customization
+    form_widgets = {}
+
+    # Configure autocomplete widgets for specified fields
+    for field_name, config in autocomplete_fields.items():
+        url = config.get("url")
+        multiple = config.get("multiple", False)
+
+        # Use appropriate Select2 widget based on field type
+        if multiple:
+            # For many-to-many fields - allows multiple selections
+            form_widgets[field_name] = autocomplete.ModelSelect2Multiple(
+                url=url
+            )
+        else:
+            # For foreign key fields - single selection
+            form_widgets[field_name] = autocomplete.ModelSelect2(url=url)
+
+    # Configure readonly widgets with special styling
+    for field_name in readonly_fields:
+        form_widgets[field_name] = forms.TextInput(
+            attrs={
+                "readonly": "readonly",
+                "style": "background-color: #f8f9fa;"
+            }
+        )
+
+    class AutocompleteForm(forms.ModelForm):
+        """
+        Dynamically created ModelForm with autocomplete and readonly
+        functionality.
+
+        This inner class is created by the factory function and includes all
+        the configured widgets and field behaviors specified in the parameters.
+        """
+        class Meta:
+            model = model_class
+            fields = "__all__"
+            widgets = form_widgets
+
+        def __init__(self, *args, **kwargs):
+            """
+            Initialize form with special field handling.
+
+            Sets up autocomplete widgets, readonly fields, and automatic
+            token generation for new instances.
+            """
+            super().__init__(*args, **kwargs)
+
+            # Auto-generate unique access_token for new instances
+            # This ensures each new record has a unique identifier
+            if "access_token" in self.fields and not self.instance.pk:
+                self.fields["access_token"].initial = str(uuid.uuid4())
+
+            # Ensure readonly fields are properly configured
+            # Adds readonly attribute to prevent user modification
+            for field_name in readonly_fields:
+                if field_name in self.fields:
+                    self.fields[field_name].widget.attrs["readonly"] = True
+
+    return AutocompleteForm
+
+
+# ============================================================================
+# ADMIN FORM INSTANCES - Pre-configured forms for admin interface
+# ============================================================================
+# These form instances are created using the factory function above and are
+# specifically configured for use in the Django admin interface with
+# autocomplete functionality for better user experience.
+
+# ClientList admin form with autocomplete for user and services
+ClientListAdminForm = create_autocomplete_form(
+    ClientList,
+    autocomplete_fields={
+        # Single user selection
+        "user": {"url": "user-autocomplete", "multiple": False},
+        # Multiple services selection
+        "linked_services": {
+            "url": "service-autocomplete",
+            "multiple": True
+        },
+    },
+)
+
+# Booking admin form with autocomplete (the access token is not editable;
+# only its digest is stored)
+BookingAdminForm = create_autocomplete_form(
+    Booking,
+    autocomplete_fields={
+        # Single client selection
+        "client": {"url": "client-autocomplete", "multiple": False},
+        # Multiple services selection
+        "services": {
+            "url": "service-autocomplete",
+            "multiple": True
+        },
+    },
+)
+
+
+class BookingActionForm(ActionForm):
+    """
+    Changelist action form for the bookings admin.
+
+    Adds the target date used by the "Reschedule selected bookings" action
+    next to the action dropdown. The date is optional so the other actions
+    can run without it.
+
+    Attributes:
+        reschedule_date (DateField): New date for rescheduled bookings
+    """
+
+    reschedule_date = forms.DateField(
+        required=False,
+        label="Reschedule to",
+        widget=AdminDateWidget,
+    )
+
+    def clean_reschedule_date(self):
+        """
+        Reject dates in the past.
+
+        Returns:
+            date | None: The cleaned date
+
+        Raises:
+            ValidationError: If the date is before today
+        """
+        value = self.cleaned_data.get("reschedule_date")
+        if value and value < timezone.localdate():
+            raise forms.ValidationError("Bookings cannot be moved into the past.")
+        return value
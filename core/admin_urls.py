@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.urls import path
+from . import autocomplete
+
+# Only included where the admin is served (see config/urls.py), as the
+# autocomplete views exist for the admin's forms
+if settings.ASYNC_VIEWS:
+    service_view = autocomplete.AsyncServiceAutocomplete
+    user_view = autocomplete.AsyncUserAutocomplete
+    client_view = autocomplete.AsyncClientAutocomplete
+else:
+    service_view = autocomplete.ServiceAutocomplete
+    user_view = autocomplete.UserAutocomplete
+    client_view = autocomplete.ClientAutocomplete
+
+urlpatterns = [
+    path(
+        "service-autocomplete/",
+        service_view.as_view(),
+        name="service-autocomplete",
+    ),
+    path(
+        "user-autocomplete/",
+        user_view.as_view(),
+        name="user-autocomplete",
+    ),
+    path(
+        "client-autocomplete/",
+        client_view.as_view(),
+        name="client-autocomplete",
+    ),
+]
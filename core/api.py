@@ -0,0 +1,131 @@
+# ============================================================================
+# API MODULE - JSON encoding of the public read-only services API
+# ============================================================================
+# The API is polled heavily by the mobile app and partner sites, mostly for
+# a catalog that has not changed. Each service is therefore encoded once
+# per catalog version: every API field becomes a ready-made '"name":value'
+# JSON fragment, kept in process memory. Serving a response, whatever
+# sparse fieldset it asks for, only joins those fragments, and the list
+# endpoint streams them out in chunks instead of building one big string.
+
+import json
+import threading
+
+from . import catalog
+from .images import PLACEHOLDER_PUBLIC_ID
+
+# Fields clients may request with ?fields=, mapped to their value getter
+API_FIELDS = {
+    "service_name": lambda service: service.service_name,
+    "slug": lambda service: service.slug,
+    "excerpt": lambda service: service.excerpt,
+    "image_url": lambda service: _image_url(service),
+}
+
+# Services written per chunk of a streamed list response
+STREAM_CHUNK_SIZE = 100
+
+# Encoded catalog held by this process, replaced when the version moves on
+_local = {"version": None, "encoded": None}
+_lock = threading.Lock()
+
+
+class InvalidFields(ValueError):
+    """Raised when ?fields= names a field the API does not expose."""
+
+
+def _image_url(service):
+    """Return the secure URL of the service's original image, or None."""
+    image = service.image_url
+    public_id = getattr(image, "public_id", image)
+    if not public_id or public_id == PLACEHOLDER_PUBLIC_ID:
+        return None
+    return image.build_url(secure=True)
+
+
+def parse_fields(value):
+    """
+    Parse a sparse fieldset parameter.
+
+    Args:
+        value (str | None): Comma-separated field names, e.g. "slug,excerpt"
+
+    Returns:
+        tuple: Requested field names in API_FIELDS order (all when empty)
+
+    Raises:
+        InvalidFields: If an unknown field is requested
+    """
+    if not value:
+        return tuple(API_FIELDS)
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - API_FIELDS.keys()
+    if unknown:
+        raise InvalidFields(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(API_FIELDS)}."
+        )
+    return tuple(name for name in API_FIELDS if name in requested)
+
+
+def _encode_service(service):
+    """Encode every API field of a service as a '"name":value' fragment."""
+    return {
+        name: f"{json.dumps(name)}:{json.dumps(getter(service))}"
+        for name, getter in API_FIELDS.items()
+    }
+
+
+def encoded_catalog():
+    """
+    Return the encoded fields of every available service.
+
+    Returns:
+        dict: Mapping of slug to encoded fields, in catalog order
+    """
+    snapshot = catalog.get_catalog()
+    if _local["version"] == snapshot.version:
+        return _local["encoded"]
+    with _lock:
+        if _local["version"] != snapshot.version:
+            _local["encoded"] = {
+                service.slug: _encode_service(service)
+                for service in snapshot.services
+            }
+            _local["version"] = snapshot.version
+        return _local["encoded"]
+
+
+def render_object(encoded, fields):
+    """
+    Join the encoded fields of one service into a JSON object.
+
+    Args:
+        encoded (dict): Encoded fields from encoded_catalog()
+        fields (tuple): Field names to include
+
+    Returns:
+        str: JSON object
+    """
+    return "{" + ",".join(encoded[name] for name in fields) + "}"
+
+
+def stream_list(fields):
+    """
+    Yield the JSON list response for all services in chunks.
+
+    Args:
+        fields (tuple): Field names to include
+
+    Yields:
+        str: Consecutive pieces of '{"results":[...]}'
+    """
+    rows = list(encoded_catalog().values())
+    yield '{"results":['
+    for start in range(0, len(rows), STREAM_CHUNK_SIZE):
+        chunk = ",".join(
+            render_object(encoded, fields)
+            for encoded in rows[start:start + STREAM_CHUNK_SIZE]
+        )
+        yield ("," if start else "") + chunk
+    yield "]}"
@@ -0,0 +1,545 @@
+# ============================================================================
+# ASSETS MODULE - Self-hosted, bundled front-end assets
+# ============================================================================
+# The pages used to load Bootstrap from jsDelivr and Font Awesome from a kit
+# script, and each booking page loaded its scripts one by one: several
+# third-party DNS lookups, TLS handshakes and round trips before first
+# paint. build_assets (run before collectstatic, see bin/post_compile)
+# writes everything the pages load into static/dist/ instead:
+#
+#   vendor/       Bootstrap's CSS and JS, downloaded once at pinned
+#                 versions and checked against their SRI hashes
+#   fontawesome/  Font Awesome reduced to the icons the templates and
+#                 scripts use: the icon rules, and a font with only their
+#                 glyphs
+#   js/           one minified bundle per page from static/js/
+#
+#   critical/     per page, the rules of those stylesheets that style what
+#                 is above the fold, inlined by the page_styles tag so the
+#                 full stylesheets can load without blocking rendering
+#
+# collectstatic then fingerprints the files (CompressedManifestStatic-
+# FilesStorage), and WhiteNoise serves fingerprinted files as immutable.
+# Until build_assets has run (a fresh checkout), the templates load the CDN
+# originals and unbundled scripts instead (see fallback_assets()).
+
+import base64
+import hashlib
+import posixpath
+import re
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+
+# Third-party files downloaded by the build: (URL, SRI hash, cache name)
+VENDOR_FILES = [
+    (
+        "https://cdn.jsdelivr.net/npm/bootstrap@5.3.7/dist/css/"
+        "bootstrap.min.css",
+        "sha384-LN+7fdVzj6u52u30Kp6M/trliBMCMKTyK833zpbD+pXdCLuTusPj697FH4R/"
+        "5mcr",
+        "bootstrap.min.css",
+    ),
+    (
+        "https://cdn.jsdelivr.net/npm/bootstrap@5.3.7/dist/js/"
+        "bootstrap.bundle.min.js",
+        "sha384-ndDqU0Gzau9qJ1lfW4pNLlhNTkCfHzAVBReH9diLvGRem5+R9g2FzA8ZGN954"
+        "O5Q",
+        "bootstrap.bundle.min.js",
+    ),
+    (
+        "https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.6.0/"
+        "css/fontawesome.css",
+        "sha384-gvBFJfVs0NGf017wNdLvrn4FRkw8e57jaPeyr9whxetYNPuT5gRdc4t1jmNm9"
+        "Udi",
+        "fontawesome.css",
+    ),
+    (
+        "https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.6.0/"
+        "css/solid.css",
+        "sha384-jFsZtX7rQO3W+iiiTks8uhsw2U5qlbxxpvNao+dZ1UBsnuYVPlFTSbP9pW1Ed"
+        "4jh",
+        "solid.css",
+    ),
+    (
+        "https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.6.0/"
+        "webfonts/fa-solid-900.woff2",
+        "sha384-V8es2RB0+KAp5RkuZsWf+l1+jTHNpTR+J1yzwF3UE/HUJa2XWzLMUx+ljdL81"
+        "s4i",
+        "fa-solid-900.woff2",
+    ),
+]
+
+# Vendor files copied to static/dist/vendor/ as they are
+VENDOR_STATIC = ["bootstrap.min.css", "bootstrap.bundle.min.js"]
+
+# Page bundles: output name -> scripts from static/js/, in load order
+BUNDLES = {
+    "bookings.js": ["booking-utils.js", "bookings.js"],
+    "booking_info.js": ["booking-utils.js", "booking_info.js"],
+    "contact.js": ["contact.js"],
+}
+
+# Stylesheets every page loads, as static file names, in cascade order
+STYLESHEETS = [
+    "dist/vendor/bootstrap.min.css",
+    "dist/fontawesome/css/icons.css",
+    "css/style.css",
+]
+
+# Pages with inlined critical CSS: name -> templates rendered above the
+# fold. Only the part of the first template before a {# fold #} comment
+# counts; base.html counts up to its content block.
+CRITICAL_PAGES = {
+    "index": ["core/index.html"],
+    "services": ["core/services.html", "core/includes/service_card.html"],
+    "service_detail": [
+        "core/service_detail.html", "core/includes/service_detail.html",
+    ],
+    "bookings": ["core/bookings.html"],
+    "booking_info": ["core/booking_info.html"],
+}
+FOLD_MARKER = "{# fold #}"
+
+# Classes whose rules hide elements: critical wherever they are used, so
+# nothing meant to be hidden shows before the full stylesheets load
+HIDING_CLASSES = {"collapse", "d-none", "fade", "modal", "visually-hidden"}
+
+# Font Awesome classes that style icons rather than name them
+ICON_MODIFIERS = {
+    "fw", "spin", "pulse", "beat", "fade", "bounce", "flip", "shake", "border",
+    "inverse", "li", "ul", "pull-left", "pull-right", "rotate-90",
+    "rotate-180", "rotate-270", "flip-horizontal", "flip-vertical", "lg",
+    "xl", "2xl", "xs", "2xs", "sm", "stack", "stack-1x", "stack-2x",
+    *(f"{n}x" for n in range(1, 11)),
+}
+
+ICON_CLASS = re.compile(r"\bfa-([a-z0-9]+(?:-[a-z0-9]+)*)")
+ICON_RULE = re.compile(
+    r'\.fa-([a-z0-9-]+)::before \{\s*content: "\\([0-9a-f]+)"; \}\s*'
+)
+SOURCE_MAP = re.compile(
+    r"\n?(/\*# sourceMappingURL=[^*]*\*/|//# sourceMappingURL=\S*)\s*$"
+)
+
+
+class AssetBuildError(Exception):
+    """Raised when a vendor file cannot be fetched or fails its check."""
+
+
+def fallback_assets(name):
+    """
+    Return what pages load in place of a dist/ file that was not built.
+
+    Vendor files come from the CDN they are downloaded from, checked
+    against the same SRI hashes; page bundles become their source scripts.
+
+    Args:
+        name (str): Static name of the built file, under dist/
+
+    Returns:
+        list: (absolute URL or static name, SRI hash or "") pairs, in load
+              order
+    """
+    vendor = {cache_name: (url, sri) for url, sri, cache_name in VENDOR_FILES}
+    if name == "dist/fontawesome/css/icons.css":
+        return [vendor["fontawesome.css"], vendor["solid.css"]]
+    directory, _, filename = name.rpartition("/")
+    if directory == "dist/vendor":
+        return [vendor[filename]]
+    if directory == "dist/js":
+        return [(f"js/{source}", "") for source in BUNDLES[filename]]
+    return []
+
+
+def dist_dir():
+    """Return the directory the build writes into."""
+    return Path(settings.BASE_DIR) / "static" / "dist"
+
+
+def vendor_cache_dir():
+    """Return the directory holding downloaded vendor files."""
+    return Path(settings.BASE_DIR) / "assets" / "vendor"
+
+
+def sri_hash(data):
+    """Return the subresource integrity hash (sha384) of some bytes."""
+    digest = hashlib.sha384(data).digest()
+    return "sha384-" + base64.b64encode(digest).decode()
+
+
+def fetch_vendor_files(cache_dir):
+    """
+    Download missing vendor files into cache_dir, verifying each one.
+
+    Files already cached with the right hash are not downloaded again.
+
+    Returns:
+        list: Names of the files downloaded
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    downloaded = []
+    for url, integrity, name in VENDOR_FILES:
+        path = cache_dir / name
+        if path.exists() and sri_hash(path.read_bytes()) == integrity:
+            continue
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                data = response.read()
+        except OSError as e:
+            raise AssetBuildError(f"Could not download {url}: {e}") from e
+        if sri_hash(data) != integrity:
+            raise AssetBuildError(f"{url} does not match its pinned hash.")
+        path.write_bytes(data)
+        downloaded.append(name)
+    return downloaded
+
+
+def strip_source_map(text):
+    """Drop a trailing source map comment, as the maps are not shipped."""
+    return SOURCE_MAP.sub("", text)
+
+
+def used_icons(directories):
+    """
+    Find the Font Awesome icons named in templates and scripts.
+
+    Args:
+        directories (list): Directories searched for .html and .js files
+
+    Returns:
+        set: Icon names, without the "fa-" prefix
+    """
+    names = set()
+    for directory in directories:
+        for path in Path(directory).rglob("*"):
+            if path.suffix in (".html", ".js") and path.is_file():
+                names.update(ICON_CLASS.findall(path.read_text()))
+    return names - ICON_MODIFIERS
+
+
+def subset_icon_css(css, icons):
+    """
+    Keep only the icon rules of the given icons.
+
+    Args:
+        css (str): fontawesome.css
+        icons (set): Icon names to keep
+
+    Returns:
+        tuple: (reduced CSS, set of the kept icons' code points)
+    """
+    codepoints = set()
+
+    def keep(match):
+        if match.group(1) not in icons:
+            return ""
+        codepoints.add(int(match.group(2), 16))
+        return match.group(0)
+
+    return ICON_RULE.sub(keep, css), codepoints
+
+
+def subset_font(source, target, codepoints):
+    """Write a WOFF2 copy of a font holding only the given glyphs."""
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    font = subset.load_font(str(source), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    subset.save_font(font, str(target), options)
+
+
+def minify_css(css):
+    """Remove comments (except licences) and collapse whitespace."""
+    css = re.sub(r"/\*(?!!).*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{},>])\s*", r"\1", css)
+    # Not before ";": "--empty: ;" is a custom property set to a space
+    css = re.sub(r";\s+", ";", css)
+    return css.replace(";}", "}").strip() + "\n"
+
+
+def build_icons(cache_dir, out_dir, search_dirs):
+    """
+    Write the reduced Font Awesome stylesheet and font.
+
+    Returns:
+        int: Number of icons kept
+    """
+    icons = used_icons(search_dirs)
+    css, codepoints = subset_icon_css(
+        (cache_dir / "fontawesome.css").read_text(), icons
+    )
+    # WOFF2 is supported by every browser the site targets
+    solid = re.sub(
+        r',\s*url\("../webfonts/fa-solid-900\.ttf"\) format\("truetype"\)',
+        "",
+        (cache_dir / "solid.css").read_text(),
+    )
+    (out_dir / "css").mkdir(parents=True, exist_ok=True)
+    (out_dir / "webfonts").mkdir(parents=True, exist_ok=True)
+    (out_dir / "css" / "icons.css").write_text(minify_css(css + solid))
+    subset_font(
+        cache_dir / "fa-solid-900.woff2",
+        out_dir / "webfonts" / "fa-solid-900.woff2",
+        codepoints,
+    )
+    return len(codepoints)
+
+
+def build_bundles(source_dir, out_dir):
+    """
+    Write one minified script per page from the scripts it loads.
+
+    Returns:
+        dict: Bundle name -> size in bytes
+    """
+    from rjsmin import jsmin
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sizes = {}
+    for name, sources in BUNDLES.items():
+        # Each file is a separate classic script today; the semicolon keeps
+        # a file without a trailing one from running into the next
+        code = ";\n".join(
+            (source_dir / source).read_text() for source in sources
+        )
+        bundle = jsmin(code) + "\n"
+        (out_dir / name).write_text(bundle)
+        sizes[name] = len(bundle.encode())
+    return sizes
+
+
+def copy_vendor_files(cache_dir, out_dir):
+    """Copy the vendor files served as they are, minus source maps."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name in VENDOR_STATIC:
+        text = strip_source_map((cache_dir / name).read_text())
+        (out_dir / name).write_text(text)
+
+
+# Critical CSS
+# A rule is critical if each part of its selector could match an element
+# written in the above-the-fold markup: its tag, classes, ids and attribute
+# names all occur there. Pseudo-classes and attribute values are ignored,
+# so the result errs towards including a rule. Classes only added by
+# scripts are not critical. @font-face rules are always kept, so inlined
+# icon rules never show in a fallback font.
+
+GROUPING_RULES = ("@media", "@supports", "@layer", "@container")
+TEMPLATE_CODE = re.compile(r"{#.*?#}|{%.*?%}|{{.*?}}", re.S)
+INCLUDE = re.compile(r"{%\s*include\s+[\"']([^\"']+)[\"']")
+PSEUDO = re.compile(r"::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?")
+ATTRIBUTE = re.compile(r"\[\s*([\w-]+)[^\]]*\]")
+CSS_URL = re.compile(r"url\(\s*([\"']?)([^\"')]+)\1\s*\)")
+
+
+def _skip_string(css, pos):
+    """Return the position just past the string starting at pos."""
+    quote = css[pos]
+    pos += 1
+    while pos < len(css) and css[pos] != quote:
+        pos += 2 if css[pos] == "\\" else 1
+    return pos + 1
+
+
+def parse_css(css, pos=0):
+    """
+    Split a stylesheet into its top-level rules.
+
+    Args:
+        css (str): Stylesheet without comments
+        pos (int): Position to start at
+
+    Returns:
+        tuple: (list of (prelude, block) pairs, end position). block is
+               the declarations, a list of nested rules for grouping
+               at-rules, or None for statements such as @import
+    """
+    rules = []
+    while pos < len(css):
+        start = pos
+        while pos < len(css) and css[pos] not in "{;}":
+            pos = _skip_string(css, pos) if css[pos] in "\"'" else pos + 1
+        prelude = css[start:pos].strip()
+        if pos >= len(css):
+            break
+        if css[pos] == "}":
+            return rules, pos + 1
+        if css[pos] == ";":
+            rules.append((prelude, None))
+            pos += 1
+        elif prelude.startswith(GROUPING_RULES):
+            block, pos = parse_css(css, pos + 1)
+            rules.append((prelude, block))
+        else:
+            pos += 1
+            body_start, depth = pos, 1
+            while pos < len(css) and depth:
+                if css[pos] in "\"'":
+                    pos = _skip_string(css, pos)
+                    continue
+                depth += {"{": 1, "}": -1}.get(css[pos], 0)
+                pos += 1
+            rules.append((prelude, css[body_start:pos - 1].strip()))
+    return rules, pos
+
+
+def _split_selectors(prelude):
+    """Split a selector list on the commas outside parentheses."""
+    selectors, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if char == "," and not depth:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+    selectors.append(prelude[start:].strip())
+    return selectors
+
+
+def _selector_matches(selector, markup):
+    """Whether every compound of a selector names markup that occurs."""
+    tags, classes, ids, attributes = markup
+    selector = PSEUDO.sub("", selector)
+    if not attributes.issuperset(ATTRIBUTE.findall(selector)):
+        return False
+    simplified = ATTRIBUTE.sub("", selector)
+    for compound in re.split(r"[\s>+~]+", simplified):
+        tag = re.match(r"[a-zA-Z][\w-]*", compound)
+        if tag and tag.group().lower() not in tags:
+            return False
+        if not classes.issuperset(re.findall(r"\.([\w-]+)", compound)):
+            return False
+        if not ids.issuperset(re.findall(r"#([\w-]+)", compound)):
+            return False
+    return True
+
+
+def critical_rules(rules, markup):
+    """
+    Return the rules of a parsed stylesheet that style the given markup.
+
+    Args:
+        rules (list): Rules as returned by parse_css
+        markup (tuple): Sets of (tag names, classes, ids, attribute
+                        names) above the fold
+
+    Returns:
+        str: The critical rules, minified
+    """
+    kept = []
+    for prelude, block in rules:
+        if isinstance(block, list):
+            inner = critical_rules(block, markup)
+            if inner:
+                kept.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith("@font-face"):
+            kept.append(f"{prelude}{{{block}}}")
+        elif block is not None and not prelude.startswith("@"):
+            selectors = [
+                selector for selector in _split_selectors(prelude)
+                if _selector_matches(selector, markup)
+            ]
+            if selectors:
+                kept.append(f"{','.join(selectors)}{{{block}}}")
+    return "".join(kept)
+
+
+def _read_template(name, template_dirs):
+    """Return the source of a template from the first dir holding it."""
+    for directory in template_dirs:
+        path = Path(directory) / name
+        if path.is_file():
+            return path.read_text()
+    raise AssetBuildError(f"Template {name} not found.")
+
+
+def above_the_fold_markup(templates, template_dirs):
+    """
+    Collect the tags, classes, ids and attributes written above the fold.
+
+    Args:
+        templates (list): Template names, the page template first
+        template_dirs (list): Directories to look templates up in
+
+    Returns:
+        tuple: Sets of (tag names, classes, ids, attribute names)
+    """
+    base = _read_template("base.html", template_dirs)
+    page = _read_template(templates[0], template_dirs)
+    sources = [
+        base.split("{% block content %}")[0],
+        page.split(FOLD_MARKER)[0],
+    ]
+    pending = [*templates[1:], *INCLUDE.findall("".join(sources))]
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        # Included templates count in full
+        source = _read_template(name, template_dirs)
+        pending.extend(INCLUDE.findall(source))
+        sources.append(source)
+
+    html = TEMPLATE_CODE.sub(" ", "".join(sources))
+    tags = {tag.lower() for tag in re.findall(r"<([a-zA-Z][\w-]*)", html)}
+    classes = set(HIDING_CLASSES)
+    for value in re.findall(r'\bclass="([^"]*)"', html):
+        classes.update(value.split())
+    ids = set(re.findall(r'\bid="([^"]+)"', html))
+    attributes = {
+        name.lower() for name in re.findall(r'\s([\w-]+)=["\']', html)
+    }
+    return tags, classes, ids, attributes
+
+
+def _absolute_urls(css, name):
+    """Point relative url()s of a static file at their static URLs."""
+    def absolute(match):
+        url = match.group(2)
+        if url.startswith(("data:", "http:", "https:", "/", "#")):
+            return match.group(0)
+        path = posixpath.normpath(
+            posixpath.join(posixpath.dirname(name), url)
+        )
+        return f'url("{settings.STATIC_URL}{path}")'
+
+    return CSS_URL.sub(absolute, css)
+
+
+def build_critical_css(stylesheets, out_dir, template_dirs):
+    """
+    Write the critical CSS of every page in CRITICAL_PAGES.
+
+    Args:
+        stylesheets (list): (static name, path) of every stylesheet in
+                            STYLESHEETS, in order
+        out_dir (Path): Directory the page files are written to
+        template_dirs (list): Directories to look templates up in
+
+    Returns:
+        dict: Page name -> (critical bytes, full stylesheet bytes)
+    """
+    parsed = []
+    for name, path in stylesheets:
+        css = re.sub(r"/\*.*?\*/", "", path.read_text(), flags=re.S)
+        parsed.append(parse_css(_absolute_urls(css, name))[0])
+    full_size = sum(path.stat().st_size for _, path in stylesheets)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sizes = {}
+    for page, templates in CRITICAL_PAGES.items():
+        markup = above_the_fold_markup(templates, template_dirs)
+        css = minify_css("".join(
+            critical_rules(rules, markup) for rules in parsed
+        ))
+        (out_dir / f"{page}.css").write_text(css)
+        sizes[page] = (len(css.encode()), full_size)
+    return sizes
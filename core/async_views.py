@@ -0,0 +1,264 @@
+# ============================================================================
+# ASYNC VIEWS MODULE - Async versions of the booking and contact views,
+# served under ASGI
+# ============================================================================
+# Under the ASGI profile (SERVER_PROFILE=asgi, see config/gunicorn.conf.py)
+# core/urls.py routes these views instead of their synchronous twins in
+# core/views.py, so a slow database or Cloudinary call suspends one request
+# instead of blocking a whole worker. They behave exactly like the sync
+# views and share their parsing and saving helpers.
+#
+# Reads use Django's async ORM. Transactions are not available in async
+# code, so the booking insert runs its atomic block through sync_to_async,
+# as does anything reaching the catalog (core/catalog.py), which queries
+# the database whenever its snapshot is cold.
+# The user is loaded with request.auser() and stored back on request.user,
+# so templates and context processors never hit the database from the
+# event loop.
+
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.shortcuts import redirect, render
+
+from . import scheduling, spool, views
+from .forms import ContactForm
+from .ratelimit import rate_limit
+from .resolvers import (
+    aget_booking_by_grant, aget_booking_by_token, aget_request_booking,
+    aget_request_owned_booking,
+)
+from .tokens import make_view_grant
+
+
+async def _load_user(request):
+    """Load the visitor once and make request.user safe for templates."""
+    request.user = await request.auser()
+    return request.user
+
+
+# ============================================================================
+# BOOKING VIEWS
+# ============================================================================
+
+async def book_service(request):
+    """Async version of core.views.book_service."""
+    if request.method != "POST":
+        # GET request - redirect to booking form
+        return redirect('bookings')
+
+    # Parsing reads the catalog, which queries Service when this process
+    # has no snapshot of the current version yet
+    fields, error_msg = await sync_to_async(views.parse_booking_post)(
+        request.POST
+    )
+    if fields is None:
+        return render(request, "core/booking_error.html", {
+            "error_message": error_msg
+        })
+
+    user = await _load_user(request)
+    try:
+        booking, client = await sync_to_async(views.save_booking)(
+            user, fields
+        )
+    except scheduling.SlotUnavailable as e:
+        return render(request, "core/booking_error.html", {
+            "error_message": str(e)
+        })
+    except Exception as e:
+        error_msg = f"An error occurred while processing your booking: {e}"
+        return render(request, "core/booking_error.html", {
+            "error_message": error_msg
+        })
+
+    return render(request, "core/booking_success.html", {
+        "booking": booking,
+        "client": client,
+        "redirect_url": "booking_info"
+    })
+
+
+@rate_limit("access_key", token_field="access_key")
+async def booking_info(request):
+    """Async version of core.views.booking_info."""
+    # Check for flash messages from edit operation
+    success_message = request.flash.pop('booking_update_success', None)
+    error_message = request.flash.pop('booking_update_error', None)
+    view_grant = request.flash.pop('booking_view_grant', None)
+
+    user = await _load_user(request)
+    if user.is_authenticated:
+        # Find the booking linked to the user, or matched by email
+        resolved = await aget_request_booking(request)
+        if resolved:
+            context = {
+                "booking": resolved.booking,
+                "client": resolved.client,
+                "is_authenticated": True
+            }
+
+            if resolved.linked_by_email:
+                # Link the client to the user account for future access
+                resolved.client.user = user
+                await resolved.client.asave()
+                context["success_message"] = (
+                    "We found your booking and linked it to your account!"
+                )
+
+            if success_message:
+                context["success_message"] = success_message
+            if error_message:
+                context["error_message"] = error_message
+            return render(request, "core/booking_info.html", context)
+        # No booking by user association or email match, show the form
+
+    # Handle guest access - check for a flashed view grant first
+    if view_grant:
+        resolved = await aget_booking_by_grant(view_grant)
+        if resolved:
+            context = {
+                "booking": resolved.booking,
+                "client": resolved.client,
+                "is_authenticated": False,
+                "access_key_used": True
+            }
+            if success_message:
+                context["success_message"] = success_message
+            if error_message:
+                context["error_message"] = error_message
+            return render(request, "core/booking_info.html", context)
+
+    # Handle guest access key submission
+    if request.method == "POST":
+        access_key = request.POST.get("access_key", "").strip()
+
+        if not access_key:
+            return render(request, "core/booking_info.html", {
+                "error_message": "Please enter your access key.",
+                "is_authenticated": user.is_authenticated
+            })
+
+        resolved = await aget_booking_by_token(access_key)
+        if resolved:
+            return render(request, "core/booking_info.html", {
+                "booking": resolved.booking,
+                "client": resolved.client,
+                "is_authenticated": user.is_authenticated,
+                "access_key_used": True
+            })
+
+        error_msg = "Invalid access key. Please check and try again."
+        return render(request, "core/booking_info.html", {
+            "error_message": error_msg,
+            "is_authenticated": user.is_authenticated
+        })
+
+    # GET request - show access key form
+    context = {"is_authenticated": user.is_authenticated}
+    if error_message:
+        context["error_message"] = error_message
+    return render(request, "core/booking_info.html", context)
+
+
+@rate_limit("booking_change", token_field="access_token")
+async def edit_booking(request):
+    """Async version of core.views.edit_booking."""
+    if request.method != "POST":
+        return redirect('booking_info')
+
+    # Get booking based on user authentication or access token; users may
+    # only change the booking linked to their account
+    user = await _load_user(request)
+    if user.is_authenticated:
+        resolved = await aget_request_owned_booking(request)
+        if not resolved:
+            return redirect('bookings')
+    else:
+        # Guests identify their booking through a hidden access_token field
+        resolved = await aget_booking_by_token(
+            request.POST.get('access_token')
+        )
+        if not resolved:
+            return redirect('booking_info')
+
+    booking = resolved.booking
+
+    booking_date = request.POST.get('booking_date')
+    earliest_hour = request.POST.get('earliest_availability_hour')
+    earliest_min = request.POST.get('earliest_availability_min')
+    latest_hour = request.POST.get('latest_availability_hour')
+    latest_min = request.POST.get('latest_availability_min')
+
+    required_fields = [
+        booking_date, earliest_hour, earliest_min, latest_hour, latest_min
+    ]
+    if not all(required_fields):
+        return render(request, "core/booking_info.html", {
+            "booking": booking,
+            "client": booking.client,
+            "is_authenticated": user.is_authenticated,
+            "error_message": "All fields are required."
+        })
+
+    # Guests need a view grant to see the booking after the redirect
+    if not user.is_authenticated:
+        request.flash['booking_view_grant'] = make_view_grant(booking.pk)
+
+    try:
+        # Convert time to 4-digit format (HHMM)
+        earliest_time = f"{earliest_hour.zfill(2)}{earliest_min.zfill(2)}"
+        latest_time = f"{latest_hour.zfill(2)}{latest_min.zfill(2)}"
+
+        # Validate the time range and update the booking, refusing windows
+        # that would overbook; the day's lock needs a transaction
+        booking_date = date.fromisoformat(booking_date)
+        await sync_to_async(views.reschedule_booking)(
+            booking, booking_date, earliest_time, latest_time
+        )
+
+        request.flash['booking_update_success'] = (
+            "Booking updated successfully!"
+        )
+    except Exception as e:
+        request.flash['booking_update_error'] = (
+            f"Error updating booking: {str(e)}"
+        )
+    return redirect('booking_info')
+
+
+# ============================================================================
+# CONTACT VIEW
+# ============================================================================
+
+@rate_limit("contact", json=True)
+async def contact_view(request):
+    """Async version of core.views.contact_view."""
+    if request.method != 'POST':
+        return JsonResponse({
+            'success': False,
+            'message': 'Invalid request method.'
+        })
+
+    try:
+        form = ContactForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({
+                'success': False,
+                'message': 'Please correct the errors below.',
+                'errors': form.errors
+            })
+        # The spool push (or, without a spool, the insert) blocks
+        await sync_to_async(spool.spool_contact)(form.cleaned_data)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'An error occurred: {str(e)}'
+        })
+
+    return JsonResponse({
+        'success': True,
+        'message': ('Thank you for your message! '
+                    'We will get back to you soon.')
+    })
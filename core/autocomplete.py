@@ -0,0 +1,256 @@
+# ============================================================================
+# AUTOCOMPLETE MODULE - Select2 autocomplete views for the admin forms
+# ============================================================================
+# The admin's booking and client list forms (core/admin_forms.py) search
+# services, users and clients through these views. They are routed by
+# core/admin_urls.py only in processes that serve the admin, so public
+# workers (APP_PROFILE=public) never import django-autocomplete-light.
+# Under ASGI the async versions at the end of the module are routed
+# instead (see core/async_views.py).
+
+import inspect
+
+from asgiref.sync import sync_to_async
+from dal_select2.views import Select2QuerySetView
+from django.utils.text import slugify
+
+from .models import ClientList, Service, User
+from .pagination import apaginate_without_count, paginate_without_count
+from .search import get_search_backend
+
+
+class GenericAutocomplete(Select2QuerySetView):
+    """
+    Base autocomplete view providing search functionality for any model.
+
+    This class serves as a foundation for all autocomplete views in the admin.
+    It provides secure, authenticated search functionality that can be extended
+    by subclasses for specific models.
+
+    Attributes:
+        search_fields (list): List of model fields to search against.
+                             Must be overridden in subclasses.
+
+    Security:
+        - Only authenticated users can access autocomplete functionality
+        - Returns empty queryset for unauthenticated requests
+
+    Performance:
+        - Searching is delegated to the configured search backend, which
+          uses trigram indexes on PostgreSQL (see core/search.py)
+        - Pages are sliced without a COUNT(*) query
+    """
+
+    search_fields = []  # Override this in subclasses
+
+    def get_queryset(self):
+        """
+        Return filtered queryset for authenticated users only.
+
+        Performs case-insensitive search across all defined search_fields
+        using the search term (self.q) provided by the Select2 widget.
+        Exact and prefix matches are ranked ahead of other matches.
+
+        Returns:
+            QuerySet: Filtered results matching search criteria, or empty
+                     queryset if user is not authenticated.
+        """
+        if not self.request.user.is_authenticated:
+            return self.model.objects.none()
+
+        qs = self.model.objects.all()
+        if self.q and self.search_fields:
+            backend = get_search_backend(qs.db)
+            qs = backend.search(qs, self.search_fields, self.q)
+        return qs
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Return one page of results without counting the whole queryset.
+
+        Select2 only needs to know whether more results follow, so one
+        extra row is fetched instead of running COUNT(*) per keystroke.
+
+        Returns:
+            tuple: (paginator, page, object_list, is_paginated) as expected
+                   by Django's MultipleObjectMixin
+        """
+        page = paginate_without_count(
+            queryset, self.request.GET.get(self.page_kwarg), page_size
+        )
+        return (None, page, page.object_list, page.has_other_pages())
+
+
+class CreatableAutocomplete(GenericAutocomplete):
+    """
+    Extended autocomplete view with object creation functionality.
+
+    Inherits search functionality from GenericAutocomplete and adds the ability
+    to create new objects directly from the autocomplete interface. This is
+    useful for admin forms where users need to quickly add new entries.
+
+    Attributes:
+        create_field (str): Field name to use when creating new objects.
+                           Must be overridden in subclasses if using default
+                           create_object method.
+    """
+
+    create_field = None  # Override this in subclasses
+
+    def get_create_option(self, context, q):
+        """
+        Add create option for new entries in the autocomplete dropdown.
+
+        Args:
+            context: Template context (unused in this implementation)
+            q (str): Search query string
+
+        Returns:
+            list: List containing create option dict, or empty list if no query
+        """
+        if not q:
+            return []
+
+        return [
+            {
+                "id": q,
+                "text": f'Create "{q}"',
+                "create_id": True,
+            }
+        ]
+
+    def create_object(self, text):
+        """
+        Create new model instance from autocomplete input.
+
+        Default implementation creates object using the create_field attribute.
+        Override this method in subclasses for custom object creation logic.
+
+        Args:
+            text (str): The text entered by user to create new object
+
+        Returns:
+            Model instance: Newly created object
+
+        Raises:
+            NotImplementedError: If create_field is not set and method not
+                               overridden
+        """
+        if self.create_field:
+            return self.model.objects.create(**{self.create_field: text})
+        raise NotImplementedError(
+            "Subclasses must implement create_object method"
+        )
+
+
+# ============================================================================
+# SPECIFIC AUTOCOMPLETE IMPLEMENTATIONS
+# ============================================================================
+
+class ServiceAutocomplete(CreatableAutocomplete):
+    """
+    Service autocomplete with create functionality for admin interface.
+
+    Allows administrators to search existing services or create new ones
+    directly from form fields. When creating new services, automatically
+    generates slug, description, and excerpt fields.
+
+    Used in: Admin forms that reference Service model
+    """
+
+    model = Service
+    search_fields = ["service_name"]
+    create_field = "service_name"
+
+    def create_object(self, text):
+        """
+        Create a new Service with auto-generated fields.
+
+        Args:
+            text (str): Service name entered by user
+
+        Returns:
+            Service: Newly created service instance with generated fields
+        """
+        return Service.objects.create(
+            service_name=text,
+            slug=slugify(text),
+            description=f"Service: {text}",
+            excerpt=f"New service: {text}",
+        )
+
+
+class UserAutocomplete(GenericAutocomplete):
+    """
+    User autocomplete for admin interface - search only, no creation.
+
+    Provides search functionality across user fields for forms that need
+    to reference User objects. Creation disabled as users should be created
+    through proper user management flows.
+
+    Used in: Admin forms that reference User model
+    """
+
+    model = User
+    search_fields = ["username", "first_name", "last_name", "email"]
+
+
+class ClientAutocomplete(GenericAutocomplete):
+    """
+    Client autocomplete for admin interface - search only, no creation.
+
+    Allows searching existing clients by name and email for admin forms.
+    Creation disabled to maintain data integrity and proper client onboarding.
+
+    Used in: Admin forms that reference ClientList model
+    """
+
+    model = ClientList
+    search_fields = ["first_name", "last_name", "email"]
+
+
+# ============================================================================
+# ASYNC AUTOCOMPLETE VIEWS
+# ============================================================================
+
+class AsyncAutocompleteMixin:
+    """
+    Serve an autocomplete view with async handlers.
+
+    Mix in ahead of a GenericAutocomplete subclass. Searching reads one
+    page with the async ORM; creating an object keeps the synchronous
+    implementation, run in a thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        # django-autocomplete-light answers bad requests synchronously
+        response = super().dispatch(request, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        page = await apaginate_without_count(
+            self.get_queryset(),
+            request.GET.get(self.page_kwarg),
+            self.paginate_by,
+        )
+        return self.render_to_response(
+            {"object_list": page.object_list, "page_obj": page}
+        )
+
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(super().post)(request, *args, **kwargs)
+
+
+class AsyncServiceAutocomplete(AsyncAutocompleteMixin, ServiceAutocomplete):
+    """Async version of ServiceAutocomplete."""
+
+
+class AsyncUserAutocomplete(AsyncAutocompleteMixin, UserAutocomplete):
+    """Async version of UserAutocomplete."""
+
+
+class AsyncClientAutocomplete(AsyncAutocompleteMixin, ClientAutocomplete):
+    """Async version of ClientAutocomplete."""
@@ -0,0 +1,242 @@
+# ============================================================================
+# CATALOG MODULE - Versioned cache of the available-services catalog
+# ============================================================================
+# The list of available services only changes when an administrator edits a
+# Service, yet it is read by almost every public page. This module keeps a
+# snapshot of the catalog in process memory and in the shared Django cache,
+# both keyed by a catalog version. Saving or deleting a Service bumps the
+# version (see core/signals.py), so every process rebuilds its snapshot on
+# the next read instead of querying the database on every request.
+#
+# A page reads the catalog several times (conditional GET validators, the
+# view, template tags). Inside request_scope(), entered for every request
+# by CatalogVersionMiddleware, the version is read from the shared cache
+# once and reused until the request ends.
+
+import contextvars
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from . import instrumentation
+from .models import Service
+
+# Shared cache keys
+CATALOG_VERSION_KEY = "core:catalog:version"
+CATALOG_DATA_KEY = "core:catalog:data:v2:{version}"
+
+# Snapshot held by this process, replaced whenever the version moves on
+_local = {"version": None, "snapshot": None}
+_lock = threading.Lock()
+
+# Version read by the current request, while a request_scope() is active
+_request_version = contextvars.ContextVar("catalog_request_version")
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the available services for one catalog version.
+
+    Built once per version and shared between requests handled by the same
+    process. Lookups by slug and id are dictionary reads, and the ordered
+    list is ready to be paginated in memory.
+
+    Attributes:
+        version (str): Catalog version this snapshot was built for
+        services (tuple): Available services in catalog order
+        by_slug (dict): Mapping of slug to Service
+        by_id (dict): Mapping of primary key to Service
+        last_modified (datetime | None): Latest of the services' updated_on
+                                         and the time the version was
+                                         created, so removing a service
+                                         also moves it forward
+    """
+
+    def __init__(self, version, services):
+        self.version = version
+        self.services = tuple(services)
+        self.by_slug = {service.slug: service for service in self.services}
+        self.by_id = {service.pk: service for service in self.services}
+        timestamps = [service.updated_on for service in self.services]
+        created = version_created(version)
+        if created is not None:
+            timestamps.append(created)
+        self.last_modified = max(timestamps, default=None)
+
+
+def service_sort_key(service):
+    """
+    Return the key the catalog is sorted by: case-insensitive name.
+
+    Sorting in Python rather than by database collation gives the same
+    order on every backend, which keyset pagination relies on.
+    """
+    return (service.service_name.casefold(), service.service_name)
+
+
+def _new_version():
+    """Return a new version token: creation time in ns plus a random part."""
+    return f"{time.time_ns()}.{uuid.uuid4().hex}"
+
+
+def version_created(version):
+    """
+    Return when a catalog version was created.
+
+    Args:
+        version (str): Catalog version token
+
+    Returns:
+        datetime | None: Creation time (UTC), or None for tokens without one
+    """
+    try:
+        created_ns = int(str(version).split(".", 1)[0])
+    except ValueError:
+        return None
+    return datetime.fromtimestamp(created_ns / 1e9, tz=timezone.utc)
+
+
+def _timeout():
+    """Return how long the shared cache keeps catalog entries (seconds)."""
+    return getattr(settings, "CATALOG_CACHE_TIMEOUT", None)
+
+
+@contextmanager
+def request_scope():
+    """Read the catalog version at most once until the block exits."""
+    token = _request_version.set({})
+    try:
+        yield
+    finally:
+        _request_version.reset(token)
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version from the shared cache.
+
+    A fresh random version is stored if none exists yet (first start or
+    cache eviction), so a stale snapshot can never be mistaken for the
+    current one. Within a request_scope() the first version read is kept.
+
+    Returns:
+        str: Opaque catalog version token
+    """
+    memo = _request_version.get(None)
+    if memo:
+        return memo["version"]
+    start = time.perf_counter()
+    version = cache.get(CATALOG_VERSION_KEY)
+    instrumentation.record_cache_read(
+        start, hits=version is not None, misses=version is None
+    )
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, _new_version(), _timeout())
+        version = cache.get(CATALOG_VERSION_KEY)
+    if memo is not None:
+        memo["version"] = version
+    return version
+
+
+def bump_catalog_version():
+    """
+    Invalidate every cached copy of the catalog.
+
+    Called whenever a Service is saved or deleted. Other processes notice
+    the new version on their next read and rebuild their snapshot; the
+    request making the change sees it straight away.
+    """
+    version = _new_version()
+    cache.set(CATALOG_VERSION_KEY, version, _timeout())
+    memo = _request_version.get(None)
+    if memo is not None:
+        memo["version"] = version
+
+
+def get_catalog():
+    """
+    Return the catalog snapshot for the current version.
+
+    Reads from process memory when possible, then from the shared cache,
+    and only queries the database when neither holds the current version.
+
+    Returns:
+        CatalogSnapshot: Snapshot of all available services
+    """
+    version = get_catalog_version()
+    snapshot = _local["snapshot"]
+    if snapshot is not None and _local["version"] == version:
+        return snapshot
+
+    with _lock:
+        # Another thread may have rebuilt the snapshot while we waited
+        if _local["version"] == version and _local["snapshot"] is not None:
+            return _local["snapshot"]
+
+        data_key = CATALOG_DATA_KEY.format(version=version)
+        start = time.perf_counter()
+        services = cache.get(data_key)
+        instrumentation.record_cache_read(
+            start, hits=services is not None, misses=services is None
+        )
+        if services is None:
+            services = sorted(
+                Service.objects.filter(available=1), key=service_sort_key
+            )
+            cache.set(data_key, services, _timeout())
+
+        snapshot = CatalogSnapshot(version, services)
+        _local["version"] = version
+        _local["snapshot"] = snapshot
+        return snapshot
+
+
+def available_services():
+    """
+    Return all available services in catalog order.
+
+    Returns:
+        tuple: Service instances with available=True
+    """
+    return get_catalog().services
+
+
+def get_available_service(slug):
+    """
+    Return the available service with the given slug.
+
+    Args:
+        slug (str): URL-friendly identifier for the service
+
+    Returns:
+        Service: The matching available service
+
+    Raises:
+        Http404: If no available service has this slug
+    """
+    service = get_catalog().by_slug.get(slug)
+    if service is None:
+        raise Http404("No available service matches the given slug.")
+    return service
+
+
+def get_available_service_by_id(pk):
+    """
+    Return the available service with the given primary key, or None.
+
+    Args:
+        pk (int | str): Primary key as submitted by a form
+
+    Returns:
+        Service | None: The matching available service, if any
+    """
+    try:
+        return get_catalog().by_id.get(int(pk))
+    except (TypeError, ValueError):
+        return None
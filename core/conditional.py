@@ -0,0 +1,92 @@
+# ============================================================================
+# CONDITIONAL MODULE - Conditional GET for the public catalog pages
+# ============================================================================
+# The home, services and service detail pages only change when a Service
+# changes, apart from the per-visitor parts of base.html (welcome text,
+# admin link and the contact form's CSRF token). The validators below are
+# computed from the cached catalog snapshot and the visitor, without
+# querying services, so a repeat visit can be answered with 304 Not
+# Modified before any template is rendered.
+
+import hashlib
+
+from django.conf import settings
+from django.views.decorators.http import condition
+
+from . import catalog
+
+
+def catalog_etag(request, *args, **kwargs):
+    """
+    Return the ETag of a catalog page for this visitor.
+
+    Combines the catalog version, the release being served and everything
+    base.html renders per visitor, so a change to any of them produces a
+    fresh page.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        str: Opaque entity tag
+    """
+    parts = [
+        catalog.get_catalog().version,
+        settings.RELEASE_VERSION,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+    ]
+    user = request.user
+    if user.is_authenticated:
+        parts += [str(user.pk), user.first_name, str(user.is_superuser)]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    """
+    Return when the catalog last changed, for anonymous visitors only.
+
+    Signed-in visitors get no Last-Modified, as a date alone cannot tell
+    their personalised page apart from the anonymous one; they revalidate
+    with the ETag instead.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        datetime | None: Last catalog change
+    """
+    if request.user.is_authenticated:
+        return None
+    return catalog.get_catalog().last_modified
+
+
+# Decorator answering conditional GETs of catalog pages with 304
+catalog_condition = condition(
+    etag_func=catalog_etag, last_modified_func=catalog_last_modified
+)
+
+
+def catalog_version_etag(request, *args, **kwargs):
+    """
+    Return the ETag of a catalog response that is the same for everyone.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        str: Opaque entity tag
+    """
+    parts = [catalog.get_catalog().version, settings.RELEASE_VERSION]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+def catalog_feed_last_modified(request, *args, **kwargs):
+    """Return when the catalog last changed."""
+    return catalog.get_catalog().last_modified
+
+
+# Decorator for non-personalised catalog responses such as the JSON feed
+catalog_feed_condition = condition(
+    etag_func=catalog_version_etag,
+    last_modified_func=catalog_feed_last_modified,
+)
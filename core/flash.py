@@ -0,0 +1,75 @@
+# ============================================================================
+# FLASH MODULE - One-shot messages carried in a signed cookie
+# ============================================================================
+# The booking views redirect after every change and show the outcome on the
+# next page. Keeping those one-shot values in the session cost a session row
+# (and several queries) per guest just to show one message. Instead they
+# travel in a short-lived signed cookie: FlashMiddleware exposes them as
+# request.flash, which reads like the session (pop, item assignment), and
+# writes or clears the cookie on the way out. Signing stops visitors from
+# forging values; the cookie is HttpOnly and expires after FLASH_MAX_AGE.
+
+import json
+
+from django.conf import settings
+
+FLASH_COOKIE_NAME = "booking_flash"
+FLASH_SALT = "core.flash"
+
+# Seconds a flash value survives if the next page is never loaded
+FLASH_MAX_AGE = 300
+
+
+class Flash:
+    """
+    One-shot values for the current visitor, loaded on first access.
+
+    Attributes:
+        modified (bool): True if the cookie must be rewritten or cleared
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.modified = False
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            raw = self.request.get_signed_cookie(
+                FLASH_COOKIE_NAME, default=None, salt=FLASH_SALT,
+                max_age=FLASH_MAX_AGE,
+            )
+            try:
+                self._data = json.loads(raw) if raw else {}
+            except ValueError:
+                self._data = {}
+        return self._data
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.modified = True
+
+    def pop(self, key, default=None):
+        """Return a value and remove it, so it is only shown once."""
+        if key not in self.data:
+            return default
+        self.modified = True
+        return self.data.pop(key)
+
+    def update_response(self, response):
+        """Write the remaining values to the cookie, or delete it."""
+        if not self.modified:
+            return
+        if self.data:
+            response.set_signed_cookie(
+                FLASH_COOKIE_NAME,
+                json.dumps(self.data, separators=(",", ":")),
+                salt=FLASH_SALT,
+                max_age=FLASH_MAX_AGE,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        else:
+            response.delete_cookie(FLASH_COOKIE_NAME, samesite="Lax")
@@ -0,0 +1,100 @@
+# ============================================================================
+# FRAGMENTS MODULE - Cached rendering of per-service page fragments
+# ============================================================================
+# Service cards and the service detail body only depend on the service they
+# show, but rendering them resolves Cloudinary URLs, reverses URLs and
+# renders the Summernote description. This module caches each rendered
+# fragment in the shared cache under a key containing the service's
+# updated_on timestamp. Saving a service in the admin moves the timestamp,
+# so the next render misses and stale fragments simply expire.
+#
+# The key also holds the release version and a hash of the template source,
+# so a deploy that changes the template, or the fingerprinted static URLs
+# rendered into it, does not keep serving the old markup.
+
+import hashlib
+from functools import lru_cache
+from time import perf_counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+from . import instrumentation
+
+FRAGMENT_KEY = "core:fragment:{template}:{release}:{source}:{pk}:{stamp}"
+
+
+@lru_cache
+def template_digest(template_name):
+    """
+    Return a short hash of a template's source.
+
+    Computed once per process; a deploy starts new processes.
+
+    Args:
+        template_name (str): Template the fragment is rendered from
+
+    Returns:
+        str: First 12 hex digits of the source's SHA-256
+    """
+    source = get_template(template_name).template.source
+    return hashlib.sha256(source.encode()).hexdigest()[:12]
+
+
+def fragment_key(template_name, service):
+    """
+    Return the cache key of a service's rendered fragment.
+
+    Args:
+        template_name (str): Template the fragment is rendered from
+        service (Service): The service shown in the fragment
+
+    Returns:
+        str: Cache key that changes whenever the service is saved, the
+             template changes or a new release is deployed
+    """
+    stamp = service.updated_on.strftime("%Y%m%d%H%M%S%f")
+    return FRAGMENT_KEY.format(
+        template=template_name,
+        release=settings.RELEASE_VERSION,
+        source=template_digest(template_name),
+        pk=service.pk,
+        stamp=stamp,
+    )
+
+
+def render_service_fragments(template_name, services):
+    """
+    Render one fragment per service, reusing cached fragments.
+
+    All cached fragments are fetched with a single cache read. Only the
+    missing ones are rendered, with ``service`` as their only context
+    variable, and stored with a single cache write.
+
+    Args:
+        template_name (str): Template rendered for each service
+        services (iterable): Services to render
+
+    Returns:
+        list: Rendered fragments (safe strings) in the order of services
+    """
+    services = list(services)
+    keys = [fragment_key(template_name, service) for service in services]
+    start = perf_counter()
+    fragments = cache.get_many(keys)
+    instrumentation.record_cache_read(
+        start, hits=len(fragments), misses=len(keys) - len(fragments)
+    )
+
+    missing = {
+        key: render_to_string(template_name, {"service": service})
+        for key, service in zip(keys, services)
+        if key not in fragments
+    }
+    if missing:
+        cache.set_many(missing, settings.SERVICE_FRAGMENT_CACHE_TIMEOUT)
+        fragments.update(missing)
+
+    return [mark_safe(fragments[key]) for key in keys]
@@ -0,0 +1,89 @@
+# ============================================================================
+# IMAGES MODULE - Pre-computed responsive Cloudinary URLs for services
+# ============================================================================
+# Service images are stored in Cloudinary as full-size originals. Rather than
+# shipping the original to every device and rebuilding its URL on every
+# render, Service.save() calls build_image_variants() to compute a set of
+# resized, cropped, AVIF/WebP/JPEG transformation URLs once. The templates
+# then emit <picture> sources with srcset, sizes and explicit dimensions
+# straight from the stored data (see core/includes/responsive_image.html).
+
+# Placeholder public id used as the CloudinaryField default
+PLACEHOLDER_PUBLIC_ID = "placeholder"
+
+# Output formats, best compression first; the last one is the <img> fallback
+FORMATS = ("avif", "webp", "jpg")
+
+# Renditions used by the templates. Each is cropped to a fixed aspect ratio
+# around the image's focal point, so the dimensions of every width variant
+# are known without asking Cloudinary for the original's size.
+RENDITIONS = {
+    # Service cards: full width on phones, a third of the row from md up
+    "card": {
+        "widths": (320, 480, 720),
+        "aspect_ratio": (2, 1),
+        "sizes": "(min-width: 768px) 33vw, 100vw",
+    },
+    # Service detail masthead: only shown from md up, on half the width
+    "masthead": {
+        "widths": (480, 720, 960, 1280),
+        "aspect_ratio": (4, 3),
+        "sizes": "50vw",
+    },
+}
+
+
+def _variant_url(resource, width, height, fmt):
+    """Build one transformation URL for a Cloudinary resource."""
+    return resource.build_url(
+        width=width,
+        height=height,
+        crop="fill",
+        gravity="auto",
+        fetch_format=fmt,
+        quality="auto",
+        secure=True,
+    )
+
+
+def build_image_variants(resource):
+    """
+    Compute the responsive image data of every rendition.
+
+    Args:
+        resource (CloudinaryResource | str | None): Value of a
+            CloudinaryField
+
+    Returns:
+        dict: Rendition name to a dict with ``src`` (fallback URL), ``width``
+              and ``height`` (of the fallback), ``sizes`` and ``srcset`` (a
+              srcset string per format). Empty for placeholder images.
+    """
+    public_id = getattr(resource, "public_id", resource)
+    if not public_id or public_id == PLACEHOLDER_PUBLIC_ID:
+        return {}
+
+    variants = {}
+    for name, rendition in RENDITIONS.items():
+        ratio_w, ratio_h = rendition["aspect_ratio"]
+        sizes = [
+            (width, round(width * ratio_h / ratio_w))
+            for width in rendition["widths"]
+        ]
+        srcset = {
+            fmt: ", ".join(
+                f"{_variant_url(resource, width, height, fmt)} {width}w"
+                for width, height in sizes
+            )
+            for fmt in FORMATS
+        }
+        # The middle width is a sensible default for browsers without srcset
+        width, height = sizes[len(sizes) // 2]
+        variants[name] = {
+            "src": _variant_url(resource, width, height, FORMATS[-1]),
+            "width": width,
+            "height": height,
+            "sizes": rendition["sizes"],
+            "srcset": srcset,
+        }
+    return variants
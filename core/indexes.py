@@ -0,0 +1,54 @@
+# ============================================================================
+# INDEXES MODULE - Trigram indexes for the admin autocomplete search
+# ============================================================================
+# Django compiles icontains/istartswith on PostgreSQL to
+# UPPER(column::text) LIKE UPPER(...). A GIN index with pg_trgm's
+# gin_trgm_ops on that expression answers those searches without a
+# sequential scan (see core/search.py). Declared in Meta.indexes, the
+# indexes are part of the model state, so migrations and the autodetector
+# stay in sync with the models. Other databases (SQLite in local
+# development) have neither GIN nor pg_trgm and get a plain expression
+# index on the same column instead.
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models import Index
+from django.db.models.functions import Upper
+
+
+class TrigramIndex(GinIndex):
+    """
+    GIN trigram index on PostgreSQL, a plain expression index elsewhere.
+
+    Use trigram_index() to declare one on a text column.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().create_sql(
+                model, schema_editor, using=using, **kwargs
+            )
+        # Operator classes are PostgreSQL syntax; index the bare expression
+        expressions = [
+            expression.get_source_expressions()[0]
+            if isinstance(expression, OpClass) else expression
+            for expression in self.expressions
+        ]
+        return Index(*expressions, name=self.name).create_sql(
+            model, schema_editor, using=using, **kwargs
+        )
+
+
+def trigram_index(field_name, name):
+    """
+    Return a trigram index on UPPER(field_name).
+
+    Args:
+        field_name (str): Text column searched case-insensitively
+        name (str): Index name (at most 30 characters)
+
+    Returns:
+        TrigramIndex: Index for Meta.indexes
+    """
+    return TrigramIndex(
+        OpClass(Upper(field_name), name="gin_trgm_ops"), name=name
+    )
@@ -0,0 +1,124 @@
+# ============================================================================
+# INSTRUMENTATION MODULE - Per-request timing of queries, templates and cache
+# ============================================================================
+# PerformanceMiddleware (core/middleware.py) activates a RequestMetrics for
+# each request. Queries are timed through connection.execute_wrapper,
+# Django's public hook. Nothing in Django is patched for the rest: template
+# rendering is timed by the project's template backend
+# (core/template_backends.py), and cache reads are reported by the code
+# making them (core/catalog.py, core/fragments.py) through
+# record_cache_read(). Outside an active request those calls do nothing.
+
+import contextvars
+import heapq
+from contextlib import contextmanager
+from time import perf_counter
+
+# Slowest queries kept per request for the slow request log
+SLOWEST_QUERIES = 3
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    Timings collected while one request is handled.
+
+    Also used as the database execute wrapper for the request.
+
+    Attributes:
+        queries (int): Queries run
+        db_time (float): Seconds spent in those queries
+        slowest (list): Up to SLOWEST_QUERIES (seconds, sql) pairs
+        template_time (float): Seconds spent rendering templates
+        template_depth (int): Templates being rendered, so that templates
+                              rendered inside another are not counted twice
+        cache_hits (int): Keys found in the cache
+        cache_misses (int): Keys not found in the cache
+        cache_time (float): Seconds spent reading the cache
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest = []
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - start
+            self.queries += 1
+            self.db_time += elapsed
+            if len(self.slowest) < SLOWEST_QUERIES:
+                heapq.heappush(self.slowest, (elapsed, sql))
+            elif elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (elapsed, sql))
+
+    def server_timing(self, total, view_name):
+        """
+        Format the metrics as a Server-Timing header value.
+
+        Args:
+            total (float): Seconds the whole request took
+            view_name (str): Name of the view that handled it
+
+        Returns:
+            str: Header value, one metric per component
+        """
+        return ", ".join((
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f};desc="templates"',
+            f'cache;dur={self.cache_time * 1000:.1f};'
+            f'desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'total;dur={total * 1000:.1f};desc="{view_name}"',
+        ))
+
+
+def activate(metrics):
+    """Collect timings into metrics until deactivate() is called."""
+    return _current.set(metrics)
+
+
+def deactivate(token):
+    """Stop collecting into the metrics set by the matching activate()."""
+    _current.reset(token)
+
+
+def record_cache_read(start, hits=0, misses=0):
+    """
+    Count a cache read made while handling the current request.
+
+    Args:
+        start (float): perf_counter() value taken before the read
+        hits (int): Keys found
+        misses (int): Keys not found
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return
+    metrics.cache_time += perf_counter() - start
+    metrics.cache_hits += hits
+    metrics.cache_misses += misses
+
+
+@contextmanager
+def timed_template():
+    """Time a template render, counting only the outermost one."""
+    metrics = _current.get()
+    if metrics is None or metrics.template_depth:
+        yield
+        return
+    metrics.template_depth += 1
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        metrics.template_time += perf_counter() - start
+        metrics.template_depth -= 1
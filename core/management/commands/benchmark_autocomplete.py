@@ -0,0 +1,130 @@
+"""
+Measure per-keystroke autocomplete latency on a seeded client list.
+
+Seeds ClientList rows in a transaction, replays the searches a user makes
+while typing a term one letter at a time, and reports the latency of each
+keystroke for every available search backend. All seeded rows are rolled
+back when the benchmark finishes.
+
+Usage:
+    python manage.py benchmark_autocomplete --rows 100000 1000000
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.autocomplete import ClientAutocomplete
+from core.models import ClientList
+from core.search import ContainsSearchBackend, TrigramSearchBackend
+
+FIRST_NAMES = [
+    "Alice", "Brian", "Chloe", "David", "Emma", "Frank", "Grace", "Harry",
+    "Isla", "Jack", "Katie", "Liam", "Mia", "Noah", "Olivia", "Peter",
+]
+LAST_NAMES = [
+    "Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson",
+    "Davies", "Robinson", "Wright", "Thompson", "Evans", "Walker", "White",
+]
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded rows once the benchmark is done."""
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-keystroke autocomplete search latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[100_000, 1_000_000],
+            help="Client list sizes to benchmark (default: 100k and 1M).",
+        )
+        parser.add_argument(
+            "--term",
+            default="smith",
+            help="Term typed one keystroke at a time (default: smith).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per keystroke (default: 5).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5_000,
+            help="Rows inserted per bulk_create batch (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        backends = [ContainsSearchBackend()]
+        if connection.vendor == "postgresql":
+            backends.append(TrigramSearchBackend())
+
+        try:
+            with transaction.atomic():
+                seeded = ClientList.objects.count()
+                for rows in sorted(options["rows"]):
+                    self.seed(seeded, rows, options["batch_size"])
+                    seeded = max(seeded, rows)
+                    self.stdout.write(self.style.MIGRATE_HEADING(
+                        f"\n{seeded:,} clients ({connection.vendor})"
+                    ))
+                    for backend in backends:
+                        self.report(
+                            backend, options["term"], options["repeat"]
+                        )
+                raise Rollback
+        except Rollback:
+            self.stdout.write("\nSeeded rows rolled back.")
+
+    def seed(self, existing, target, batch_size):
+        """Insert clients until the table holds target rows."""
+        rng = random.Random(target)
+        batch = []
+        for i in range(existing, target):
+            batch.append(ClientList(
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                email=f"bench-{i}@example.com",
+                phone_number=f"07{i:09d}",
+            ))
+            if len(batch) >= batch_size:
+                ClientList.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            ClientList.objects.bulk_create(batch)
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE core_clientlist")
+
+    def report(self, backend, term, repeat):
+        """Time each keystroke of term and print median and worst times."""
+        fields = ClientAutocomplete.search_fields
+        page_size = ClientAutocomplete.paginate_by
+        self.stdout.write(f"  {type(backend).__name__}")
+
+        for length in range(1, len(term) + 1):
+            keystroke = term[:length]
+            timings = []
+            for _ in range(repeat):
+                qs = backend.search(
+                    ClientList.objects.all(), fields, keystroke
+                )
+                start = time.perf_counter()
+                list(qs[:page_size + 1])
+                timings.append((time.perf_counter() - start) * 1000)
+            median = statistics.median(timings)
+            self.stdout.write(
+                f"    {keystroke:<12} median {median:8.2f} ms"
+                f"   max {max(timings):8.2f} ms"
+            )
@@ -0,0 +1,203 @@
+"""
+Compare admin changelist queries with and without the changelist indexes.
+
+Seeds clients, bookings and contact messages in a transaction, runs the
+queries behind the Booking, ClientList and Contact changelists (default
+ordering plus the list_filter choices) with the Meta.indexes dropped, then
+again with them in place, and prints timings and query plans for both. All
+changes, including the seeded rows, are rolled back at the end.
+
+Usage:
+    python manage.py benchmark_changelists --rows 200000 --plans
+"""
+
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import Booking, ClientList, Contact
+from core.tokens import generate_access_token
+
+INDEXED_MODELS = (Booking, ClientList, Contact)
+
+
+class Rollback(Exception):
+    """Raised to discard all benchmark changes once the run is done."""
+
+
+def changelist_queries():
+    """
+    Return the querysets behind the admin changelists, keyed by label.
+
+    Each one mirrors a changelist page: the model's default ordering,
+    optionally narrowed by one of the admin list_filter choices, and
+    sliced to the admin's page size.
+    """
+    today = date.today()
+    return {
+        "bookings (all)":
+            Booking.objects.select_related("client")[:100],
+        "bookings (unconfirmed, upcoming)":
+            Booking.objects.select_related("client").filter(
+                is_confirmed=False, booking_date__gte=today
+            )[:100],
+        "bookings (confirmed)":
+            Booking.objects.select_related("client").filter(
+                is_confirmed=True
+            )[:100],
+        "bookings (booking_date this month)":
+            Booking.objects.select_related("client").filter(
+                booking_date__gte=today.replace(day=1),
+                booking_date__lt=today.replace(day=1) + timedelta(days=31),
+            )[:100],
+        "clients (leads)":
+            ClientList.objects.filter(is_client=False)[:100],
+        "contacts (all)":
+            Contact.objects.all()[:100],
+        "contacts (unread)":
+            Contact.objects.filter(is_read=False)[:100],
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark admin changelist queries before and after indexing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100_000,
+            help="Clients, bookings and contacts to seed (default: 100000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per query (default: 5).",
+        )
+        parser.add_argument(
+            "--plans",
+            action="store_true",
+            help="Print the query plan of every query.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["rows"])
+
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f"\nBefore: without changelist indexes "
+                    f"({connection.vendor}, {options['rows']:,} rows)"
+                ))
+                self.drop_indexes()
+                before = self.measure(options["repeat"], options["plans"])
+
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    "\nAfter: with changelist indexes"
+                ))
+                self.create_indexes()
+                after = self.measure(options["repeat"], options["plans"])
+
+                self.summarise(before, after)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("\nSeeded rows and index changes rolled back.")
+
+    def seed(self, rows):
+        """Insert rows clients, each with a booking, and rows contacts."""
+        rng = random.Random(rows)
+        today = date.today()
+        batch_size = 5_000
+
+        for start in range(0, rows, batch_size):
+            stop = min(start + batch_size, rows)
+            clients = ClientList.objects.bulk_create([
+                ClientList(
+                    first_name=f"First{i}",
+                    last_name=f"Last{rng.randrange(rows)}",
+                    email=f"changelist-{i}@example.com",
+                    phone_number=f"07{i:09d}",
+                    is_client=rng.random() < 0.3,
+                )
+                for i in range(start, stop)
+            ])
+            Booking.objects.bulk_create([
+                Booking(
+                    client=client,
+                    booking_date=today + timedelta(
+                        days=rng.randint(-365, 365)
+                    ),
+                    booking_earliest="0900",
+                    booking_latest="1700",
+                    is_confirmed=rng.random() < 0.8,
+                    access_token=generate_access_token(),
+                )
+                for client in clients
+            ])
+            Contact.objects.bulk_create([
+                Contact(
+                    name=f"Visitor {i}",
+                    email=f"visitor-{i}@example.com",
+                    message="Benchmark message body.",
+                    is_read=rng.random() < 0.9,
+                )
+                for i in range(start, stop)
+            ])
+        self.analyze()
+
+    def drop_indexes(self):
+        """Drop every changelist index declared in Meta.indexes."""
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(
+                        f"DROP INDEX IF EXISTS {editor.quote_name(index.name)}"
+                    )
+        self.analyze()
+
+    def create_indexes(self):
+        """Recreate every changelist index declared in Meta.indexes."""
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(str(index.create_sql(model, editor)))
+        self.analyze()
+
+    def analyze(self):
+        """Refresh planner statistics so plans reflect the seeded data."""
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def measure(self, repeat, show_plans):
+        """Time each changelist query and return medians in milliseconds."""
+        results = {}
+        for label, queryset in changelist_queries().items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset._chain())
+                timings.append((time.perf_counter() - start) * 1000)
+            results[label] = statistics.median(timings)
+            self.stdout.write(f"  {label:<36} {results[label]:9.2f} ms")
+            if show_plans:
+                for line in queryset.explain().splitlines():
+                    self.stdout.write(f"      {line}")
+        return results
+
+    def summarise(self, before, after):
+        """Print the speed-up of every query."""
+        self.stdout.write(self.style.MIGRATE_HEADING("\nSpeed-up"))
+        for label, before_ms in before.items():
+            after_ms = after[label]
+            ratio = before_ms / after_ms if after_ms else float("inf")
+            self.stdout.write(
+                f"  {label:<36} {before_ms:9.2f} -> {after_ms:9.2f} ms"
+                f"  ({ratio:.1f}x)"
+            )
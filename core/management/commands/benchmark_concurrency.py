@@ -0,0 +1,273 @@
+"""
+Compare the sync (WSGI) and async (ASGI) server profiles under load.
+
+Starts the site with gunicorn in each profile of config/gunicorn.conf.py,
+then keeps a fixed number of concurrent clients busy for a while at each
+concurrency level, and reports throughput, latency percentiles and errors.
+Each client makes one request per connection, cycling through the service
+list, a booking lookup by access key and a contact message, so both
+profiles see the same mix of reads and writes. Contact messages go to a
+temporary spool list (or, without a spool, into the database) and are
+removed afterwards.
+
+The server uses the database DATABASE_URL points at; bookings looked up
+use random access keys, so nothing needs to be seeded. The load comes
+from this process, which can itself become the bottleneck at high
+concurrency: compare the profiles with each other, not with production.
+
+Usage:
+    python manage.py benchmark_concurrency
+    python manage.py benchmark_concurrency --concurrency 100 1000 --duration 20
+    python manage.py benchmark_concurrency --profile asgi --workers 4
+"""
+
+import asyncio
+import os
+import resource
+import secrets
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import spool
+from core.models import Contact
+
+PROFILES = ("wsgi", "asgi")
+
+# Sender of the benchmark's contact messages, removed after each run
+BENCHMARK_EMAIL = "benchmark@example.invalid"
+HOST = "127.0.0.1"
+
+# Seconds to wait for gunicorn to accept connections
+STARTUP_TIMEOUT = 30
+
+
+class Command(BaseCommand):
+    help = "Compare WSGI and ASGI throughput at several concurrency levels."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[100, 1000],
+            help="Concurrent clients per run (default: 100 1000).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10.0,
+            help="Seconds each run lasts (default: 10).",
+        )
+        parser.add_argument(
+            "--profile",
+            choices=PROFILES,
+            action="append",
+            help="Only run this server profile (repeatable).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.WEB_CONCURRENCY,
+            help="Worker processes per server "
+                 f"(default: WEB_CONCURRENCY, {settings.WEB_CONCURRENCY}).",
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=8765,
+            help="Port the servers listen on (default: 8765).",
+        )
+
+    def handle(self, *args, **options):
+        profiles = options["profile"] or PROFILES
+        self.raise_open_files_limit(max(options["concurrency"]))
+        self.csrf_token = secrets.token_hex(16)
+
+        results = {}
+        for profile in profiles:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n{profile}: {options['workers']} workers, "
+                f"{options['duration']:g}s per run"
+            ))
+            with self.server(profile, options["workers"], options["port"]):
+                for concurrency in options["concurrency"]:
+                    result = asyncio.run(self.run(
+                        options["port"], concurrency, options["duration"]
+                    ))
+                    results[profile, concurrency] = result
+                    self.stdout.write(
+                        f"  {concurrency:>5} clients  "
+                        f"{result['rps']:8.1f} req/s  "
+                        f"p50 {result['p50']:8.1f} ms  "
+                        f"p95 {result['p95']:8.1f} ms  "
+                        f"p99 {result['p99']:8.1f} ms  "
+                        f"{result['errors']} errors"
+                    )
+
+        if set(profiles) == set(PROFILES):
+            self.stdout.write(self.style.MIGRATE_HEADING("\nasgi vs wsgi"))
+            for concurrency in options["concurrency"]:
+                wsgi = results["wsgi", concurrency]["rps"]
+                asgi = results["asgi", concurrency]["rps"]
+                ratio = f"{asgi / wsgi:.2f}x" if wsgi else "-"
+                self.stdout.write(
+                    f"  {concurrency:>5} clients  {wsgi:8.1f} -> "
+                    f"{asgi:8.1f} req/s  ({ratio})"
+                )
+
+    def raise_open_files_limit(self, concurrency):
+        """Allow one socket per client, if the hard limit permits it."""
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        needed = concurrency + 256
+        if soft >= needed:
+            return
+        if hard != resource.RLIM_INFINITY and hard < needed:
+            raise CommandError(
+                f"{concurrency} clients need {needed} open files, but the "
+                f"limit is {hard}."
+            )
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+
+    @contextmanager
+    def server(self, profile, workers, port):
+        """Run gunicorn in the given profile for the duration of the block."""
+        spool_key = f"benchmark:contacts:{secrets.token_hex(8)}"
+        env = {
+            **os.environ,
+            "SERVER_PROFILE": profile,
+            "WEB_CONCURRENCY": str(workers),
+            "PORT": str(port),
+            # Benchmark contact messages must never reach the real spool
+            "CONTACT_SPOOL_KEY": spool_key,
+            # Every request is slow under load; skip those warnings
+            "LOG_LEVEL": "ERROR",
+            # Every request comes from one address
+            "RATELIMIT_ENABLED": "0",
+        }
+        process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "config/gunicorn.conf.py",
+             "--bind", f"{HOST}:{port}", "--log-level", "warning"],
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+        try:
+            self.wait_for_server(process, port)
+            yield
+        finally:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            client = spool.spool_client()
+            if client is not None:
+                client.delete(spool_key, f"{spool_key}:failed")
+            Contact.objects.filter(email=BENCHMARK_EMAIL).delete()
+
+    def wait_for_server(self, process, port):
+        """Block until the server accepts connections."""
+        async def connect():
+            _, writer = await asyncio.open_connection(HOST, port)
+            writer.close()
+            await writer.wait_closed()
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(
+                    f"gunicorn exited with code {process.returncode}."
+                )
+            try:
+                asyncio.run(connect())
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(
+            f"gunicorn did not start within {STARTUP_TIMEOUT} seconds."
+        )
+
+    def requests(self):
+        """Return the raw HTTP requests each client cycles through."""
+        def post(path, data):
+            body = urlencode(data).encode()
+            return (
+                f"POST {path} HTTP/1.1\r\n"
+                f"Host: {HOST}\r\n"
+                f"Connection: close\r\n"
+                f"Cookie: csrftoken={self.csrf_token}\r\n"
+                f"X-CSRFToken: {self.csrf_token}\r\n"
+                f"Content-Type: application/x-www-form-urlencoded\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+
+        return [
+            (
+                f"GET /services/ HTTP/1.1\r\n"
+                f"Host: {HOST}\r\n"
+                f"Connection: close\r\n\r\n"
+            ).encode(),
+            post("/bookings/info/", {"access_key": secrets.token_urlsafe()}),
+            post("/contact/", {
+                "name": "Bench Visitor",
+                "email": BENCHMARK_EMAIL,
+                "message": "A benchmark contact message.",
+            }),
+        ]
+
+    async def run(self, port, concurrency, duration):
+        """Keep concurrency clients busy for duration seconds."""
+        requests = self.requests()
+        timings = []
+        errors = 0
+        deadline = time.monotonic() + duration
+
+        async def client(offset):
+            nonlocal errors
+            i = offset
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    reader, writer = await asyncio.open_connection(HOST, port)
+                    writer.write(requests[i % len(requests)])
+                    await writer.drain()
+                    response = await reader.read()
+                    writer.close()
+                except OSError:
+                    errors += 1
+                    continue
+                finally:
+                    i += 1
+                status = response.split(b" ", 2)[1:2]
+                if not status or not status[0].startswith((b"2", b"3")):
+                    errors += 1
+                    continue
+                timings.append((time.perf_counter() - start) * 1000)
+
+        started = time.monotonic()
+        await asyncio.gather(*(client(n) for n in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+        if len(timings) < 2:
+            raise CommandError(
+                f"Only {len(timings)} successful requests at {concurrency} "
+                f"clients ({errors} errors)."
+            )
+        percentiles = statistics.quantiles(
+            timings, n=100, method="inclusive"
+        )
+        return {
+            "rps": len(timings) / elapsed,
+            "p50": percentiles[49],
+            "p95": percentiles[94],
+            "p99": percentiles[98],
+            "errors": errors,
+        }
@@ -0,0 +1,369 @@
+"""
+Benchmark the public booking and catalog routes end to end.
+
+Seeds services, clients and bookings in a transaction, then drives the real
+URL routes in-process through Django's test client, so every request runs
+the full middleware stack, the views, the templates and the database
+queries. For each route it reports p50/p95/p99 latency, throughput and
+queries per request, and compares them with a stored baseline: more
+queries than the baseline, or a p95 latency beyond the tolerance, fails
+the command. All seeded rows are rolled back at the end.
+
+Works on SQLite and PostgreSQL, whichever DATABASE_URL points at. Latency
+baselines only compare like with like, so save one per machine and
+database with --save-baseline.
+
+Usage:
+    python manage.py benchmark_routes
+    python manage.py benchmark_routes --clients 50000 --requests 500
+    python manage.py benchmark_routes --save-baseline
+"""
+
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core import catalog
+from core.middleware import QueryCounter
+from core.models import Booking, ClientList, Service
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "routes.json"
+
+FIRST_NAMES = ["Alice", "Brian", "Chloe", "David", "Emma", "Frank", "Grace"]
+LAST_NAMES = ["Smith", "Jones", "Taylor", "Brown", "Wilson", "Evans"]
+SEARCH_TERMS = ["a", "sm", "jon", "tay", "clean", "gar"]
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded rows once the benchmark is done."""
+
+
+class Command(BaseCommand):
+    help = "Benchmark the booking and catalog routes against a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=10_000,
+            help="Clients (each with a booking) to seed (default: 10000).",
+        )
+        parser.add_argument(
+            "--services",
+            type=int,
+            default=40,
+            help="Available services to seed (default: 40).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Timed requests per route (default: 200).",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=10,
+            help="Untimed requests per route first (default: 10).",
+        )
+        parser.add_argument(
+            "--route",
+            action="append",
+            help="Only benchmark this route (repeatable).",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=DEFAULT_BASELINE,
+            help=f"Baseline JSON file (default: {DEFAULT_BASELINE}).",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Write the results to the baseline file instead of "
+                 "comparing.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.5,
+            help="Allowed p95 slowdown over the baseline (default: 0.5, "
+                 "i.e. 50%%).",
+        )
+
+    def handle(self, *args, **options):
+        routes = self.routes()
+        if options["route"]:
+            unknown = set(options["route"]) - routes.keys()
+            if unknown:
+                raise CommandError(
+                    f"Unknown route(s): {', '.join(sorted(unknown))}. "
+                    f"Available: {', '.join(routes)}."
+                )
+            routes = {name: routes[name] for name in options["route"]}
+
+        self.tokens = []
+        overrides = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            # Benchmark contact messages are inserted directly, so they are
+            # rolled back with the seeded rows and never reach the spool
+            CONTACT_SPOOL_URL="",
+            # Every request comes from one address
+            RATELIMIT_ENABLED=False,
+        )
+        try:
+            with overrides, transaction.atomic():
+                self.seed(options["clients"], options["services"])
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f"\n{len(routes)} routes, {options['requests']} requests "
+                    f"each ({connection.vendor}, {options['clients']:,} "
+                    f"clients, {options['services']} services)"
+                ))
+                results = {
+                    name: self.measure(
+                        name, route, options["warmup"], options["requests"]
+                    )
+                    for name, route in routes.items()
+                }
+                raise Rollback
+        except Rollback:
+            self.stdout.write("\nSeeded rows rolled back.")
+        finally:
+            # The shared cache may hold the seeded (now rolled back) services
+            catalog.bump_catalog_version()
+
+        self.report(results, options)
+
+    def seed(self, clients, services):
+        """Insert services, a staff user, and clients with bookings."""
+        rng = random.Random(clients)
+        today = date.today()
+        batch_size = 5_000
+
+        self.services = Service.objects.bulk_create([
+            Service(
+                service_name=f"Benchmark service {i}",
+                slug=f"benchmark-service-{i}",
+                description="<p>Benchmark service description.</p>" * 20,
+                excerpt="Benchmark service excerpt.",
+                available=True,
+            )
+            for i in range(services)
+        ])
+        booked = Booking.services.through
+
+        for start in range(0, clients, batch_size):
+            stop = min(start + batch_size, clients)
+            created = ClientList.objects.bulk_create([
+                ClientList(
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    email=f"route-bench-{i}@example.com",
+                    phone_number=f"07{i:09d}",
+                    is_client=rng.random() < 0.3,
+                )
+                for i in range(start, stop)
+            ])
+            bookings = Booking.objects.bulk_create([
+                Booking(
+                    client=client,
+                    booking_date=today + timedelta(days=rng.randint(1, 365)),
+                    booking_earliest="0900",
+                    booking_latest="1000",
+                    is_confirmed=rng.random() < 0.8,
+                    access_token=f"route-bench-{client.email}",
+                )
+                for client in created
+            ])
+            booked.objects.bulk_create([
+                booked(booking=booking, service=rng.choice(self.services))
+                for booking in bookings
+            ])
+            self.tokens.extend(booking.access_token for booking in bookings)
+
+        self.staff = User.objects.create_user(
+            "route-bench-staff", "staff@example.com", is_staff=True
+        )
+        # bulk_create bypasses the signal that moves this on
+        catalog.bump_catalog_version()
+
+    def routes(self):
+        """
+        Return the benchmarked routes, keyed by name.
+
+        Each route is a function taking a visitor client, a staff client and
+        the request number, and making one request.
+        """
+        def form(hours, day):
+            return {
+                "booking_date": (
+                    date.today() + timedelta(days=400 + day)
+                ).isoformat(),
+                "earliest_availability_hour": f"{hours[0]:02d}",
+                "earliest_availability_min": "00",
+                "latest_availability_hour": f"{hours[1]:02d}",
+                "latest_availability_min": "00",
+            }
+
+        def service(i):
+            return self.services[i % len(self.services)]
+
+        def autocomplete(name):
+            return lambda visitor, staff, i: staff.get(
+                reverse(name), {"q": SEARCH_TERMS[i % len(SEARCH_TERMS)]}
+            )
+
+        return {
+            "services": lambda visitor, staff, i: visitor.get(
+                reverse("services")
+            ),
+            "service_detail": lambda visitor, staff, i: visitor.get(
+                reverse("service_detail", args=[service(i).slug])
+            ),
+            "bookings_with_service": lambda visitor, staff, i: visitor.get(
+                reverse("bookings_with_service", args=[service(i).slug])
+            ),
+            "book_service": lambda visitor, staff, i: visitor.post(
+                reverse("book_service"), {
+                    "first_name": "Bench",
+                    "last_name": "Visitor",
+                    "email_address": f"route-bench-new-{i}@example.com",
+                    "phone_number": "01234 567890",
+                    "services": service(i).pk,
+                    **form((9, 10), i),
+                }
+            ),
+            "booking_info": lambda visitor, staff, i: visitor.post(
+                reverse("booking_info"),
+                {"access_key": self.tokens[i % len(self.tokens)]},
+            ),
+            "edit_booking": lambda visitor, staff, i: visitor.post(
+                reverse("edit_booking"), {
+                    "access_token": self.tokens[i % len(self.tokens)],
+                    **form((13, 14), i),
+                }
+            ),
+            "contact": lambda visitor, staff, i: visitor.post(
+                reverse("contact"), {
+                    "name": "Bench Visitor",
+                    "email": "visitor@example.com",
+                    "message": "A benchmark contact message.",
+                }
+            ),
+            "service_autocomplete": autocomplete("service-autocomplete"),
+            "user_autocomplete": autocomplete("user-autocomplete"),
+            "client_autocomplete": autocomplete("client-autocomplete"),
+        }
+
+    def measure(self, name, route, warmup, requests):
+        """Run one route and return its latency, throughput and queries."""
+        visitor = Client()
+        staff = Client()
+        staff.force_login(self.staff)
+
+        for i in range(warmup):
+            route(visitor, staff, i)
+
+        timings = []
+        queries = []
+        for i in range(warmup, warmup + requests):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                response = route(visitor, staff, i)
+                timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise CommandError(
+                    f"{name} answered {response.status_code}."
+                )
+            queries.append(counter.count)
+
+        percentiles = statistics.quantiles(
+            timings, n=100, method="inclusive"
+        )
+        result = {
+            "p50": round(percentiles[49], 3),
+            "p95": round(percentiles[94], 3),
+            "p99": round(percentiles[98], 3),
+            "rps": round(len(timings) / (sum(timings) / 1000), 1),
+            "queries": max(queries),
+        }
+        self.stdout.write(
+            f"  {name:<22} p50 {result['p50']:8.2f} ms"
+            f"  p95 {result['p95']:8.2f} ms  p99 {result['p99']:8.2f} ms"
+            f"  {result['rps']:8.1f} req/s  {result['queries']:3d} queries"
+        )
+        return result
+
+    def report(self, results, options):
+        """Save the results as the baseline, or compare them with it."""
+        path = options["baseline"]
+        if options["save_baseline"]:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            baseline = {
+                "database": connection.vendor,
+                "clients": options["clients"],
+                "services": options["services"],
+                "routes": results,
+            }
+            path.write_text(json.dumps(baseline, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {path}."))
+            return
+
+        if not path.exists():
+            self.stdout.write(
+                f"No baseline at {path}; run with --save-baseline to "
+                f"create one."
+            )
+            return
+
+        baseline = json.loads(path.read_text())
+        recorded = (baseline["database"], baseline["clients"],
+                    baseline["services"])
+        if recorded != (connection.vendor, options["clients"],
+                        options["services"]):
+            self.stdout.write(self.style.WARNING(
+                "Baseline was recorded on {} with {:,} clients and {} "
+                "services; latencies are not comparable.".format(*recorded)
+            ))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\nCompared with {path}"
+        ))
+        regressions = []
+        for name, result in results.items():
+            expected = baseline["routes"].get(name)
+            if expected is None:
+                continue
+            change = result["p95"] / expected["p95"] - 1
+            self.stdout.write(
+                f"  {name:<22} p95 {expected['p95']:8.2f} -> "
+                f"{result['p95']:8.2f} ms ({change:+.0%})  queries "
+                f"{expected['queries']} -> {result['queries']}"
+            )
+            if result["queries"] > expected["queries"]:
+                regressions.append(
+                    f"{name}: {result['queries']} queries, baseline "
+                    f"{expected['queries']}"
+                )
+            if change > options["tolerance"]:
+                regressions.append(
+                    f"{name}: p95 {result['p95']:.2f} ms, baseline "
+                    f"{expected['p95']:.2f} ms ({change:+.0%})"
+                )
+
+        if regressions:
+            raise CommandError(
+                "Performance regressions:\n  " + "\n  ".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions."))
@@ -0,0 +1,89 @@
+"""
+Build the self-hosted front-end assets into static/dist/.
+
+Downloads Bootstrap and Font Awesome at their pinned versions (once; they
+are cached in assets/vendor/ and checked against their SRI hashes), cuts
+Font Awesome down to the icons the templates and scripts use, bundles and
+minifies each booking page's scripts, and extracts the critical CSS of the
+main pages. Run it before collectstatic,
+which fingerprints and compresses the results (bin/post_compile does both
+on deploy). See core/assets.py.
+
+Usage:
+    python manage.py build_assets
+    python manage.py build_assets --no-vendor
+"""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import assets
+
+
+class Command(BaseCommand):
+    help = "Build vendored, subset and bundled assets into static/dist/."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-vendor",
+            action="store_true",
+            help="Only rebuild the script bundles; no download needed.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=assets.dist_dir(),
+            help="Directory to build into (default: static/dist/).",
+        )
+
+    def handle(self, *args, **options):
+        out_dir = options["output"]
+        base_dir = Path(settings.BASE_DIR)
+
+        sizes = assets.build_bundles(
+            base_dir / "static" / "js", out_dir / "js"
+        )
+        for name, size in sizes.items():
+            self.stdout.write(f"  js/{name}: {size / 1024:.1f} KiB")
+        if options["no_vendor"]:
+            return
+
+        cache_dir = assets.vendor_cache_dir()
+        try:
+            downloaded = assets.fetch_vendor_files(cache_dir)
+        except assets.AssetBuildError as e:
+            raise CommandError(str(e)) from e
+        for name in downloaded:
+            self.stdout.write(f"  downloaded {name}")
+
+        assets.copy_vendor_files(cache_dir, out_dir / "vendor")
+        icons = assets.build_icons(
+            cache_dir,
+            out_dir / "fontawesome",
+            [
+                base_dir / "templates",
+                base_dir / "core" / "templates",
+                base_dir / "static" / "js",
+            ],
+        )
+        self.stdout.write(f"  fontawesome: {icons} icons")
+
+        # Built stylesheets are read from the output, the rest from static/
+        stylesheets = [
+            (name, out_dir / name.removeprefix("dist/")
+             if name.startswith("dist/") else base_dir / "static" / name)
+            for name in assets.STYLESHEETS
+        ]
+        sizes = assets.build_critical_css(
+            stylesheets,
+            out_dir / "critical",
+            [base_dir / "templates", base_dir / "core" / "templates"],
+        )
+        for page, (critical, full) in sizes.items():
+            self.stdout.write(
+                f"  critical/{page}.css: {critical / 1024:.1f} KiB inlined "
+                f"instead of {full / 1024:.1f} KiB render-blocking"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Assets built in {out_dir}"))
@@ -0,0 +1,120 @@
+"""
+Stream every client and their booking out as CSV or JSON Lines.
+
+Writes one row per client in the format read by import_bookings (see
+core/transfer.py). Clients are fetched in primary key chunks with their
+booking joined and service slugs looked up per chunk, so memory use stays
+flat however many clients there are. Access tokens are not exported.
+
+Usage:
+    python manage.py export_bookings clients.csv
+    python manage.py export_bookings - --format jsonl > clients.jsonl
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import Booking, ClientList
+from core.transfer import (
+    BOOKING_FIELDS,
+    CLIENT_FIELDS,
+    FORMATS,
+    RowWriter,
+    guess_format,
+    open_stream,
+    slugs_by_owner,
+)
+
+
+def export_rows(chunk_size):
+    """
+    Yield one export row per client, reading the tables in pk chunks.
+
+    Each chunk costs three queries: clients LEFT JOINed to their booking,
+    then the linked and booked service slugs for the whole chunk. Rows are
+    read as tuples rather than model instances, and chunks are walked by
+    primary key so later chunks are as cheap as the first.
+
+    Args:
+        chunk_size (int): Clients fetched per chunk
+
+    Yields:
+        dict: Row keyed by core.transfer.COLUMNS
+    """
+    columns = (
+        ("pk", "booking__pk")
+        + CLIENT_FIELDS
+        + tuple(f"booking__{field}" for field in BOOKING_FIELDS)
+    )
+    last_pk = 0
+    while True:
+        chunk = list(
+            ClientList.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list(*columns)[:chunk_size]
+        )
+        if not chunk:
+            return
+        linked = slugs_by_owner(
+            ClientList.linked_services.through, "clientlist_id",
+            [values[0] for values in chunk],
+        )
+        booked = slugs_by_owner(
+            Booking.services.through, "booking_id",
+            [values[1] for values in chunk if values[1] is not None],
+        )
+
+        for values in chunk:
+            client_pk, booking_pk = values[:2]
+            row = dict(zip(CLIENT_FIELDS + BOOKING_FIELDS, values[2:]))
+            row["linked_services"] = linked[client_pk]
+            row["services"] = booked[booking_pk]
+            if row["booking_date"] is not None:
+                row["booking_date"] = row["booking_date"].isoformat()
+            yield row
+        last_pk = chunk[-1][0]
+
+
+class Command(BaseCommand):
+    help = "Stream clients and bookings out as CSV or JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help='File to write, or "-" for standard output.',
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format (default: guessed from the extension).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2_000,
+            help="Clients fetched per query (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or guess_format(path)
+
+        stream = open_stream(path, "w")
+        writer = RowWriter(stream, fmt)
+        exported = 0
+        start = time.perf_counter()
+        try:
+            for row in export_rows(options["chunk_size"]):
+                writer.write(row)
+                exported += 1
+        finally:
+            if path != "-":
+                stream.close()
+
+        elapsed = time.perf_counter() - start
+        # Report on stderr so the summary never ends up in piped output
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {exported:,} clients in {elapsed:.1f}s "
+            f"({exported / elapsed if elapsed else 0:,.0f} rows/s)."
+        ))
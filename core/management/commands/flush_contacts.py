@@ -0,0 +1,99 @@
+"""
+Drain the contact form spool into the database.
+
+contact_view queues submissions in Redis (see core/spool.py). Run this
+command once to insert everything queued so far, or with --loop as a
+long-running worker next to gunicorn (see the worker entry in Procfile). The
+worker flushes as soon as CONTACT_SPOOL_BATCH_SIZE messages are waiting, or
+when the oldest has waited CONTACT_SPOOL_MAX_DELAY seconds, and flushes
+once more before exiting on SIGTERM or SIGINT. A failed cycle (Redis or the
+database unreachable, say) is logged and retried on the next one.
+
+Usage:
+    python manage.py flush_contacts
+    python manage.py flush_contacts --loop
+"""
+
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core import spool
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Insert queued contact form submissions in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and flush by batch size or age.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.5,
+            help="Seconds between spool checks with --loop (default: 0.5).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CONTACT_SPOOL_BATCH_SIZE,
+            help="Rows per bulk insert (default: CONTACT_SPOOL_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if spool.spool_client() is None:
+            self.stdout.write(
+                "No contact spool (CONTACT_SPOOL_URL is not set); messages "
+                "are inserted as they are submitted."
+            )
+            return
+        if not options["loop"]:
+            self.flush(batch_size)
+            return
+
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.stdout.write(f"Watching {settings.CONTACT_SPOOL_KEY} ...")
+
+        while self.running:
+            self.cycle(batch_size)
+            time.sleep(options["interval"])
+
+        # Drain whatever arrived while shutting down
+        self.flush(batch_size)
+
+    def cycle(self, batch_size):
+        """Flush if a batch is full or overdue; log and survive failures."""
+        try:
+            if (spool.pending_count() >= batch_size or
+                    spool.oldest_age() >= settings.CONTACT_SPOOL_MAX_DELAY):
+                close_old_connections()
+                self.flush(batch_size)
+        except Exception:
+            # Queued messages stay queued; the next cycle retries them
+            logger.exception("Flushing the contact spool failed")
+
+    def stop(self, signum, frame):
+        """Signal handler: finish the current cycle, then exit."""
+        self.running = False
+
+    def flush(self, batch_size):
+        """Flush the spool and report how many messages were inserted."""
+        start = time.perf_counter()
+        inserted = spool.flush_contacts(batch_size)
+        if inserted:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stdout.write(
+                f"Inserted {inserted} contact messages in {elapsed:.1f} ms."
+            )
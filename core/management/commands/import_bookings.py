@@ -0,0 +1,231 @@
+"""
+Stream clients and their bookings into the database from CSV or JSON Lines.
+
+Each row describes one client and, optionally, their booking (see
+core/transfer.py for the columns). Rows are read one at a time and written
+in batches with bulk_create, including the Booking.services and
+ClientList.linked_services through-table rows, so memory use stays flat
+however large the file is. Clients whose email already exists are skipped.
+
+Usage:
+    python manage.py import_bookings partner.csv
+    python manage.py import_bookings partner.jsonl --tokens tokens.csv
+"""
+
+import csv
+import time
+from datetime import date
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import scheduling
+from core.tokens import generate_access_token
+from core.models import Booking, ClientList, Service
+from core.transfer import (
+    FORMATS, guess_format, open_stream, parse_bool, parse_slugs, read_rows,
+)
+
+
+class RowError(ValueError):
+    """Raised for a row that cannot be imported."""
+
+
+class Command(BaseCommand):
+    help = "Bulk import clients and bookings from CSV or JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help='File to import, or "-" for standard input.',
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format (default: guessed from the extension).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2_000,
+            help="Rows inserted per batch (default: 2000).",
+        )
+        parser.add_argument(
+            "--tokens",
+            metavar="PATH",
+            help="Write email,access_token of every new booking to a CSV "
+                 "file so guests can be sent their access keys.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or guess_format(path)
+        self.verbosity = options["verbosity"]
+        self.services = dict(Service.objects.values_list("slug", "pk"))
+        self.imported = self.skipped = self.bookings = 0
+
+        tokens_file = None
+        self.tokens = None
+        if options["tokens"]:
+            tokens_file = open_stream(options["tokens"], "w")
+            self.tokens = csv.writer(tokens_file)
+            self.tokens.writerow(["email", "access_token"])
+
+        stream = open_stream(path, "r")
+        start = time.perf_counter()
+        try:
+            rows = read_rows(stream, fmt)
+            while True:
+                batch = list(islice(rows, options["batch_size"]))
+                if not batch:
+                    break
+                self.import_batch(batch)
+                self.report_progress(start)
+        except ValueError as e:
+            # Malformed file (e.g. invalid JSON); earlier batches are kept
+            raise CommandError(f"Import stopped: {e}")
+        finally:
+            if path != "-":
+                stream.close()
+            if tokens_file is not None and options["tokens"] != "-":
+                tokens_file.close()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {self.imported:,} clients and {self.bookings:,} "
+            f"bookings, skipped {self.skipped:,} rows in {elapsed:.1f}s "
+            f"({self.imported / elapsed if elapsed else 0:,.0f} rows/s)."
+        ))
+
+    def report_progress(self, start):
+        """Print the running total and throughput to stderr."""
+        if self.verbosity < 2:
+            return
+        elapsed = time.perf_counter() - start
+        rate = self.imported / elapsed if elapsed else 0
+        self.stderr.write(f"  {self.imported:,} rows ({rate:,.0f} rows/s)")
+
+    def parse_row(self, line_number, row):
+        """
+        Validate a row and convert it to model field values.
+
+        Returns:
+            tuple: (client fields, booking fields or None, service pks,
+                    linked service pks)
+
+        Raises:
+            RowError: If a required value is missing or invalid
+        """
+        client = {
+            field: (row.get(field) or "").strip()
+            for field in ("first_name", "last_name", "email", "phone_number")
+        }
+        missing = [field for field, value in client.items() if not value]
+        if missing:
+            raise RowError(
+                f"line {line_number}: missing {', '.join(missing)}"
+            )
+        client["is_client"] = parse_bool(row.get("is_client"))
+
+        try:
+            linked = self.service_pks(row.get("linked_services"))
+            services = self.service_pks(row.get("services"))
+        except KeyError as e:
+            raise RowError(f"line {line_number}: unknown service {e}")
+
+        booking = None
+        if row.get("booking_date"):
+            earliest = str(row.get("booking_earliest") or "").zfill(4)
+            latest = str(row.get("booking_latest") or "").zfill(4)
+            try:
+                booking_date = date.fromisoformat(str(row["booking_date"]))
+                scheduling.to_window(earliest, latest)
+            except ValueError as e:
+                raise RowError(f"line {line_number}: {e}")
+            booking = {
+                "booking_date": booking_date,
+                "booking_earliest": earliest,
+                "booking_latest": latest,
+                "is_confirmed": parse_bool(row.get("is_confirmed")),
+            }
+        return client, booking, services, linked
+
+    def service_pks(self, value):
+        """Map a list of slugs to Service pks (KeyError if unknown)."""
+        return [self.services[slug] for slug in parse_slugs(value)]
+
+    def import_batch(self, batch):
+        """Insert one batch of rows in a single transaction."""
+        parsed = {}
+        for line_number, row in batch:
+            try:
+                client, booking, services, linked = self.parse_row(
+                    line_number, row
+                )
+            except RowError as e:
+                self.stderr.write(f"Skipped {e}")
+                self.skipped += 1
+                continue
+            if client["email"] in parsed:
+                self.stderr.write(
+                    f"Skipped line {line_number}: duplicate email "
+                    f"{client['email']}"
+                )
+                self.skipped += 1
+                continue
+            parsed[client["email"]] = (client, booking, services, linked)
+
+        existing = set(ClientList.objects.filter(
+            email__in=list(parsed)
+        ).values_list("email", flat=True))
+        for email in existing:
+            del parsed[email]
+        self.skipped += len(existing)
+        if not parsed:
+            return
+
+        with transaction.atomic():
+            clients = ClientList.objects.bulk_create([
+                ClientList(**client) for client, _, _, _ in parsed.values()
+            ])
+
+            rows = list(zip(clients, parsed.values()))
+            bookings = Booking.objects.bulk_create([
+                Booking(
+                    client=client,
+                    access_token=generate_access_token(),
+                    **booking,
+                )
+                for client, (_, booking, _, _) in rows
+                if booking is not None
+            ])
+
+            LinkedService = ClientList.linked_services.through
+            LinkedService.objects.bulk_create([
+                LinkedService(clientlist_id=client.pk, service_id=service)
+                for client, (_, _, _, linked) in rows
+                for service in linked
+            ])
+
+            booking_by_client = {
+                booking.client_id: booking for booking in bookings
+            }
+            BookedService = Booking.services.through
+            BookedService.objects.bulk_create([
+                BookedService(
+                    booking_id=booking_by_client[client.pk].pk,
+                    service_id=service,
+                )
+                for client, (_, _, services, _) in rows
+                if client.pk in booking_by_client
+                for service in services
+            ])
+
+        if self.tokens is not None:
+            self.tokens.writerows(
+                [booking.client.email, booking.access_token]
+                for booking in bookings
+            )
+        self.imported += len(clients)
+        self.bookings += len(bookings)
@@ -0,0 +1,209 @@
+"""
+Show what a fresh web process spends its startup time on.
+
+Starts a new Python process, the way a gunicorn worker starts, and reports:
+
+- import time per top-level package (from python -X importtime). A module
+  counts towards the package that imported it first, so shared
+  dependencies show up under whichever app needed them first
+- the time to load the WSGI application (settings, apps, middleware)
+- each warm-up step of core/warmup.py, which the workers run before they
+  serve (see config/gunicorn.conf.py), and which the first requests would
+  otherwise pay for
+- the modules loaded and the peak memory (max RSS) once warmed up
+
+--profile runs the process under an APP_PROFILE (see config/settings.py);
+given more than once, it compares the profiles side by side.
+
+Usage:
+    python manage.py startup_report
+    python manage.py startup_report --limit 20
+    python manage.py startup_report --profile public
+    python manage.py startup_report --profile full --profile public \
+        --profile admin
+"""
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in the fresh process; prints the timings as JSON on the last line
+SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+loaded = time.perf_counter() - start
+from core import warmup
+steps = warmup.warm_up_process() + warmup.warm_up_connections()
+# Kilobytes on Linux, bytes on macOS
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss //= 1024
+print(json.dumps({
+    "application": loaded,
+    "steps": steps,
+    "modules": len(sys.modules),
+    "max_rss_kb": rss,
+}))
+"""
+
+PROFILES = ("full", "public", "admin")
+
+
+class Command(BaseCommand):
+    help = "Report import and warm-up time of a fresh web process."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=12,
+            help="Packages listed by import time (default: 12).",
+        )
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=PROFILES,
+            help="APP_PROFILE to measure; repeat to compare profiles.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = options["profile"]
+        if profiles and len(profiles) > 1:
+            self.compare(
+                {profile: self.measure(profile) for profile in profiles}
+            )
+            return
+
+        profile = profiles[0] if profiles else None
+        timings, imports = self.measure(profile)
+        if profile:
+            self.stdout.write(f"APP_PROFILE={profile}\n")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Imports"))
+        ranked = sorted(imports.items(), key=lambda item: -item[1])
+        for package, seconds in ranked[:options["limit"]]:
+            self.stdout.write(f"  {package:<28} {seconds * 1000:8.1f} ms")
+        rest = sum(seconds for _, seconds in ranked[options["limit"]:])
+        self.stdout.write(f"  {'(other)':<28} {rest * 1000:8.1f} ms")
+        self.stdout.write(
+            f"  {'total':<28} {sum(imports.values()) * 1000:8.1f} ms"
+        )
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nStartup"))
+        self.stdout.write(
+            f"  {'application load':<28} "
+            f"{timings['application'] * 1000:8.1f} ms  "
+            "(includes most imports)"
+        )
+        warm_up = 0
+        for name, seconds, detail in timings["steps"]:
+            warm_up += seconds
+            self.stdout.write(
+                f"  {'warm-up: ' + name:<28} {seconds * 1000:8.1f} ms  "
+                f"({detail})"
+            )
+        self.stdout.write(
+            f"  {'total':<28} "
+            f"{(timings['application'] + warm_up) * 1000:8.1f} ms"
+        )
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nMemory"))
+        self.stdout.write(f"  {'modules loaded':<28} {timings['modules']:8d}")
+        self.stdout.write(
+            f"  {'max RSS':<28} {timings['max_rss_kb'] / 1024:8.1f} MiB"
+        )
+
+    def measure(self, profile=None):
+        """
+        Start a fresh process and collect its startup figures.
+
+        Args:
+            profile (str, optional): APP_PROFILE to run it under; by default
+                                     the one of this environment
+
+        Returns:
+            tuple: (timings dict from SCRIPT, import_times() result)
+        """
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "config.settings"}
+        if profile:
+            env["APP_PROFILE"] = profile
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(
+                f"The startup process failed:\n{result.stderr[-2000:]}"
+            )
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        return timings, self.import_times(result.stderr)
+
+    def compare(self, results):
+        """
+        Print the startup figures of several profiles side by side.
+
+        Args:
+            results (dict): Profile -> measure() result
+        """
+        rows = [
+            ("imports (ms)", ".1f",
+             lambda timings, imports: sum(imports.values()) * 1000),
+            ("application load (ms)", ".1f",
+             lambda timings, imports: timings["application"] * 1000),
+            ("warm-up (ms)", ".1f",
+             lambda timings, imports: sum(
+                 seconds for _, seconds, _ in timings["steps"]
+             ) * 1000),
+            ("modules loaded", "d",
+             lambda timings, imports: timings["modules"]),
+            ("max RSS (MiB)", ".1f",
+             lambda timings, imports: timings["max_rss_kb"] / 1024),
+        ]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"  {'':<24}" + "".join(f"{name:>10}" for name in results)
+        ))
+        for label, spec, value in rows:
+            self.stdout.write(f"  {label:<24}" + "".join(
+                f"{value(*result):>10{spec}}" for result in results.values()
+            ))
+
+    def import_times(self, log):
+        """
+        Sum cumulative import time per top-level package.
+
+        Args:
+            log (str): stderr of python -X importtime
+
+        Returns:
+            dict: Package name -> seconds
+        """
+        entries = []
+        for line in log.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            if "imported package" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            indent = len(name) - len(name.lstrip())
+            entries.append((indent, int(cumulative), name.strip()))
+
+        # Only outermost imports: their cumulative time covers the rest
+        outermost = min(indent for indent, _, _ in entries)
+        packages = defaultdict(int)
+        for indent, microseconds, name in entries:
+            if indent == outermost:
+                packages[name.split(".")[0]] += microseconds
+        return {
+            package: microseconds / 1_000_000
+            for package, microseconds in packages.items()
+        }
@@ -0,0 +1,269 @@
+# ============================================================================
+# MIDDLEWARE MODULE - Per-request performance instrumentation and budgets
+# ============================================================================
+# PerformanceMiddleware times each request: database queries, template
+# rendering and cache reads (see core/instrumentation.py). Staff see the
+# breakdown in a Server-Timing header, shown by the browser's developer
+# tools, and requests slower than PERF_SLOW_REQUEST_MS are logged with
+# their slowest queries. It is opt-in: unless PERF_INSTRUMENTATION is on,
+# the middleware removes itself at startup.
+#
+# Most views need a handful of queries; a view that suddenly needs dozens
+# has usually grown an N+1 loop. QueryBudgetMiddleware counts the queries
+# each request runs and reports requests over their budget: a warning in
+# the logs in production, an exception in the test suite so the regression
+# fails the build. The default budget is QUERY_BUDGET; a view that really
+# needs more declares it with the query_budget decorator.
+#
+# CatalogVersionMiddleware has the catalog version read once per request
+# rather than on every catalog lookup (see core/catalog.py).
+#
+# FlashMiddleware gives views request.flash, one-shot messages kept in a
+# signed cookie rather than the session (see core/flash.py).
+#
+# All of them support both sync and async requests, so under ASGI (see
+# core/async_views.py) no request is pushed into a thread just to pass
+# through them.
+
+import contextvars
+import functools
+import logging
+from contextlib import contextmanager
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import catalog, instrumentation
+from .flash import Flash
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in tests when a request runs more queries than its budget."""
+
+
+def query_budget(limit):
+    """
+    Give a view its own query budget.
+
+    Works for sync and async views alike, as the view is returned as is.
+
+    Args:
+        limit (int): Queries the view may run per request
+
+    Returns:
+        function: Decorator setting the view's budget
+    """
+    def decorator(view_func):
+        view_func.query_budget = limit
+        return view_func
+    return decorator
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries it sees."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+# Execute wrappers of the async request being handled. The async ORM runs
+# queries in a worker thread with its own connection, which never sees
+# wrappers added to the event loop's connection; the thread does inherit
+# this context variable, and every connection runs the wrappers it holds.
+_async_wrappers = contextvars.ContextVar("async_wrappers", default=())
+
+
+def _run_async_wrappers(execute, sql, params, many, context):
+    for wrapper in reversed(_async_wrappers.get()):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def add_async_wrappers(sender, connection, **kwargs):
+    """Make a new database connection run the async request's wrappers."""
+    if _run_async_wrappers not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_run_async_wrappers)
+
+
+@contextmanager
+def async_execute_wrapper(wrapper):
+    """
+    Run wrapper around every query of the current async request.
+
+    The async counterpart of connection.execute_wrapper(): it also covers
+    queries the async ORM and sync views run in worker threads.
+
+    Args:
+        wrapper (callable): Database execute wrapper
+    """
+    token = _async_wrappers.set((*_async_wrappers.get(), wrapper))
+    try:
+        yield
+    finally:
+        _async_wrappers.reset(token)
+
+
+class HybridMiddleware:
+    """
+    Base class for middleware serving both sync and async requests.
+
+    Subclasses implement handle(request) and ahandle(request); the one
+    matching the mode of the rest of the stack is called.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.ahandle(request)
+        return self.handle(request)
+
+
+class QueryBudgetMiddleware(HybridMiddleware):
+    """
+    Count the queries of every request and report budget overruns.
+
+    Queries run while the response is streamed, after the view returned,
+    are not counted.
+    """
+
+    def handle(self, request):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        self.check(request, counter.count)
+        return response
+
+    async def ahandle(self, request):
+        counter = QueryCounter()
+        with async_execute_wrapper(counter):
+            response = await self.get_response(request)
+        self.check(request, counter.count)
+        return response
+
+    def check(self, request, count):
+        """Report the request if it ran more queries than its budget."""
+        match = request.resolver_match
+        budget = getattr(match and match.func, "query_budget", None)
+        if budget is None:
+            budget = settings.QUERY_BUDGET
+        if count <= budget:
+            return
+        message = (
+            f"{request.method} {request.path} ran {count} "
+            f"queries, over its budget of {budget}"
+        )
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class PerformanceMiddleware(HybridMiddleware):
+    """
+    Time every request and report where the time went.
+
+    Queries and time spent while a response is streamed, after the view
+    returned, are not included.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def handle(self, request):
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation.activate(metrics)
+        start = perf_counter()
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+        total = perf_counter() - start
+        user = getattr(request, "user", None)
+        self.report(request, response, metrics, total, user)
+        return response
+
+    async def ahandle(self, request):
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation.activate(metrics)
+        start = perf_counter()
+        try:
+            with async_execute_wrapper(metrics):
+                response = await self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+        total = perf_counter() - start
+        # request.user would load the user synchronously
+        user = await request.auser() if hasattr(request, "auser") else None
+        self.report(request, response, metrics, total, user)
+        return response
+
+    def report(self, request, response, metrics, total, user):
+        """Add the Server-Timing header for staff and log slow requests."""
+        match = request.resolver_match
+        view_name = match.view_name if match else "-"
+        if user is not None and user.is_staff:
+            response["Server-Timing"] = metrics.server_timing(
+                total, view_name
+            )
+        if total * 1000 >= settings.PERF_SLOW_REQUEST_MS:
+            slowest = "".join(
+                f"\n  {elapsed * 1000:.1f} ms: {sql}"
+                for elapsed, sql in sorted(metrics.slowest, reverse=True)
+            )
+            logger.warning(
+                "Slow request %s %s (%s): %.1f ms total, %d queries in "
+                "%.1f ms, templates %.1f ms%s",
+                request.method, request.path, view_name, total * 1000,
+                metrics.queries, metrics.db_time * 1000,
+                metrics.template_time * 1000, slowest,
+            )
+
+
+class CatalogVersionMiddleware(HybridMiddleware):
+    """Read the catalog version at most once per request."""
+
+    def handle(self, request):
+        with catalog.request_scope():
+            return self.get_response(request)
+
+    async def ahandle(self, request):
+        with catalog.request_scope():
+            return await self.get_response(request)
+
+
+class FlashMiddleware(HybridMiddleware):
+    """Attach request.flash and persist it in the response cookie."""
+
+    def handle(self, request):
+        request.flash = Flash(request)
+        response = self.get_response(request)
+        request.flash.update_response(response)
+        return response
+
+    async def ahandle(self, request):
+        request.flash = Flash(request)
+        response = await self.get_response(request)
+        request.flash.update_response(response)
+        return response
+
@@ -0,0 +1,84 @@
+# Trigram indexes backing the admin autocomplete search. The core models
+# declare theirs in Meta.indexes (see core/indexes.py); auth_user belongs to
+# django.contrib.auth, so its indexes are created here on PostgreSQL only.
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+import core.indexes
+
+# auth_user columns searched by the user autocomplete
+USER_TRIGRAM_COLUMNS = ["username", "first_name", "last_name", "email"]
+
+
+def index_name(column):
+    return f"auth_user_{column}_trgm_idx"
+
+
+def create_user_trigram_indexes(apps, schema_editor):
+    """
+    Create GIN trigram indexes on UPPER(column::text) of auth_user.
+
+    The same expression core.indexes.TrigramIndex builds for core models.
+    Other databases keep using plain scans.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in USER_TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{index_name(column)}" '
+            f'ON "auth_user" USING gin '
+            f'(UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_user_trigram_indexes(apps, schema_editor):
+    """Drop the auth_user trigram indexes."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in USER_TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{index_name(column)}"')
+
+
+def trigram_index(field_name, name):
+    return core.indexes.TrigramIndex(
+        django.contrib.postgres.indexes.OpClass(
+            django.db.models.functions.text.Upper(field_name),
+            name="gin_trgm_ops",
+        ),
+        name=name,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0005_contact'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='service',
+            index=trigram_index('service_name', 'service_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='clientlist',
+            index=trigram_index('first_name', 'clientlist_first_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='clientlist',
+            index=trigram_index('last_name', 'clientlist_last_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='clientlist',
+            index=trigram_index('email', 'clientlist_email_trgm'),
+        ),
+        migrations.RunPython(
+            create_user_trigram_indexes, drop_user_trigram_indexes
+        ),
+    ]
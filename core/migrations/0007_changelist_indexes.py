@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_autocomplete_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['-booking_date', '-created_on'], name='booking_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['is_confirmed', '-booking_date', '-created_on'], name='booking_confirmed_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('is_confirmed', False)), fields=['booking_date'], name='booking_unconfirmed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientlist',
+            index=models.Index(fields=['is_client', 'last_name'], name='client_status_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['-created_on'], name='contact_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-created_on'], name='contact_unread_idx'),
+        ),
+    ]
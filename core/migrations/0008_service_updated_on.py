@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_changelist_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='updated_on',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Timestamp when the service was last modified'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:34
+
+from django.db import migrations, models
+
+from core.images import build_image_variants
+
+
+def backfill_image_variants(apps, schema_editor):
+    """Compute responsive image URLs for services saved before this field."""
+    Service = apps.get_model("core", "Service")
+    for service in Service.objects.only("pk", "image_url").iterator():
+        Service.objects.filter(pk=service.pk).update(
+            image_variants=build_image_variants(service.image_url)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_service_updated_on'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Pre-computed responsive image URLs (set on save)'),
+        ),
+        migrations.RunPython(
+            backfill_image_variants, migrations.RunPython.noop
+        ),
+    ]
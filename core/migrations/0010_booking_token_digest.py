@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_service_image_variants'),
+    ]
+
+    operations = [
+        # Nullable until 0011 has backfilled the existing bookings
+        migrations.AddField(
+            model_name='booking',
+            name='token_digest',
+            field=models.CharField(editable=False, help_text="SHA-256 digest of the booking's access token", max_length=64, null=True),
+        ),
+    ]
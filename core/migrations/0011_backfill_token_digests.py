@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:00
+
+from django.db import migrations, transaction
+
+from core.tokens import hash_access_token
+
+# Bookings hashed per transaction
+BATCH_SIZE = 2_000
+
+
+def backfill_token_digests(apps, schema_editor):
+    """
+    Store the digest of every existing booking's access token.
+
+    Runs in short transactions of BATCH_SIZE bookings, so a large table is
+    never locked as a whole, and an interrupted run resumes where it
+    stopped.
+    """
+    Booking = apps.get_model("core", "Booking")
+    db = schema_editor.connection.alias
+    pending = Booking.objects.using(db).filter(
+        token_digest__isnull=True
+    ).order_by("pk")
+    while True:
+        with transaction.atomic(using=db):
+            batch = list(pending.only("pk", "access_token")[:BATCH_SIZE])
+            if not batch:
+                break
+            for booking in batch:
+                booking.token_digest = hash_access_token(booking.access_token)
+            Booking.objects.using(db).bulk_update(batch, ["token_digest"])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0010_booking_token_digest'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_token_digests, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_backfill_token_digests'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='token_digest',
+            field=models.CharField(editable=False, help_text="SHA-256 digest of the booking's access token", max_length=64, unique=True),
+        ),
+        # Only the digest is kept from now on
+        migrations.RemoveField(
+            model_name='booking',
+            name='access_token',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_booking_token_digest_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contact',
+            name='created_on',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Timestamp when the message was submitted'),
+        ),
+    ]
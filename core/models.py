@@ -6,9 +6,13 @@
 # best practices with proper field validation, relationships, and metadata.
 
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User  # Django's built-in user model
 from cloudinary.models import CloudinaryField  # For cloud-based image storage
-import secrets  # For secure token generation
+
+from .images import build_image_variants
+from .indexes import trigram_index
+from .tokens import generate_access_token, hash_access_token
 
 
 class Service(models.Model):
@@ -24,9 +28,13 @@ class Service(models.Model):
         service_name (str): Unique name of the service (max 200 chars)
         slug (str): URL-friendly version of service name for routing
         image_url (CloudinaryField): Service image stored in Cloudinary
+        image_variants (dict): Responsive transformation URLs of the image,
+                               computed on save
         description (str): Detailed description of the service
         excerpt (str): Short summary for service previews (optional)
         available (bool): Whether service is currently available for booking
+        updated_on (DateTime): When the service was last modified, used to
+                               key its cached page fragments
 
     Relationships:
         - Many-to-many with ClientList (services linked to clients)
@@ -51,6 +59,12 @@ class Service(models.Model):
         default="placeholder",
         help_text="Service image stored in Cloudinary CDN"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Pre-computed responsive image URLs (set on save)"
+    )
     description = models.TextField(
         help_text="Detailed description of what the service includes"
     )
@@ -65,9 +79,33 @@ class Service(models.Model):
         help_text="Whether this service is currently available for booking"
     )
 
+    # Audit trail, also the version of the service's cached page fragments
+    updated_on = models.DateTimeField(
+        auto_now=True,
+        help_text="Timestamp when the service was last modified"
+    )
+
+    def save(self, *args, **kwargs):
+        """
+        Override save method to pre-compute responsive image URLs.
+
+        Building Cloudinary transformation URLs is done once here rather
+        than on every page render (see core/images.py).
+        """
+        image = self._meta.get_field("image_url").to_python(self.image_url)
+        self.image_variants = build_image_variants(image)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "image_url" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "image_variants"}
+        super().save(*args, **kwargs)
+
     class Meta:
         """Metadata options for the Service model."""
         ordering = ["service_name"]  # Order services alphabetically
+        indexes = [
+            # Admin autocomplete search (core/search.py)
+            trigram_index("service_name", "service_name_trgm"),
+        ]
         verbose_name = "Service"
         verbose_name_plural = "Services"
 
@@ -155,6 +193,17 @@ class ClientList(models.Model):
         """Metadata options for the ClientList model."""
         # Order by client status first, then alphabetically by last name
         ordering = ['is_client', 'last_name']
+        indexes = [
+            # Serves the default ordering and the is_client filter
+            models.Index(
+                fields=["is_client", "last_name"],
+                name="client_status_name_idx",
+            ),
+            # Admin autocomplete search (core/search.py)
+            trigram_index("first_name", "clientlist_first_name_trgm"),
+            trigram_index("last_name", "clientlist_last_name_trgm"),
+            trigram_index("email", "clientlist_email_trgm"),
+        ]
         verbose_name = "Client"
         verbose_name_plural = "Clients"
 
@@ -185,7 +234,7 @@ class Booking(models.Model):
     and update timestamps.
 
     Security Features:
-        - Unique access token for secure booking access
+        - Unique access token for secure booking access, stored as a digest
         - Automatic token generation on creation
         - Audit trail with creation and update timestamps
 
@@ -197,7 +246,9 @@ class Booking(models.Model):
         is_confirmed (bool): Whether booking has been confirmed
         created_on (DateTime): When booking record was created
         updated_on (DateTime): When booking was last modified
-        access_token (str): Unique token for secure booking access
+        token_digest (str): SHA-256 digest of the access token
+        access_token (str): The access token itself; only known for bookings
+                            created or looked up by token in this request
 
     Relationships:
         - One-to-one with ClientList (each client can have one active booking)
@@ -243,32 +294,65 @@ class Booking(models.Model):
         help_text="Timestamp when booking was last modified"
     )
 
-    # Security token for booking access
-    access_token = models.CharField(
-        max_length=48,
+    # Security token for booking access, stored as a digest (see tokens.py)
+    token_digest = models.CharField(
+        max_length=64,
         unique=True,
-        help_text="Unique token for secure booking access and verification"
+        editable=False,
+        help_text="SHA-256 digest of the booking's access token"
     )
 
+    # The token itself is never stored; it is kept on the instance only
+    _access_token = ""
+
+    @property
+    def access_token(self):
+        """Access token of this booking, if known (else empty)."""
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, token):
+        self._access_token = token
+        self.token_digest = hash_access_token(token)
+
     def save(self, *args, **kwargs):
         """
         Override save method to auto-generate access token for new bookings.
 
         Generates a secure URL-safe token when creating a new booking record.
         This token is used for secure access to booking details without
-        requiring user authentication.
+        requiring user authentication. Only its digest is saved, so the
+        token must be shown to the guest straight away.
 
         The token is only generated once during creation to maintain
         consistency and security.
         """
         if not self.pk:  # Only generate token for new instances
-            self.access_token = secrets.token_urlsafe(24)
+            self.access_token = generate_access_token()
         super().save(*args, **kwargs)
 
     class Meta:
         """Metadata options for the Booking model."""
         # Order by most recent bookings first
         ordering = ["-booking_date", "-created_on"]
+        indexes = [
+            # Serves the default ordering and booking_date filtering
+            models.Index(
+                fields=["-booking_date", "-created_on"],
+                name="booking_date_created_idx",
+            ),
+            # Serves the is_confirmed filter in the default ordering
+            models.Index(
+                fields=["is_confirmed", "-booking_date", "-created_on"],
+                name="booking_confirmed_date_idx",
+            ),
+            # Small partial index for the unconfirmed (to-do) bookings
+            models.Index(
+                fields=["booking_date"],
+                condition=models.Q(is_confirmed=False),
+                name="booking_unconfirmed_idx",
+            ),
+        ]
         verbose_name = "Booking"
         verbose_name_plural = "Bookings"
 
@@ -319,8 +403,10 @@ class Contact(models.Model):
         max_length=1000,
         help_text="The message content (max 1000 characters)"
     )
+    # Set from the spooled submission time, so not auto_now_add
     created_on = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         help_text="Timestamp when the message was submitted"
     )
     is_read = models.BooleanField(
@@ -332,10 +418,23 @@ class Contact(models.Model):
         """
         Metadata for the Contact model.
         
-        Defines ordering (newest first) and display names for the
-        Django admin interface.
+        Defines ordering (newest first), the indexes backing the admin
+        changelist, and display names for the Django admin interface.
         """
         ordering = ["-created_on"]
+        indexes = [
+            # Serves the default ordering and created_on filtering
+            models.Index(
+                fields=["-created_on"],
+                name="contact_created_idx",
+            ),
+            # Small partial index for the unread inbox
+            models.Index(
+                fields=["-created_on"],
+                condition=models.Q(is_read=False),
+                name="contact_unread_idx",
+            ),
+        ]
         verbose_name = "Contact Message"
         verbose_name_plural = "Contact Messages"
 
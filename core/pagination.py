@@ -0,0 +1,279 @@
+# ============================================================================
+# PAGINATION MODULE - Pagination helpers that avoid COUNT(*) queries
+# ============================================================================
+# Django's Paginator counts every row in the queryset before it can slice a
+# page. That is wasted work for views that only need to know whether there
+# is a next page, such as the per-keystroke autocomplete endpoints. Public
+# listings use keyset pagination instead: an opaque cursor names the sort
+# key to continue after (or before), so no page depends on an offset. Admin
+# changelists keep page numbers but take the row count from the planner's
+# estimate on large PostgreSQL tables.
+
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+
+class WindowPage:
+    """
+    A single page of results that knows whether more rows follow.
+
+    Mirrors the parts of django.core.paginator.Page that list views and
+    templates use, without knowing the total number of rows.
+
+    Attributes:
+        number (int): 1-based page number
+        object_list (list): Rows on this page
+    """
+
+    def __init__(self, number, object_list, has_next):
+        self.number = number
+        self.object_list = object_list
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        """Return True if another page follows this one."""
+        return self._has_next
+
+    def has_previous(self):
+        """Return True if this is not the first page."""
+        return self.number > 1
+
+    def has_other_pages(self):
+        """Return True if there is a next or previous page."""
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        """Return the number of the following page."""
+        return self.number + 1
+
+    def previous_page_number(self):
+        """Return the number of the preceding page."""
+        return self.number - 1
+
+
+def paginate_without_count(queryset, page_number, per_page):
+    """
+    Slice one page out of a queryset without counting it.
+
+    Fetches one extra row to find out whether a next page exists, so the
+    database only ever reads per_page + 1 rows.
+
+    Args:
+        queryset (QuerySet): Ordered queryset to paginate
+        page_number (str | int | None): Requested page, defaults to 1
+        per_page (int): Number of rows per page
+
+    Returns:
+        WindowPage: The requested page
+    """
+    try:
+        number = max(int(page_number or 1), 1)
+    except (TypeError, ValueError):
+        number = 1
+
+    offset = (number - 1) * per_page
+    rows = list(queryset[offset:offset + per_page + 1])
+    return WindowPage(number, rows[:per_page], len(rows) > per_page)
+
+
+async def apaginate_without_count(queryset, page_number, per_page):
+    """Async version of paginate_without_count(), using the async ORM."""
+    try:
+        number = max(int(page_number or 1), 1)
+    except (TypeError, ValueError):
+        number = 1
+
+    offset = (number - 1) * per_page
+    rows = [row async for row in queryset[offset:offset + per_page + 1]]
+    return WindowPage(number, rows[:per_page], len(rows) > per_page)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(direction, key):
+    """
+    Build an opaque cursor.
+
+    Args:
+        direction (str): "after" or "before"
+        key: JSON-serialisable sort key of the boundary row
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = json.dumps([direction, key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor built by encode_cursor().
+
+    Args:
+        cursor (str): Cursor from a query string
+
+    Returns:
+        tuple: (direction, key)
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, key = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+    if direction not in ("after", "before"):
+        raise InvalidCursor("Invalid pagination cursor")
+    # JSON turns tuple keys into lists
+    if isinstance(key, list):
+        key = tuple(key)
+    return direction, key
+
+
+class KeysetPage:
+    """
+    A page of keyset-paginated results with cursors to its neighbours.
+
+    Attributes:
+        object_list (list): Rows on this page
+        next_cursor (str | None): Cursor of the following page
+        previous_cursor (str | None): Cursor of the preceding page
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        """Return True if another page follows this one."""
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """Return True if this is not the first page."""
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        """Return True if there is a next or previous page."""
+        return self.has_next() or self.has_previous()
+
+
+def paginate_keyset(items, cursor, per_page, key):
+    """
+    Return the page of a sorted sequence that a cursor points at.
+
+    The page boundary is found by binary search on the sort key, so every
+    page costs O(log n) however deep into the sequence it is, and rows
+    added or removed elsewhere never shift a page's contents.
+
+    Args:
+        items (Sequence): Rows sorted by key, with unique keys
+        cursor (str | None): Cursor from a previous page, or None for the
+                             first page
+        per_page (int): Number of rows per page
+        key (callable): Returns a row's JSON-serialisable sort key
+
+    Returns:
+        KeysetPage: The requested page
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    if cursor:
+        direction, boundary = decode_cursor(cursor)
+    else:
+        direction, boundary = "after", None
+
+    try:
+        if direction == "after":
+            start = 0 if boundary is None else bisect_right(
+                items, boundary, key=key
+            )
+            end = min(start + per_page, len(items))
+        else:
+            end = bisect_left(items, boundary, key=key)
+            start = max(end - per_page, 0)
+    except TypeError as e:
+        # Boundary of the wrong type for this sort key
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+    rows = list(items[start:end])
+    next_cursor = previous_cursor = None
+    if rows and end < len(items):
+        next_cursor = encode_cursor("after", key(rows[-1]))
+    if rows and start > 0:
+        previous_cursor = encode_cursor("before", key(rows[0]))
+    return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the query planner's row estimate on big results.
+
+    On PostgreSQL an exact COUNT(*) reads every matching row, which makes
+    admin changelists of large tables slow to open. This paginator asks
+    the planner for its estimate first (EXPLAIN, no rows read) and only
+    runs the exact count when the estimate is below ``threshold``, where
+    counting is cheap and page links should be exact. On other databases
+    it behaves like Django's Paginator.
+
+    Attributes:
+        threshold (int): Estimated row count above which the estimate is
+                         used instead of an exact count
+    """
+
+    threshold = 10_000
+
+    @cached_property
+    def count(self):
+        """Return the estimated or exact number of objects."""
+        estimate = self.estimated_count()
+        if estimate is not None and estimate >= self.threshold:
+            return estimate
+        return super().count
+
+    def estimated_count(self):
+        """
+        Return the planner's estimate of the result size, if available.
+
+        With psycopg 3, Django returns the JSON of the plan object itself;
+        with psycopg 2 it is a one-element list. Both are accepted.
+
+        Returns:
+            int | None: Estimated row count (None off PostgreSQL, or if the
+                        plan could not be read)
+        """
+        queryset = self.object_list
+        if not hasattr(queryset, "explain"):
+            return None
+        if connections[queryset.db].vendor != "postgresql":
+            return None
+        try:
+            plan = json.loads(queryset.order_by().explain(format="json"))
+            if isinstance(plan, list):
+                plan = plan[0]
+            return int(plan["Plan"]["Plan Rows"])
+        except (DatabaseError, LookupError, TypeError, ValueError):
+            # An exact count is slower but always right
+            return None
@@ -0,0 +1,332 @@
+# ============================================================================
+# RATELIMIT MODULE - Sliding-window limits for guest POST endpoints
+# ============================================================================
+# Access-key lookups, booking changes and contact messages each cost a
+# query or an insert, so a scripted flood would take worker and database
+# time from real visitors. The rate_limit decorator counts POSTs per client
+# IP and per access-token prefix (so guessing one token from many
+# addresses is limited too) and answers 429 with a Retry-After header once
+# a limit is exceeded. The check runs before the view, and therefore before
+# any query.
+#
+# Counts use sliding-window counters: a counter per fixed window, with the
+# previous window's count weighted by how much of it still overlaps the
+# sliding window. That approximates a true sliding log with two integers
+# per key. Counters live in the shared cache (all workers see the same
+# counts; Redis is required, see config/settings.py) or, with
+# LocalRateLimitBackend, in the process (no network round trip, but each
+# worker counts separately).
+
+import hashlib
+import math
+import threading
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.utils.module_loading import import_string
+
+# Shared cache key prefix of the window counters
+CACHE_PREFIX = "core:ratelimit:"
+
+_backends = {}
+
+
+class RateLimitBackend:
+    """
+    Base class for rate limit counter storage.
+
+    Subclasses implement hit(), which counts one request against a key and
+    returns the counts of the current and the previous window.
+    """
+
+    def hit(self, key, window, index):
+        """
+        Count one request.
+
+        Args:
+            key (str): What is being limited (scope, rule and client)
+            window (int): Window length in seconds
+            index (int): Number of the current window
+
+        Returns:
+            tuple: (current window count, previous window count)
+        """
+        raise NotImplementedError(
+            "Subclasses must implement the hit method"
+        )
+
+    async def ahit(self, key, window, index):
+        """Async version of hit()."""
+        return self.hit(key, window, index)
+
+
+class CacheRateLimitBackend(RateLimitBackend):
+    """
+    Counters in the shared cache, seen by every worker process.
+
+    Relies on add() and incr() being atomic, which holds for the Redis
+    cache but not the file-based one, so settings refuse that combination.
+    """
+
+    def _keys(self, key, index):
+        """Return the cache keys of the current and previous windows."""
+        prefix = f"{CACHE_PREFIX}{key}:"
+        return f"{prefix}{index}", f"{prefix}{index - 1}"
+
+    def hit(self, key, window, index):
+        current_key, previous_key = self._keys(key, index)
+        # Kept for two windows: current, then as the previous one
+        if cache.add(current_key, 1, window * 2):
+            current = 1
+        else:
+            try:
+                current = cache.incr(current_key)
+            except ValueError:
+                # Expired between add() and incr()
+                cache.set(current_key, 1, window * 2)
+                current = 1
+        return current, cache.get(previous_key, 0)
+
+    async def ahit(self, key, window, index):
+        current_key, previous_key = self._keys(key, index)
+        if await cache.aadd(current_key, 1, window * 2):
+            current = 1
+        else:
+            try:
+                current = await cache.aincr(current_key)
+            except ValueError:
+                await cache.aset(current_key, 1, window * 2)
+                current = 1
+        return current, await cache.aget(previous_key, 0)
+
+
+class LocalRateLimitBackend(RateLimitBackend):
+    """
+    Counters in this process only.
+
+    Each worker enforces the limits on its own, so the effective limit is
+    multiplied by the number of workers.
+
+    Attributes:
+        max_keys (int): Keys kept before stale ones are swept
+    """
+
+    max_keys = 10_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> [window index, current count, previous count]
+        self._counters = {}
+
+    def hit(self, key, window, index):
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                if len(self._counters) >= self.max_keys:
+                    self._sweep()
+                counter = self._counters[key] = [index, 0, 0]
+            elif counter[0] != index:
+                previous = counter[1] if counter[0] == index - 1 else 0
+                counter[:] = [index, 0, previous]
+            counter[1] += 1
+            return counter[1], counter[2]
+
+    def _sweep(self):
+        """Drop counters last used more than a window ago."""
+        now = time.time()
+        self._counters = {
+            key: counter for key, counter in self._counters.items()
+            if counter[0] >= now // _window_of(key) - 1
+        }
+
+
+def _window_of(key):
+    """Return the window length encoded in a counter key."""
+    return int(key.rsplit(":", 1)[1])
+
+
+def get_rate_limit_backend():
+    """
+    Return the configured rate limit backend.
+
+    RATELIMIT_BACKEND names the backend class by dotted path. The instance
+    is shared, so in-process counters survive between requests.
+
+    Returns:
+        RateLimitBackend: Backend instance
+    """
+    path = settings.RATELIMIT_BACKEND
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
+
+
+def client_ip(request):
+    """
+    Return the address of the client that made the request.
+
+    Behind RATELIMIT_PROXY_COUNT trusted proxies (Heroku's router is one),
+    the client is the address those proxies appended to X-Forwarded-For;
+    entries further left can be forged by the client.
+    """
+    proxies = settings.RATELIMIT_PROXY_COUNT
+    if proxies:
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        addresses = [a.strip() for a in forwarded.split(",") if a.strip()]
+        if len(addresses) >= proxies:
+            return addresses[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _identities(request, token_field):
+    """Yield (rule, identity) pairs the request is counted against."""
+    yield "ip", client_ip(request)
+    if token_field:
+        token = request.POST.get(token_field, "").strip()
+        if token:
+            yield "token", token[:settings.RATELIMIT_TOKEN_PREFIX_LENGTH]
+
+
+def _estimate(current, previous, elapsed):
+    """Requests in the sliding window ending now."""
+    return previous * (1 - elapsed) + current
+
+
+def _retry_after(limit, window, current, previous, elapsed):
+    """
+    Seconds until one more request fits in the sliding window.
+
+    Args:
+        limit (int): Requests allowed per window
+        window (int): Window length in seconds
+        current (int): Requests counted in the current window
+        previous (int): Requests counted in the previous window
+        elapsed (float): Fraction of the current window already past
+
+    Returns:
+        int: Whole seconds, at least 1
+    """
+    room = limit - 1
+    if current <= room and previous:
+        # Frees up while the previous window slides out
+        wait = window * (1 - elapsed - (room - current) / previous)
+    else:
+        # Only once the current window has become the previous one
+        wait = window * (1 - elapsed)
+        if current > room:
+            wait += window * (1 - room / current)
+    # Rounded first so float noise does not add a whole second
+    return max(1, math.ceil(round(wait, 6)))
+
+
+def _pending_hits(request, scope, token_field):
+    """Yield (key, limit, window, index) for every rule of the scope."""
+    now = time.time()
+    identities = dict(_identities(request, token_field))
+    for rule, (limit, window) in settings.RATELIMITS.get(scope, {}).items():
+        identity = identities.get(rule)
+        if identity is None:
+            continue
+        # Hashed, as tokens are visitor input and unsafe in cache keys
+        digest = hashlib.sha256(identity.encode()).hexdigest()[:24]
+        key = f"{scope}:{rule}:{digest}:{window}"
+        yield key, limit, window, int(now // window)
+
+
+def _retry_delay(counts):
+    """
+    Return the Retry-After delay if the request is over any limit.
+
+    Args:
+        counts (list): (limit, window, index, current, previous) per rule
+
+    Returns:
+        int | None: Seconds to wait, or None if every limit allows it
+    """
+    now = time.time()
+    retry_after = None
+    for limit, window, index, current, previous in counts:
+        # Clamped in case the window rolled over since the hit was counted
+        elapsed = min(now / window - index, 1.0)
+        if _estimate(current, previous, elapsed) > limit:
+            wait = _retry_after(limit, window, current, previous, elapsed)
+            retry_after = max(retry_after or 0, wait)
+    return retry_after
+
+
+def _limited_response(json, retry_after):
+    """Build the 429 response, without touching the database."""
+    message = (
+        f"Too many attempts. Please try again in {retry_after} seconds."
+    )
+    if json:
+        response = JsonResponse(
+            {"success": False, "message": message}, status=429
+        )
+    else:
+        response = HttpResponse(message, status=429, content_type="text/plain")
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+def rate_limit(scope, token_field=None, json=False):
+    """
+    Limit how often a client may POST to a view.
+
+    The limits of each scope are set in the RATELIMITS setting, as
+    {"ip": (requests, seconds), "token": (requests, seconds)}. Other
+    methods pass through uncounted. Works on sync and async views.
+
+    Args:
+        scope (str): Key of the view's limits in RATELIMITS
+        token_field (str, optional): POST field holding an access token,
+                                     whose prefix is limited by the "token"
+                                     rule
+        json (bool): Answer limited requests with JSON, for views called
+                     from JavaScript
+
+    Returns:
+        function: Decorator applying the limit
+    """
+    def is_exempt(request):
+        return request.method != "POST" or not settings.RATELIMIT_ENABLED
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if not is_exempt(request):
+                    backend = get_rate_limit_backend()
+                    counts = [
+                        (limit, window, index,
+                         *await backend.ahit(key, window, index))
+                        for key, limit, window, index in _pending_hits(
+                            request, scope, token_field
+                        )
+                    ]
+                    retry_after = _retry_delay(counts)
+                    if retry_after is not None:
+                        return _limited_response(json, retry_after)
+                return await view_func(request, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not is_exempt(request):
+                backend = get_rate_limit_backend()
+                counts = [
+                    (limit, window, index, *backend.hit(key, window, index))
+                    for key, limit, window, index in _pending_hits(
+                        request, scope, token_field
+                    )
+                ]
+                retry_after = _retry_delay(counts)
+                if retry_after is not None:
+                    return _limited_response(json, retry_after)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,361 @@
+# ============================================================================
+# RESOLVERS MODULE - Shared lookups of a visitor's booking
+# ============================================================================
+# Every booking view needs the same three things: the client, their booking
+# and the services on it. This module fetches the booking and its client in
+# one joined query, prefetches the services with a second, and memoises the
+# result on the request so that a view, its template and any helper share a
+# single lookup. The a-prefixed functions are the async versions used by
+# core/async_views.py.
+#
+# Guest lookups go through the digest of the access token, served by its
+# unique index. The shared cache then maps the digest to the booking's id
+# for BOOKING_TOKEN_CACHE_TIMEOUT seconds, so a guest reopening their emailed
+# link is found by primary key. Only the id is cached, never the booking or
+# its client, so no personal details reach the cache and edits are never
+# served stale. Cancelling or rescheduling a booking drops its entry
+# (core/signals.py, and the admin's bulk reschedule).
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, Prefetch, Q, Value, When
+
+from .models import Booking, Service
+from .tokens import hash_access_token, read_view_grant
+
+# Service columns the booking templates need
+SERVICE_FIELDS = ("id", "service_name", "slug")
+
+# Attributes used to memoise the resolved bookings on the request
+REQUEST_CACHE_ATTR = "_resolved_booking"
+REQUEST_OWNED_CACHE_ATTR = "_resolved_owned_booking"
+
+# Shared cache key prefix mapping token digests to booking ids
+TOKEN_CACHE_PREFIX = "core:booking-token:"
+
+
+class ResolvedBooking:
+    """
+    Result of a booking lookup.
+
+    Evaluates as False when no booking was found, so views can write
+    ``if resolved:`` before touching the booking.
+
+    Attributes:
+        booking (Booking | None): The booking, with client and services
+                                  already loaded
+        client (ClientList | None): The client who made the booking
+        linked_by_email (bool): True if the booking was matched through the
+                                user's email rather than the user link
+    """
+
+    def __init__(self, booking=None, linked_by_email=False):
+        self.booking = booking
+        self.client = booking.client if booking is not None else None
+        self.linked_by_email = linked_by_email
+
+    def __bool__(self):
+        return self.booking is not None
+
+
+def _booking_queryset(condition, rank=None):
+    """
+    Build the query behind a booking lookup.
+
+    The booking comes with its client joined in, and its services
+    prefetched in catalog order.
+
+    Args:
+        condition (Q): Filter selecting candidate bookings
+        rank (Expression, optional): Lower values are preferred when more
+                                     than one booking matches
+
+    Returns:
+        QuerySet: Matching bookings, the best first
+    """
+    services = Service.objects.only(*SERVICE_FIELDS).order_by("service_name")
+    return (
+        Booking.objects.filter(condition)
+        .select_related("client")
+        .prefetch_related(Prefetch("services", queryset=services))
+        .annotate(match_rank=rank or Value(0))
+        .order_by("match_rank", "pk")
+    )
+
+
+def _fetch_booking(condition, rank=None):
+    """
+    Fetch the best booking matching a condition.
+
+    Args:
+        condition (Q): Filter selecting candidate bookings
+        rank (Expression, optional): Lower values are preferred when more
+                                     than one booking matches
+
+    Returns:
+        Booking | None: The booking with client and services loaded
+    """
+    return _booking_queryset(condition, rank).first()
+
+
+async def _afetch_booking(condition, rank=None):
+    """Async version of _fetch_booking(), using the async ORM."""
+    return await _booking_queryset(condition, rank).afirst()
+
+
+def _user_booking_filter(user):
+    """Return the (condition, rank) pair matching a user's bookings."""
+    condition = Q(client__user=user)
+    if user.email:
+        condition |= Q(client__email=user.email)
+
+    rank = Case(
+        When(client__user=user, then=Value(0)),
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+    return condition, rank
+
+
+def _resolved_for_user(user, booking):
+    """Wrap a user's booking, noting whether it was matched by email."""
+    if booking is None:
+        return ResolvedBooking()
+    return ResolvedBooking(
+        booking, linked_by_email=booking.client.user_id != user.pk
+    )
+
+
+def resolve_user_booking(user):
+    """
+    Find the booking belonging to an authenticated user.
+
+    Bookings linked to the user account win over bookings whose client
+    only shares the user's email address.
+
+    Args:
+        user (User): The authenticated user
+
+    Returns:
+        ResolvedBooking: The lookup result (falsy if no booking exists)
+    """
+    return _resolved_for_user(
+        user, _fetch_booking(*_user_booking_filter(user))
+    )
+
+
+async def aresolve_user_booking(user):
+    """Async version of resolve_user_booking()."""
+    return _resolved_for_user(
+        user, await _afetch_booking(*_user_booking_filter(user))
+    )
+
+
+def resolve_owned_booking(user):
+    """
+    Find the booking linked to a user's account.
+
+    Unlike resolve_user_booking(), a booking whose client only shares the
+    user's email address is not matched, so changes are only made to
+    bookings the account owns.
+
+    Args:
+        user (User): The authenticated user
+
+    Returns:
+        ResolvedBooking: The lookup result (falsy if no booking is linked)
+    """
+    return _resolved_for_user(user, _fetch_booking(Q(client__user=user)))
+
+
+async def aresolve_owned_booking(user):
+    """Async version of resolve_owned_booking()."""
+    return _resolved_for_user(
+        user, await _afetch_booking(Q(client__user=user))
+    )
+
+
+def token_cache_key(digest):
+    """Return the shared cache key of the booking id for a token digest."""
+    return f"{TOKEN_CACHE_PREFIX}{digest}"
+
+
+def forget_token_bookings(digests):
+    """
+    Drop cached token lookups, so the bookings are found by digest again.
+
+    Args:
+        digests (Iterable[str]): Token digests of the changed bookings
+    """
+    cache.delete_many([token_cache_key(digest) for digest in digests])
+
+
+def _token_condition(digest, booking_pk):
+    """
+    Return the filter finding the booking with a token digest.
+
+    The cached id, when there is one, lets the database use the primary
+    key; the digest is still matched so the row is always the token's.
+    """
+    condition = Q(token_digest=digest)
+    if booking_pk is not None:
+        condition &= Q(pk=booking_pk)
+    return condition
+
+
+def _resolved_for_token(booking, access_token):
+    """Wrap a guest's booking, remembering the token it was found by."""
+    if booking is None:
+        return ResolvedBooking()
+    # Only the digest is stored; templates need the token itself
+    booking.access_token = access_token
+    return ResolvedBooking(booking)
+
+
+def get_booking_by_token(access_token):
+    """
+    Find a booking by its guest access token.
+
+    The booking's id is cached under the token digest for
+    BOOKING_TOKEN_CACHE_TIMEOUT seconds, so repeat lookups read it by
+    primary key. Unknown tokens are not cached.
+
+    Args:
+        access_token (str): Access token supplied by the guest
+
+    Returns:
+        ResolvedBooking: The lookup result (falsy if the token is unknown)
+    """
+    if not access_token:
+        return ResolvedBooking()
+    digest = hash_access_token(access_token)
+    key = token_cache_key(digest)
+
+    booking_pk = cache.get(key)
+    booking = _fetch_booking(_token_condition(digest, booking_pk))
+    if booking is None:
+        if booking_pk is not None:
+            cache.delete(key)
+    elif booking_pk is None:
+        cache.set(key, booking.pk, settings.BOOKING_TOKEN_CACHE_TIMEOUT)
+    return _resolved_for_token(booking, access_token)
+
+
+async def aget_booking_by_token(access_token):
+    """Async version of get_booking_by_token()."""
+    if not access_token:
+        return ResolvedBooking()
+    digest = hash_access_token(access_token)
+    key = token_cache_key(digest)
+
+    booking_pk = await cache.aget(key)
+    booking = await _afetch_booking(_token_condition(digest, booking_pk))
+    if booking is None:
+        if booking_pk is not None:
+            await cache.adelete(key)
+    elif booking_pk is None:
+        await cache.aset(key, booking.pk, settings.BOOKING_TOKEN_CACHE_TIMEOUT)
+    return _resolved_for_token(booking, access_token)
+
+
+def get_booking_by_grant(grant):
+    """
+    Find the booking a view grant was issued for.
+
+    The booking's token is not known, so booking.access_token stays empty.
+
+    Args:
+        grant (str): Grant from core.tokens.make_view_grant()
+
+    Returns:
+        ResolvedBooking: The lookup result (falsy if the grant is invalid)
+    """
+    booking_pk = read_view_grant(grant)
+    if booking_pk is None:
+        return ResolvedBooking()
+    return ResolvedBooking(_fetch_booking(Q(pk=booking_pk)))
+
+
+async def aget_booking_by_grant(grant):
+    """Async version of get_booking_by_grant()."""
+    booking_pk = read_view_grant(grant)
+    if booking_pk is None:
+        return ResolvedBooking()
+    return ResolvedBooking(await _afetch_booking(Q(pk=booking_pk)))
+
+
+def get_request_booking(request):
+    """
+    Return the current user's booking, resolved at most once per request.
+
+    Anonymous visitors always get an empty result; guests identify their
+    booking with an access token instead (see get_booking_by_token).
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        ResolvedBooking: The lookup result (falsy if no booking exists)
+    """
+    resolved = getattr(request, REQUEST_CACHE_ATTR, None)
+    if resolved is None:
+        if request.user.is_authenticated:
+            resolved = resolve_user_booking(request.user)
+        else:
+            resolved = ResolvedBooking()
+        setattr(request, REQUEST_CACHE_ATTR, resolved)
+    return resolved
+
+
+async def aget_request_booking(request):
+    """
+    Async version of get_request_booking(), sharing its per-request memo.
+
+    Loads the user with request.auser(), so it is safe to call from async
+    views.
+    """
+    resolved = getattr(request, REQUEST_CACHE_ATTR, None)
+    if resolved is None:
+        user = await request.auser()
+        if user.is_authenticated:
+            resolved = await aresolve_user_booking(user)
+        else:
+            resolved = ResolvedBooking()
+        setattr(request, REQUEST_CACHE_ATTR, resolved)
+    return resolved
+
+
+def get_request_owned_booking(request):
+    """
+    Return the booking linked to the current user, resolved once per request.
+
+    Used by the views that change or cancel a booking (see
+    resolve_owned_booking()). Anonymous visitors get an empty result.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        ResolvedBooking: The lookup result (falsy if no booking is linked)
+    """
+    resolved = getattr(request, REQUEST_OWNED_CACHE_ATTR, None)
+    if resolved is None:
+        if request.user.is_authenticated:
+            resolved = resolve_owned_booking(request.user)
+        else:
+            resolved = ResolvedBooking()
+        setattr(request, REQUEST_OWNED_CACHE_ATTR, resolved)
+    return resolved
+
+
+async def aget_request_owned_booking(request):
+    """Async version of get_request_owned_booking()."""
+    resolved = getattr(request, REQUEST_OWNED_CACHE_ATTR, None)
+    if resolved is None:
+        user = await request.auser()
+        if user.is_authenticated:
+            resolved = await aresolve_owned_booking(user)
+        else:
+            resolved = ResolvedBooking()
+        setattr(request, REQUEST_OWNED_CACHE_ATTR, resolved)
+    return resolved
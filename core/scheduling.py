@@ -0,0 +1,238 @@
+# ============================================================================
+# SCHEDULING MODULE - Slot capacity for booking dates and time windows
+# ============================================================================
+# Bookings store their availability window as "HHMM" strings. This module
+# converts them to integer minutes and counts, for a booking date, how many
+# bookings overlap a window, so book_service and edit_booking can enforce
+# BOOKING_SLOT_CAPACITY.
+#
+# The count is made in SQL when a booking is written: reserve_capacity()
+# takes a per-day lock inside the transaction and counts the overlapping
+# bookings of that day (served by the booking_date index), so two workers
+# cannot both take the last place in a slot. Nothing is kept per process,
+# so a booking made by one worker never makes another rebuild state on
+# the write path.
+
+from bisect import bisect_left, bisect_right, insort
+
+from django.conf import settings
+from django.db import transaction
+from django.db.transaction import TransactionManagementError
+
+from .models import Booking
+
+# First key of the PostgreSQL advisory locks taken per booking date (the
+# second is the date's ordinal), set apart from other advisory lock users
+ADVISORY_LOCK_NAMESPACE = 51_701
+
+
+class SlotUnavailable(ValueError):
+    """Raised when a booking window would exceed the slot capacity."""
+
+
+def to_minutes(value):
+    """
+    Convert an "HHMM" time string to minutes after midnight.
+
+    Args:
+        value (str): Time in the 4-digit format stored on Booking
+
+    Returns:
+        int: Minutes after midnight (0-1439)
+
+    Raises:
+        ValueError: If the value is not a valid "HHMM" time
+    """
+    value = str(value)
+    if len(value) != 4 or not value.isdigit():
+        raise ValueError(f"Invalid time {value!r}, expected HHMM")
+    hours, minutes = int(value[:2]), int(value[2:])
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"Invalid time {value!r}, expected HHMM")
+    return hours * 60 + minutes
+
+
+def to_window(earliest, latest):
+    """
+    Convert a booking's earliest and latest times to a minute window.
+
+    Args:
+        earliest (str): Earliest time as "HHMM"
+        latest (str): Latest time as "HHMM"
+
+    Returns:
+        tuple: (start, end) minutes, with start < end
+
+    Raises:
+        ValueError: If either time is invalid or latest is not after earliest
+    """
+    start, end = to_minutes(earliest), to_minutes(latest)
+    if end <= start:
+        raise ValueError("Latest time must be after earliest time")
+    return start, end
+
+
+class DaySchedule:
+    """
+    Booking windows on one day, sorted for overlap counting.
+
+    Windows are half-open [start, end), so a booking ending at 12:00 does
+    not overlap one starting at 12:00. A window overlaps [start, end) when
+    it starts before end and ends after start, so the overlap count is the
+    number of starts before end minus the number of ends at or before
+    start (those windows started before end too, but finished in time).
+
+    Attributes:
+        starts (list): Sorted window start minutes
+        ends (list): Sorted window end minutes
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start, end):
+        """Add a window to the day."""
+        insort(self.starts, start)
+        insort(self.ends, end)
+
+    def remove(self, start, end):
+        """Remove a window previously added with the same bounds."""
+        del self.starts[bisect_left(self.starts, start)]
+        del self.ends[bisect_left(self.ends, end)]
+
+    def overlapping(self, start, end):
+        """
+        Count the windows overlapping [start, end).
+
+        Args:
+            start (int): Window start in minutes
+            end (int): Window end in minutes
+
+        Returns:
+            int: Number of windows on this day overlapping the window
+        """
+        return bisect_left(self.starts, end) - bisect_right(self.ends, start)
+
+
+def _full_message(booking_date, start, end):
+    """Return the error shown when a window is fully booked."""
+    return (
+        f"{booking_date.strftime('%B %d, %Y')} is fully booked between "
+        f"{start // 60:02d}:{start % 60:02d} and "
+        f"{end // 60:02d}:{end % 60:02d}. "
+        f"Please choose another date or time."
+    )
+
+
+def _lock_day(booking_date):
+    """
+    Lock a booking date until the current transaction ends.
+
+    Uses a transaction-level advisory lock on PostgreSQL. SQLite, used in
+    local development, allows one writer at a time and takes no lock here.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        raise TransactionManagementError(
+            "reserve_capacity() must be called inside transaction.atomic()."
+        )
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                [ADVISORY_LOCK_NAMESPACE, booking_date.toordinal()],
+            )
+
+
+def reserve_capacity(booking_date, earliest, latest, exclude=None):
+    """
+    Check a window against the database while holding the day's lock.
+
+    Call inside transaction.atomic() and write the booking in the same
+    block: the lock is held until the transaction ends, so a concurrent
+    request for the same day waits and then counts this booking too.
+
+    Args:
+        booking_date (date): Requested booking date
+        earliest (str): Earliest time as "HHMM"
+        latest (str): Latest time as "HHMM"
+        exclude (int, optional): Pk of the booking being edited
+
+    Raises:
+        ValueError: If the times are invalid
+        SlotUnavailable: If BOOKING_SLOT_CAPACITY bookings already overlap
+                         the window
+        TransactionManagementError: If called outside a transaction
+    """
+    start, end = to_window(earliest, latest)
+    _lock_day(booking_date)
+
+    # "HHMM" strings compare in time order, so the overlap test is
+    # DaySchedule's: starts before this window ends and ends after it starts
+    overlapping = Booking.objects.filter(
+        booking_date=booking_date,
+        booking_earliest__lt=f"{end // 60:02d}{end % 60:02d}",
+        booking_latest__gt=f"{start // 60:02d}{start % 60:02d}",
+    )
+    if exclude is not None:
+        overlapping = overlapping.exclude(pk=exclude)
+    if overlapping.count() >= settings.BOOKING_SLOT_CAPACITY:
+        raise SlotUnavailable(_full_message(booking_date, start, end))
+
+
+def reserve_day(booking_date, bookings):
+    """
+    Check that bookings moved onto a date fit alongside those already on it.
+
+    Used by bulk reschedules: the moved bookings are counted against the
+    bookings staying on the date and against each other. Like
+    reserve_capacity(), call inside transaction.atomic() and write the
+    bookings in the same block. Their windows are read once the day is
+    locked, with the rows locked too, so a booking edited meanwhile is
+    counted as it will be moved.
+
+    Args:
+        booking_date (date): Date the bookings move to
+        bookings (QuerySet): The bookings being moved
+
+    Raises:
+        SlotUnavailable: If a moved booking would exceed
+                         BOOKING_SLOT_CAPACITY
+        TransactionManagementError: If called outside a transaction
+    """
+    _lock_day(booking_date)
+    capacity = settings.BOOKING_SLOT_CAPACITY
+    # Selected by pk, as FOR UPDATE refuses the DISTINCT or joins an admin
+    # changelist queryset may carry
+    windows = list(
+        Booking.objects.select_for_update()
+        .filter(pk__in=bookings.values("pk"))
+        .values_list("pk", "booking_earliest", "booking_latest")
+    )
+    moved = {pk for pk, _, _ in windows}
+    day = DaySchedule()
+
+    staying = Booking.objects.filter(booking_date=booking_date).values_list(
+        "pk", "booking_earliest", "booking_latest"
+    )
+    for pk, earliest, latest in staying:
+        if pk in moved:
+            continue
+        try:
+            day.add(*to_window(earliest, latest))
+        except ValueError:
+            continue
+
+    for pk, earliest, latest in windows:
+        try:
+            start, end = to_window(earliest, latest)
+        except ValueError:
+            # Legacy rows with unparseable windows cannot be scheduled
+            continue
+        if day.overlapping(start, end) >= capacity:
+            raise SlotUnavailable(_full_message(booking_date, start, end))
+        day.add(start, end)
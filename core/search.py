@@ -0,0 +1,170 @@
+# ============================================================================
+# SEARCH MODULE - Pluggable search backends for the admin autocomplete views
+# ============================================================================
+# The autocomplete views run one search per keystroke, so the search has to
+# stay fast as auth_user and core_clientlist grow. Each backend filters a
+# queryset for a search term and ranks the results so that prefix matches
+# come first. The trigram backend relies on the pg_trgm GIN indexes (see
+# core/indexes.py and migration 0006); the contains backend works on any
+# database and is used as the fallback on SQLite.
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+
+# Annotation used to order results by match quality
+RANK_ANNOTATION = "search_rank"
+
+# Match quality buckets, best first
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_CONTAINS = 2
+
+
+class SearchBackend:
+    """
+    Base class for autocomplete search backends.
+
+    Subclasses implement filter() to narrow a queryset down to the rows
+    matching a term. search() applies the filter and orders the results
+    with exact matches first, then prefix matches, then everything else.
+    """
+
+    def filter(self, queryset, fields, term):
+        """
+        Narrow a queryset down to rows matching the search term.
+
+        Args:
+            queryset (QuerySet): Queryset to filter
+            fields (list): Model field names to search
+            term (str): Search term typed by the user
+
+        Returns:
+            QuerySet: Filtered queryset
+        """
+        raise NotImplementedError(
+            "Subclasses must implement the filter method"
+        )
+
+    def rank(self, fields, term):
+        """
+        Build an expression scoring how well a row matches the term.
+
+        Args:
+            fields (list): Model field names to search
+            term (str): Search term typed by the user
+
+        Returns:
+            Case: Expression evaluating to one of the RANK_* buckets
+        """
+        exact = Q()
+        prefix = Q()
+        for field in fields:
+            exact |= Q(**{f"{field}__iexact": term})
+            prefix |= Q(**{f"{field}__istartswith": term})
+        return Case(
+            When(exact, then=Value(RANK_EXACT)),
+            When(prefix, then=Value(RANK_PREFIX)),
+            default=Value(RANK_CONTAINS),
+            output_field=IntegerField(),
+        )
+
+    def ordering(self, queryset, fields, term):
+        """
+        Return the order_by() arguments used after ranking.
+
+        Falls back to the model's default ordering, then the primary key,
+        so that paginated results stay stable between keystrokes.
+        """
+        return [RANK_ANNOTATION, *queryset.model._meta.ordering, "pk"]
+
+    def search(self, queryset, fields, term):
+        """
+        Filter and rank a queryset for the search term.
+
+        Args:
+            queryset (QuerySet): Queryset to search
+            fields (list): Model field names to search
+            term (str): Search term typed by the user
+
+        Returns:
+            QuerySet: Matching rows, best matches first
+        """
+        term = (term or "").strip()
+        if not term or not fields:
+            return queryset
+
+        queryset = self.filter(queryset, fields, term)
+        queryset = queryset.annotate(
+            **{RANK_ANNOTATION: self.rank(fields, term)}
+        )
+        return queryset.order_by(*self.ordering(queryset, fields, term))
+
+
+class ContainsSearchBackend(SearchBackend):
+    """
+    Portable backend matching the term anywhere in any search field.
+
+    Uses case-insensitive containment, exactly like the original
+    autocomplete search, and works on every database Django supports.
+    """
+
+    def filter(self, queryset, fields, term):
+        """Keep rows where any field contains the term."""
+        query = Q()
+        for field in fields:
+            query |= Q(**{f"{field}__icontains": term})
+        return queryset.filter(query)
+
+
+class TrigramSearchBackend(ContainsSearchBackend):
+    """
+    PostgreSQL backend served by pg_trgm GIN indexes.
+
+    The containment filter compiles to UPPER(column::text) LIKE ..., which
+    the trigram expression indexes (core/indexes.py) can answer without a
+    sequential scan. Terms of one or two characters yield no full trigram,
+    so PostgreSQL scans for them; they still match anywhere in a field, as
+    they always have. Within each rank bucket results are ordered by
+    trigram similarity.
+    """
+
+    def ordering(self, queryset, fields, term):
+        """Order by rank bucket, then by best trigram similarity."""
+        from django.contrib.postgres.search import TrigramSimilarity
+        from django.db.models.functions import Greatest
+
+        similarities = [TrigramSimilarity(field, term) for field in fields]
+        similarity = (
+            Greatest(*similarities) if len(similarities) > 1
+            else similarities[0]
+        )
+        return [
+            RANK_ANNOTATION,
+            similarity.desc(),
+            *queryset.model._meta.ordering,
+            "pk",
+        ]
+
+
+def get_search_backend(using="default"):
+    """
+    Return the search backend configured for a database.
+
+    The AUTOCOMPLETE_SEARCH_BACKEND setting may name a backend class by
+    dotted path. Otherwise the trigram backend is used on PostgreSQL and
+    the contains backend everywhere else.
+
+    Args:
+        using (str): Database alias the search will run against
+
+    Returns:
+        SearchBackend: Backend instance
+    """
+    backend_path = getattr(settings, "AUTOCOMPLETE_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connections[using].vendor == "postgresql":
+        return TrigramSearchBackend()
+    return ContainsSearchBackend()
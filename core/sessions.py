@@ -0,0 +1,30 @@
+# ============================================================================
+# SESSIONS MODULE - Database sessions that are never saved for anonymous use
+# ============================================================================
+# Selected with ANONYMOUS_SESSIONS = False (see config/settings.py). The
+# session behaves as usual while a request is handled, but SessionMiddleware
+# only saves sessions that belong to a logged-in user, so anonymous traffic
+# never writes to (or grows) the session table. Logging in still creates the
+# session row as normal.
+
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends import db
+
+
+class SessionStore(db.SessionStore):
+    """Database session store that treats anonymous sessions as empty."""
+
+    def is_empty(self):
+        """
+        Report anonymous sessions with unsaved changes as empty.
+
+        SessionMiddleware skips saving empty sessions and removes their
+        cookie. Unmodified sessions are not inspected, so checking never
+        loads a session the request did not use.
+
+        Returns:
+            bool: True if the middleware should not save the session
+        """
+        if super().is_empty():
+            return True
+        return self.modified and SESSION_KEY not in self._session
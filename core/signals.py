@@ -0,0 +1,43 @@
+# ============================================================================
+# SIGNALS MODULE - Model signal handlers for the core app
+# ============================================================================
+# Signal handlers keep derived state (such as the cached service catalog)
+# in step with the database, whichever code path changed it: the admin,
+# the autocomplete create option or the ORM directly.
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import catalog, resolvers
+from .models import Booking, Service
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_catalog(sender, **kwargs):
+    """
+    Bump the catalog version when a Service is saved or deleted.
+
+    The version is bumped straight away and again once the surrounding
+    transaction commits, so a request that rebuilt the catalog from
+    uncommitted data cannot keep serving it.
+    """
+    catalog.bump_catalog_version()
+    transaction.on_commit(catalog.bump_catalog_version)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def forget_booking_token(sender, instance, created=False, **kwargs):
+    """
+    Drop the cached token lookup of a rescheduled or cancelled booking.
+
+    Dropped straight away and again once the transaction commits, so a
+    lookup made before the commit cannot cache an id that is rolled back.
+    """
+    if created or not instance.token_digest:
+        return
+    digests = [instance.token_digest]
+    resolvers.forget_token_bookings(digests)
+    transaction.on_commit(lambda: resolvers.forget_token_bookings(digests))
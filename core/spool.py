@@ -0,0 +1,200 @@
+# ============================================================================
+# SPOOL MODULE - Write-behind queue for contact form submissions
+# ============================================================================
+# A burst of contact form posts (after a newsletter, say) would otherwise
+# become a burst of single-row inserts competing with booking writes. Instead,
+# contact_view validates the form and pushes the submission onto a Redis
+# list, then answers straight away. The flush_contacts command, run on the
+# worker dyno, drains the list into the database with bulk_create in batches.
+# Redis is reachable from every dyno, unlike a dyno's local disk.
+#
+# Each entry carries the time it was submitted, which becomes the message's
+# created_on. The flusher reads a batch from the head of the list, inserts
+# it and only then trims it off, so a crash between the two can at worst
+# insert a message twice, never lose one. Producers only append to the
+# tail, and a lock in Redis keeps flushers from draining the list at once.
+#
+# Without CONTACT_SPOOL_URL (local development without Redis), submissions
+# are inserted straight away and no worker is needed. The same happens when
+# Redis cannot be reached or does not answer within REDIS_TIMEOUT, so an
+# outage costs a slower request rather than a lost message or a hung one.
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from django.conf import settings
+from django.db import transaction
+
+from .models import Contact
+
+logger = logging.getLogger(__name__)
+
+# Fields stored for each submission
+CONTACT_FIELDS = ("name", "email", "message")
+
+# Seconds the spool waits to connect to Redis or for a reply. A failed call
+# is not retried, so a request waits at most this long before inserting
+REDIS_TIMEOUT = 0.5
+
+# Seconds the flush lock is held at most, should a flusher die holding it
+FLUSH_LOCK_TIMEOUT = 5 * 60
+
+# Seconds one flush keeps starting new batches, well within the lock's
+# timeout so no second flusher can take over entries still being inserted
+FLUSH_TIME_BUDGET = 60
+
+
+@lru_cache
+def _client(url):
+    """Return a Redis client for a URL, shared by the process."""
+    return redis.Redis.from_url(
+        url,
+        socket_timeout=REDIS_TIMEOUT,
+        socket_connect_timeout=REDIS_TIMEOUT,
+        retry=Retry(NoBackoff(), 0),
+    )
+
+
+def spool_client():
+    """
+    Return the Redis client of the spool.
+
+    Returns:
+        redis.Redis | None: Client, or None when no spool is configured and
+                            submissions are inserted directly
+    """
+    url = settings.CONTACT_SPOOL_URL
+    return _client(url) if url else None
+
+
+def failed_key():
+    """Return the key of the list holding unreadable entries."""
+    return f"{settings.CONTACT_SPOOL_KEY}:failed"
+
+
+def contact_from_entry(data):
+    """
+    Build an unsaved Contact from a spool entry.
+
+    Args:
+        data (dict): Submission fields plus submitted_ns, the submission
+                     time in nanoseconds since the epoch
+
+    Returns:
+        Contact: The message, created_on set to when it was submitted
+    """
+    submitted_ns = data.get("submitted_ns", time.time_ns())
+    return Contact(
+        **{field: data[field] for field in CONTACT_FIELDS},
+        created_on=datetime.fromtimestamp(submitted_ns / 1e9, tz=timezone.utc),
+    )
+
+
+def spool_contact(cleaned_data):
+    """
+    Queue a validated contact submission.
+
+    Args:
+        cleaned_data (dict): ContactForm.cleaned_data
+
+    Returns:
+        bool: True if queued, False if inserted directly (no spool, or the
+              spool could not be reached)
+    """
+    data = {field: cleaned_data[field] for field in CONTACT_FIELDS}
+    data["submitted_ns"] = time.time_ns()
+
+    client = spool_client()
+    if client is not None:
+        try:
+            client.rpush(settings.CONTACT_SPOOL_KEY, json.dumps(data))
+            return True
+        except redis.RedisError:
+            # Includes redis.ConnectionError and redis.TimeoutError
+            logger.exception("Contact spool unavailable; inserting directly")
+    contact_from_entry(data).save()
+    return False
+
+
+def pending_count():
+    """Return the number of queued submissions."""
+    client = spool_client()
+    if client is None:
+        return 0
+    return client.llen(settings.CONTACT_SPOOL_KEY)
+
+
+def oldest_age():
+    """
+    Return how long the oldest queued submission has been waiting.
+
+    Returns:
+        float: Age in seconds (0 when nothing is queued)
+    """
+    client = spool_client()
+    head = client.lindex(settings.CONTACT_SPOOL_KEY, 0) if client else None
+    if head is None:
+        return 0.0
+    try:
+        submitted_ns = json.loads(head)["submitted_ns"]
+    except (ValueError, KeyError, TypeError):
+        # Unreadable; the next flush moves it aside
+        return float("inf")
+    return max(0.0, (time.time_ns() - submitted_ns) / 1e9)
+
+
+def flush_contacts(batch_size=None):
+    """
+    Insert every queued submission into the database.
+
+    Entries are inserted in arrival order with one bulk_create per batch.
+    Unreadable entries are moved to the failed list (see failed_key()) so
+    they cannot block the queue, in the same Redis transaction that trims
+    the batch off. A run stops starting batches after FLUSH_TIME_BUDGET
+    seconds; the next run carries on.
+
+    Args:
+        batch_size (int, optional): Rows per bulk_create, defaults to
+                                    CONTACT_SPOOL_BATCH_SIZE
+
+    Returns:
+        int: Number of contact messages inserted
+    """
+    client = spool_client()
+    if client is None:
+        return 0
+    batch_size = batch_size or settings.CONTACT_SPOOL_BATCH_SIZE
+    key = settings.CONTACT_SPOOL_KEY
+    inserted = 0
+    deadline = time.monotonic() + FLUSH_TIME_BUDGET
+
+    with client.lock(f"{key}:flush-lock", timeout=FLUSH_LOCK_TIMEOUT):
+        while time.monotonic() < deadline:
+            entries = client.lrange(key, 0, batch_size - 1)
+            if not entries:
+                break
+            contacts = []
+            unreadable = []
+            for entry in entries:
+                try:
+                    contacts.append(contact_from_entry(json.loads(entry)))
+                except (ValueError, KeyError, TypeError):
+                    unreadable.append(entry)
+
+            with transaction.atomic():
+                Contact.objects.bulk_create(contacts)
+            # Only once the rows are in: a failed insert leaves the batch,
+            # unreadable entries included, queued as it was
+            with client.pipeline() as pipe:
+                if unreadable:
+                    pipe.rpush(failed_key(), *unreadable)
+                pipe.ltrim(key, len(entries), -1)
+                pipe.execute()
+            inserted += len(contacts)
+    return inserted
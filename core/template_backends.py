@@ -0,0 +1,35 @@
+# ============================================================================
+# TEMPLATE BACKENDS MODULE - Django templates, timed per request
+# ============================================================================
+# Django's template backend, with each render timed for the request's
+# metrics (see core/instrumentation.py). Every render() shortcut,
+# TemplateResponse and render_to_string() call goes through the backend's
+# template objects, so timing them here covers every page and fragment
+# without patching django.template. Configured in TEMPLATES (under its
+# usual "django" name); without an active request it only renders.
+
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+
+from . import instrumentation
+
+
+class Template(django_backend.Template):
+    """Django backend template whose render() is timed."""
+
+    def render(self, context=None, request=None):
+        with instrumentation.timed_template():
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(django_backend.DjangoTemplates):
+    """DjangoTemplates returning timed templates."""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
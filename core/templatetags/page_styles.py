@@ -0,0 +1,96 @@
+# ============================================================================
+# PAGE STYLE TAGS - Critical CSS inline, full stylesheets deferred
+# ============================================================================
+# Usage:
+#     {% load page_styles %}
+#     {% page_styles "index" %}
+#     {% page_script "dist/js/bookings.js" %}
+#     {% is_built "dist/fontawesome/webfonts/fa-solid-900.woff2" as built %}
+#
+# With the page's critical CSS built (see core/assets.py), its rules are
+# inlined and the stylesheets load without blocking rendering. Otherwise,
+# and for pages without a name, the stylesheets are linked as usual.
+#
+# Files under dist/ only exist once build_assets has run. Until then the
+# tags link core.assets.fallback_assets() instead, so a fresh checkout is
+# styled and no missing manifest entry turns a page into a 500.
+
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.safestring import mark_safe
+
+from ..assets import CRITICAL_PAGES, STYLESHEETS, fallback_assets
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def critical_css(page):
+    """Return a page's collected critical CSS, or "" if it is missing."""
+    if page not in CRITICAL_PAGES:
+        return ""
+    try:
+        with staticfiles_storage.open(f"dist/critical/{page}.css") as f:
+            return f.read().decode()
+    except OSError:
+        return ""
+
+
+@lru_cache(maxsize=None)
+def collected(name):
+    """Return whether collectstatic has collected a static file."""
+    return staticfiles_storage.exists(name)
+
+
+@register.simple_tag
+def is_built(name):
+    """
+    Return whether a static file is available to link.
+
+    In development static files are served from the app directories, so
+    they are looked up there on every call; build_assets may run at any
+    time. Otherwise the collected files are checked once per process.
+    """
+    if settings.DEBUG:
+        return finders.find(name) is not None
+    return collected(name)
+
+
+def asset_links(name):
+    """
+    Return what to link to load a static file.
+
+    Args:
+        name (str): Static name, possibly of a file under dist/
+
+    Returns:
+        list: (URL, SRI hash or "") pairs, in load order
+    """
+    if not name.startswith("dist/") or is_built(name):
+        return [(static(name), "")]
+    return [
+        (url if "://" in url else static(url), integrity)
+        for url, integrity in fallback_assets(name)
+    ]
+
+
+@register.inclusion_tag("core/includes/page_styles.html")
+def page_styles(page=None):
+    """Link the site's stylesheets, inlining the page's critical CSS."""
+    return {
+        "critical_css": mark_safe(critical_css(page)) if page else "",
+        "stylesheets": [
+            link for name in STYLESHEETS for link in asset_links(name)
+        ],
+    }
+
+
+@register.inclusion_tag("core/includes/page_script.html")
+def page_script(name):
+    """Load a script, or the scripts it is built from, deferred."""
+    return {"scripts": asset_links(name)}
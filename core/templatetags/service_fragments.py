@@ -0,0 +1,27 @@
+# ============================================================================
+# SERVICE FRAGMENT TAGS - Template access to cached service fragments
+# ============================================================================
+# Usage:
+#     {% load service_fragments %}
+#     {% service_cards service_list as cards %}
+#     {% service_fragment "core/includes/service_detail.html" service %}
+
+from django import template
+
+from ..fragments import render_service_fragments
+
+register = template.Library()
+
+CARD_TEMPLATE = "core/includes/service_card.html"
+
+
+@register.simple_tag
+def service_cards(services):
+    """Return the rendered card of every service, cached per service."""
+    return render_service_fragments(CARD_TEMPLATE, services)
+
+
+@register.simple_tag
+def service_fragment(template_name, service):
+    """Render a single service fragment through the fragment cache."""
+    return render_service_fragments(template_name, [service])[0]
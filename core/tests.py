@@ -1,3 +1,1733 @@
-from django.test import TestCase
+import importlib
+import json
+import os
+import socket
+import tempfile
+import uuid
+from contextlib import contextmanager
+from io import StringIO
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import redis
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, connections
+from django.db.models import Q
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, clear_url_caches, reverse
+from django.utils.text import slugify
+
+from config import urls as config_urls
+
+from . import (
+    assets, catalog, flash, ratelimit, scheduling, search, sessions, spool,
+    views, warmup,
+)
+from . import admin_urls as core_admin_urls
+from . import urls as core_urls
+from .autocomplete import ClientAutocomplete, ServiceAutocomplete
+from .indexes import TrigramIndex
+from .management.commands import startup_report
+from .fragments import fragment_key
+from .middleware import QueryBudgetExceeded
+from .models import Booking, ClientList, Contact, Service
+from .pagination import EstimatedCountPaginator
+from .resolvers import get_booking_by_token, token_cache_key
+from .templatetags.page_styles import collected, critical_css
+from .tokens import hash_access_token
+
+
+class BookingTestMixin:
+    """Shared fixtures: one user with a booking for one available service."""
+
+    def setUp(self):
+        cache.clear()
+        self.service = Service.objects.create(
+            service_name="Cleaning",
+            slug="cleaning",
+            description="House cleaning",
+            available=True,
+        )
+        self.user = User.objects.create_user(
+            username="jane",
+            email="jane@example.com",
+            password="not-a-real-password",
+            first_name="Jane",
+        )
+        self.client_record = ClientList.objects.create(
+            user=self.user,
+            first_name="Jane",
+            last_name="Doe",
+            email="jane@example.com",
+            phone_number="01234 567890",
+        )
+        self.booking = Booking.objects.create(
+            client=self.client_record,
+            booking_date=date.today() + timedelta(days=7),
+            booking_earliest="0900",
+            booking_latest="1200",
+        )
+        self.booking.services.add(self.service)
+        # Warm the catalog so query counts only cover the booking lookup
+        catalog.available_services()
+
+
+class BookingViewQueryCountTests(BookingTestMixin, TestCase):
+    """
+    Pin the number of queries each booking view runs.
+
+    Logged-in requests cost one query for the session and one for the user;
+    the client and booking then come from one joined query and the services
+    from a prefetch query.
+    """
+
+    def test_booking_page_redirects_existing_booking(self):
+        self.client.force_login(self.user)
+        url = reverse("bookings_with_service", args=[self.service.slug])
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertRedirects(
+            response, reverse("booking_info"), fetch_redirect_response=False
+        )
+
+    def test_booking_page_no_service_redirects_existing_booking(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("bookings"))
+        self.assertRedirects(
+            response, reverse("booking_info"), fetch_redirect_response=False
+        )
+
+    def test_booking_info_for_user(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("booking_info"))
+        self.assertEqual(response.context["booking"], self.booking)
+        self.assertContains(response, "Cleaning")
+
+    def test_booking_info_for_guest_access_key(self):
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                reverse("booking_info"),
+                {"access_key": self.booking.access_token},
+            )
+        self.assertEqual(response.context["booking"], self.booking)
+        self.assertContains(response, "Cleaning")
+
+    def test_edit_booking(self):
+        self.client.force_login(self.user)
+        # Lookup (4) + savepoint, locked recount, update, release; the
+        # outcome goes in the flash cookie
+        with self.assertNumQueries(8):
+            response = self.client.post(reverse("edit_booking"), {
+                "booking_date": (date.today() + timedelta(days=8)).isoformat(),
+                "earliest_availability_hour": "10",
+                "earliest_availability_min": "00",
+                "latest_availability_hour": "11",
+                "latest_availability_min": "30",
+            })
+        self.assertRedirects(
+            response, reverse("booking_info"), fetch_redirect_response=False
+        )
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.booking_earliest, "1000")
+
+    def test_cancel_booking(self):
+        self.client.force_login(self.user)
+        # Lookup (4) + cascading delete (5)
+        with self.assertNumQueries(9):
+            response = self.client.post(reverse("cancel_booking"))
+        self.assertRedirects(
+            response, reverse("bookings"), fetch_redirect_response=False
+        )
+        self.assertFalse(Booking.objects.exists())
+
+
+class BookingResolverTests(BookingTestMixin, TestCase):
+    """Behaviour of the shared booking resolver."""
+
+    def test_booking_matched_by_email_is_linked_to_user(self):
+        self.client_record.user = None
+        self.client_record.save()
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("booking_info"))
+
+        self.assertContains(response, "linked it to your account")
+        self.client_record.refresh_from_db()
+        self.assertEqual(self.client_record.user, self.user)
+
+    def test_booking_matched_by_email_cannot_be_cancelled(self):
+        self.client_record.user = None
+        self.client_record.save()
+
+        self.client.force_login(self.user)
+        self.client.post(reverse("cancel_booking"))
+
+        self.assertTrue(Booking.objects.exists())
+
+    def test_unknown_access_key_is_rejected(self):
+        response = self.client.post(
+            reverse("booking_info"), {"access_key": "not-a-token"}
+        )
+        self.assertNotIn("booking", response.context)
+        self.assertContains(response, "Invalid access key")
+
+    def test_token_is_stored_as_digest(self):
+        token = self.booking.access_token
+        row = Booking.objects.values().get()
+        self.assertNotIn(token, row.values())
+        self.assertEqual(row["token_digest"], hash_access_token(token))
+        # Loaded bookings do not know their token
+        self.assertEqual(Booking.objects.get().access_token, "")
+
+    def test_token_lookup_uses_digest_index(self):
+        token = self.booking.access_token
+        with CaptureQueriesContext(connection) as queries:
+            resolved = get_booking_by_token(token)
+        self.assertEqual(resolved.booking, self.booking)
+        self.assertEqual(resolved.booking.access_token, token)
+        # The booking by digest, then its services
+        self.assertEqual(len(queries), 2)
+        self.assertIn('"core_booking"."token_digest" =', queries[0]["sql"])
+
+    def test_repeat_token_lookup_uses_cached_id(self):
+        token = self.booking.access_token
+        get_booking_by_token(token)
+        # Only the id is cached, under the digest; never the token or rows
+        key = token_cache_key(hash_access_token(token))
+        self.assertEqual(cache.get(key), self.booking.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            resolved = get_booking_by_token(token)
+        self.assertEqual(resolved.booking, self.booking)
+        self.assertEqual(resolved.booking.access_token, token)
+        # The booking by primary key, then its services
+        self.assertEqual(len(queries), 2)
+        self.assertIn('"core_booking"."id" =', queries[0]["sql"])
+
+    def test_rescheduled_booking_drops_cached_id(self):
+        token = self.booking.access_token
+        get_booking_by_token(token)
+        key = token_cache_key(hash_access_token(token))
+        with self.captureOnCommitCallbacks(execute=True):
+            views.reschedule_booking(
+                self.booking, self.booking.booking_date, "1000", "1100"
+            )
+        self.assertIsNone(cache.get(key))
+
+    def test_saved_booking_is_looked_up_again(self):
+        token = self.booking.access_token
+        get_booking_by_token(token)
+        self.booking.booking_earliest = "0900"
+        self.booking.save()
+        with self.assertNumQueries(2):
+            resolved = get_booking_by_token(token)
+        self.assertEqual(resolved.booking.booking_earliest, "0900")
+
+    def test_saved_client_is_looked_up_again(self):
+        token = self.booking.access_token
+        get_booking_by_token(token)
+        self.client_record.first_name = "Renamed"
+        self.client_record.save()
+        resolved = get_booking_by_token(token)
+        self.assertEqual(resolved.client.first_name, "Renamed")
+
+    def test_cancelled_booking_token_is_rejected(self):
+        token = self.booking.access_token
+        get_booking_by_token(token)
+        self.booking.delete()
+        self.assertIsNone(cache.get(token_cache_key(hash_access_token(token))))
+        self.assertFalse(get_booking_by_token(token))
+
+
+@override_settings(BOOKING_SLOT_CAPACITY=2)
+class SlotCapacityTests(BookingTestMixin, TestCase):
+    """Capacity enforcement by the scheduling engine."""
+
+    def book(self, email, earliest="1000", latest="1100"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("book_service"), {
+                "first_name": "Guest",
+                "last_name": "Booker",
+                "email_address": email,
+                "phone_number": "01234 000000",
+                "services": self.service.pk,
+                "booking_date": self.booking.booking_date.isoformat(),
+                "earliest_availability_hour": earliest[:2],
+                "earliest_availability_min": earliest[2:],
+                "latest_availability_hour": latest[:2],
+                "latest_availability_min": latest[2:],
+            })
+
+    def test_day_schedule_counts_overlapping_windows(self):
+        day = scheduling.DaySchedule()
+        day.add(540, 720)
+        day.add(600, 660)
+        self.assertEqual(day.overlapping(700, 800), 1)
+        self.assertEqual(day.overlapping(720, 800), 0)
+        self.assertEqual(day.overlapping(0, 1439), 2)
+        day.remove(540, 720)
+        self.assertEqual(day.overlapping(0, 1439), 1)
+
+    def test_full_window_is_refused(self):
+        self.book("first@example.com")
+        response = self.book("second@example.com")
+
+        self.assertContains(response, "fully booked")
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_adjacent_window_is_accepted(self):
+        self.book("first@example.com")
+        self.book("second@example.com", "1200", "1300")
+
+        self.assertEqual(Booking.objects.count(), 3)
+
+    def test_cancelling_frees_the_window(self):
+        self.book("first@example.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_record.delete()
+        self.book("second@example.com")
+
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_booking_written_without_signals_is_counted(self):
+        # As if another worker or an import booked the slot meanwhile
+        Booking.objects.bulk_create([Booking(
+            client=ClientList.objects.create(
+                first_name="Other", last_name="Worker",
+                email="other@example.com", phone_number="01",
+            ),
+            booking_date=self.booking.booking_date,
+            booking_earliest="1000",
+            booking_latest="1100",
+        )])
+        response = self.book("first@example.com")
+
+        self.assertContains(response, "fully booked")
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_unavailable_service_is_refused(self):
+        self.service.available = False
+        self.service.save()
+        response = self.book("first@example.com")
+
+        self.assertContains(response, "not available")
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_edit_does_not_count_own_window(self):
+        self.book("first@example.com")
+        self.client.force_login(self.user)
+        self.client.post(reverse("edit_booking"), {
+            "booking_date": self.booking.booking_date.isoformat(),
+            "earliest_availability_hour": "10",
+            "earliest_availability_min": "30",
+            "latest_availability_hour": "11",
+            "latest_availability_min": "30",
+        })
+
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.booking_earliest, "1030")
+
+
+class BookingTransferTests(BookingTestMixin, TestCase):
+    """Round trip through the bulk import and export commands."""
+
+    def test_export_then_import_round_trip(self):
+        self.client_record.linked_services.add(self.service)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "clients.jsonl")
+            call_command("export_bookings", path, stderr=StringIO())
+            Booking.objects.all().delete()
+            ClientList.objects.all().delete()
+
+            call_command(
+                "import_bookings", path, stdout=StringIO(), stderr=StringIO()
+            )
+
+        booking = Booking.objects.select_related("client").get()
+        self.assertEqual(booking.client.email, "jane@example.com")
+        self.assertEqual(booking.booking_earliest, "0900")
+        self.assertEqual(list(booking.services.all()), [self.service])
+        self.assertEqual(
+            list(booking.client.linked_services.all()), [self.service]
+        )
+        self.assertEqual(len(booking.token_digest), 64)
+
+    def test_import_skips_existing_clients_and_bad_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "clients.csv"
+            path.write_text(
+                "first_name,last_name,email,phone_number,services,"
+                "booking_date,booking_earliest,booking_latest\n"
+                "Jane,Doe,jane@example.com,01,cleaning,,,\n"
+                "Sam,Roe,sam@example.com,02,unknown,,,\n"
+                "Ann,Poe,ann@example.com,03,cleaning,2030-01-01,1000,0900\n"
+                "Bob,Loe,bob@example.com,04,cleaning,2030-01-01,1000,1100\n"
+            )
+            stdout = StringIO()
+            call_command(
+                "import_bookings", str(path), stdout=stdout, stderr=StringIO()
+            )
+
+        self.assertIn("skipped 3 rows", stdout.getvalue())
+        self.assertEqual(
+            Booking.objects.get(client__email="bob@example.com").booking_latest,
+            "1100",
+        )
+
+
+class ContactSpoolTests(TestCase):
+    """Without a spool, contact submissions are inserted straight away."""
+
+    def setUp(self):
+        # Rate limit counters
+        cache.clear()
+
+    def post_contact(self, name):
+        return self.client.post(reverse("contact"), {
+            "name": name,
+            "email": "visitor@example.com",
+            "message": "Hello there",
+        })
+
+    def test_submission_is_inserted_without_spool(self):
+        response = self.post_contact("Visitor")
+        self.assertTrue(response.json()["success"])
+        self.assertEqual(Contact.objects.get().name, "Visitor")
+
+        stdout = StringIO()
+        call_command("flush_contacts", stdout=stdout)
+        self.assertIn("No contact spool", stdout.getvalue())
+
+    def test_submission_is_inserted_when_redis_is_down(self):
+        # Nothing listens on port 1, so the push is refused
+        with self.settings(CONTACT_SPOOL_URL="redis://127.0.0.1:1/0"):
+            with self.assertLogs("core.spool", "ERROR"):
+                response = self.post_contact("Visitor")
+        self.assertTrue(response.json()["success"])
+        self.assertEqual(Contact.objects.get().name, "Visitor")
+
+    def test_submission_is_inserted_when_redis_hangs(self):
+        # Accepts the connection but never answers
+        server = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(server.close)
+        url = f"redis://127.0.0.1:{server.getsockname()[1]}/0"
+        with self.settings(CONTACT_SPOOL_URL=url):
+            with self.assertLogs("core.spool", "ERROR") as logs:
+                response = self.post_contact("Visitor")
+        self.assertTrue(response.json()["success"])
+        self.assertEqual(Contact.objects.get().name, "Visitor")
+        self.assertIn("TimeoutError", logs.output[0])
+
+    def test_entry_keeps_its_submission_time(self):
+        contact = spool.contact_from_entry({
+            "name": "Visitor",
+            "email": "visitor@example.com",
+            "message": "Hello there",
+            "submitted_ns": 1_700_000_000 * 10**9,
+        })
+        contact.save()
+        contact.refresh_from_db()
+        self.assertEqual(contact.created_on.timestamp(), 1_700_000_000)
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the redis.Redis calls the contact spool makes.
+
+    Lists hold bytes, as a client without decode_responses returns them,
+    and ranges follow Redis: end indexes are inclusive, negative ones count
+    from the tail.
+    """
+
+    def __init__(self):
+        self.lists = {}
+
+    @staticmethod
+    def _span(values, start, end):
+        length = len(values)
+        start = max(start + length if start < 0 else start, 0)
+        end = end + length if end < 0 else end
+        return start, min(end, length - 1) + 1
+
+    def rpush(self, key, *values):
+        items = self.lists.setdefault(key, [])
+        items.extend(
+            value.encode() if isinstance(value, str) else value
+            for value in values
+        )
+        return len(items)
+
+    def lrange(self, key, start, end):
+        values = self.lists.get(key, [])
+        start, stop = self._span(values, start, end)
+        return values[start:stop]
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lrange(key, start, end)
+        return True
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def lindex(self, key, index):
+        values = self.lists.get(key, [])
+        return values[index] if -len(values) <= index < len(values) else None
+
+    def delete(self, *keys):
+        return sum(self.lists.pop(key, None) is not None for key in keys)
+
+    @contextmanager
+    def lock(self, name, timeout=None):
+        yield
+
+    @contextmanager
+    def pipeline(self):
+        commands = []
+
+        class Pipeline:
+            def __getattr__(pipe, name):
+                method = getattr(self, name)
+                return lambda *args: commands.append((method, args))
+
+            def execute(pipe):
+                return [method(*args) for method, args in commands]
+
+        yield Pipeline()
+
+
+class RedisContactSpoolTests(ContactSpoolTests):
+    """
+    Contact submissions are queued in Redis and inserted in batches.
+
+    Runs against FakeRedis; LiveRedisContactSpoolTests repeats the tests
+    against a real server when TEST_REDIS_URL is set.
+    """
+
+    redis_url = "redis://spool.invalid/0"
+
+    def setUp(self):
+        super().setUp()
+        key = f"test:contacts:{uuid.uuid4().hex}"
+        override = override_settings(
+            CONTACT_SPOOL_URL=self.redis_url,
+            CONTACT_SPOOL_KEY=key,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        self.use_client()
+        self.addCleanup(
+            lambda: spool.spool_client().delete(key, spool.failed_key())
+        )
+
+    def use_client(self):
+        """Point the spool at a fresh in-memory Redis."""
+        patcher = mock.patch.object(
+            spool, "_client", return_value=FakeRedis()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_submission_is_inserted_without_spool(self):
+        self.skipTest("a spool is configured")
+
+    def test_submission_is_inserted_when_redis_is_down(self):
+        with mock.patch.object(
+            spool.spool_client(), "rpush", side_effect=redis.ConnectionError
+        ):
+            with self.assertLogs("core.spool", "ERROR"):
+                with self.assertNumQueries(1):
+                    response = self.post_contact("Visitor")
+        self.assertTrue(response.json()["success"])
+        self.assertEqual(Contact.objects.get().name, "Visitor")
+        self.assertEqual(spool.pending_count(), 0)
+
+    def test_submission_is_inserted_when_redis_hangs(self):
+        with mock.patch.object(
+            spool.spool_client(), "rpush", side_effect=redis.TimeoutError
+        ):
+            with self.assertLogs("core.spool", "ERROR"):
+                response = self.post_contact("Visitor")
+        self.assertTrue(response.json()["success"])
+        self.assertEqual(Contact.objects.get().name, "Visitor")
+        self.assertEqual(spool.pending_count(), 0)
+
+    def test_submission_is_queued_then_flushed(self):
+        with self.assertNumQueries(0):
+            response = self.post_contact("Visitor")
+        self.assertTrue(response.json()["success"])
+        self.assertFalse(Contact.objects.exists())
+
+        call_command("flush_contacts", stdout=StringIO())
+
+        self.assertEqual(Contact.objects.get().name, "Visitor")
+        self.assertEqual(spool.pending_count(), 0)
+
+    def test_flush_inserts_in_batches_in_arrival_order(self):
+        for i in range(5):
+            self.post_contact(f"Visitor {i}")
+
+        # Three batches, each a savepoint, one insert and a release
+        with self.assertNumQueries(3 * 3):
+            inserted = spool.flush_contacts(batch_size=2)
+
+        self.assertEqual(inserted, 5)
+        self.assertEqual(
+            list(Contact.objects.order_by("pk").values_list("name", flat=True)),
+            [f"Visitor {i}" for i in range(5)],
+        )
+
+    def test_unreadable_entry_is_moved_aside(self):
+        client = spool.spool_client()
+        client.rpush(settings.CONTACT_SPOOL_KEY, b"not json")
+        self.post_contact("Visitor")
+
+        self.assertEqual(spool.flush_contacts(), 1)
+        self.assertEqual(client.lrange(spool.failed_key(), 0, -1), [b"not json"])
+
+    def test_failed_insert_moves_unreadable_entries_once(self):
+        client = spool.spool_client()
+        client.rpush(settings.CONTACT_SPOOL_KEY, b"not json")
+        self.post_contact("Visitor")
+
+        with mock.patch.object(
+            Contact.objects, "bulk_create", side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                spool.flush_contacts()
+        self.assertEqual(client.llen(spool.failed_key()), 0)
+        self.assertEqual(spool.pending_count(), 2)
+
+        self.assertEqual(spool.flush_contacts(), 1)
+        self.assertEqual(client.lrange(spool.failed_key(), 0, -1), [b"not json"])
+
+    def test_flush_stops_after_its_time_budget(self):
+        for i in range(3):
+            self.post_contact(f"Visitor {i}")
+        with mock.patch.object(spool, "FLUSH_TIME_BUDGET", 0):
+            self.assertEqual(spool.flush_contacts(batch_size=1), 0)
+        self.assertEqual(spool.pending_count(), 3)
+
+
+@skipUnless(os.environ.get("TEST_REDIS_URL"), "needs TEST_REDIS_URL")
+class LiveRedisContactSpoolTests(RedisContactSpoolTests):
+    """The spool tests, against the Redis server at TEST_REDIS_URL."""
+
+    redis_url = os.environ.get("TEST_REDIS_URL")
+
+    def use_client(self):
+        """Use the real client for redis_url."""
+
+
+class CatalogVersionTests(BookingTestMixin, TestCase):
+    """Service changes move the catalog version; stale copies are dropped."""
+
+    def version_reads(self, shared):
+        return [
+            call for call in shared.get.call_args_list
+            if call.args[0] == catalog.CATALOG_VERSION_KEY
+        ]
+
+    def test_saving_a_service_bumps_the_version(self):
+        before = catalog.get_catalog_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.service.service_name = "Window cleaning"
+            self.service.save()
+        bumped = catalog.get_catalog_version()
+        self.assertNotEqual(bumped, before)
+
+        # ...and again on commit, past any rebuild from uncommitted rows
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(catalog.get_catalog_version(), bumped)
+        self.assertEqual(
+            catalog.get_available_service("cleaning").service_name,
+            "Window cleaning",
+        )
+
+    def test_deleting_a_service_bumps_the_version(self):
+        before = catalog.get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.delete()
+        self.assertNotEqual(catalog.get_catalog_version(), before)
+        self.assertEqual(catalog.available_services(), ())
+
+    def test_stale_process_snapshot_is_discarded(self):
+        stale = catalog.get_catalog()
+        # Another process changed the catalog: rows and version, no signal
+        # in this one
+        Service.objects.filter(pk=self.service.pk).update(
+            service_name="Renamed"
+        )
+        self.assertIs(catalog.get_catalog(), stale)
+        catalog.bump_catalog_version()
+
+        fresh = catalog.get_catalog()
+        self.assertIsNot(fresh, stale)
+        self.assertEqual(fresh.services[0].service_name, "Renamed")
+
+    def test_version_is_read_once_per_request(self):
+        with mock.patch.object(catalog, "cache", wraps=cache) as shared:
+            response = self.client.get(reverse("services"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.version_reads(shared)), 1)
+
+    def test_request_sees_its_own_bump(self):
+        with catalog.request_scope():
+            before = catalog.get_catalog_version()
+            catalog.bump_catalog_version()
+            self.assertNotEqual(catalog.get_catalog_version(), before)
+
+
+class ServiceFragmentCacheTests(BookingTestMixin, TestCase):
+    """Service cards and detail bodies are cached per service version."""
+
+    def test_warm_services_page_reuses_cached_cards(self):
+        response = self.client.get(reverse("services"))
+        self.assertTemplateUsed(response, "core/includes/service_card.html")
+
+        response = self.client.get(reverse("services"))
+        self.assertTemplateNotUsed(
+            response, "core/includes/service_card.html"
+        )
+        self.assertContains(response, 'href="/services/cleaning/"')
+
+    def test_saving_a_service_refreshes_its_fragments(self):
+        url = reverse("service_detail", args=[self.service.slug])
+        self.assertContains(self.client.get(url), "House cleaning")
+
+        self.service.description = "Deep cleaning"
+        self.service.save()
+
+        response = self.client.get(url)
+        self.assertContains(response, "Deep cleaning")
+        self.assertNotContains(response, "House cleaning")
+
+    def test_new_release_refreshes_fragments(self):
+        template_name = "core/includes/service_card.html"
+        key = fragment_key(template_name, self.service)
+        with self.settings(RELEASE_VERSION="v2"):
+            self.assertNotEqual(
+                fragment_key(template_name, self.service), key
+            )
+
+
+class ConditionalGetTests(BookingTestMixin, TestCase):
+    """Catalog pages answer repeat visits with 304 Not Modified."""
+
+    def revalidate(self, url, response):
+        return self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+    def test_repeat_visit_gets_304_without_queries(self):
+        url = reverse("service_detail", args=[self.service.slug])
+        # The first visit sets the CSRF cookie, which is part of the ETag
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(0):
+            response = self.revalidate(url, response)
+        self.assertEqual(response.status_code, 304)
+
+    def test_saving_a_service_changes_the_etag(self):
+        url = reverse("services")
+        response = self.client.get(url)
+
+        self.service.save()
+
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_signing_in_changes_the_etag(self):
+        url = reverse("home")
+        response = self.client.get(url)
+
+        self.client.force_login(self.user)
+
+        response = self.revalidate(url, response)
+        self.assertContains(response, "Welcome back Jane")
+        self.assertNotIn("Last-Modified", response)
+
+
+class ServiceImageVariantTests(BookingTestMixin, TestCase):
+    """Responsive image URLs are computed on save and used by templates."""
+
+    def test_placeholder_has_no_variants(self):
+        self.assertEqual(self.service.image_variants, {})
+        response = self.client.get(reverse("services"))
+        self.assertContains(response, "images/placeholder.jpg")
+
+    def test_uploaded_image_gets_srcset_and_dimensions(self):
+        self.service.image_url = "services/garden"
+        self.service.save()
+
+        card = self.service.image_variants["card"]
+        self.assertEqual((card["width"], card["height"]), (480, 240))
+        self.assertIn("f_avif", card["srcset"]["avif"])
+        self.assertIn("q_auto", card["src"])
+
+        response = self.client.get(reverse("services"))
+        self.assertContains(response, 'type="image/webp"')
+        self.assertContains(response, 'loading="lazy"')
+        self.assertContains(response, 'width="480"')
+        self.assertContains(response, 'height="240"')
+        self.assertContains(response, "w_720/")
+
+
+class ServiceCursorPaginationTests(BookingTestMixin, TestCase):
+    """The services page and JSON feed page through cursors."""
+
+    def setUp(self):
+        super().setUp()
+        for name in ["Baking", "alterations", "Dog walking", "Errands",
+                     "Furniture", "Gardening", "Hairdressing", "Ironing"]:
+            Service.objects.create(
+                service_name=name, slug=slugify(name), description=name,
+                available=True,
+            )
+
+    def names(self, response):
+        return [service.service_name for service in response.context[
+            "service_list"]]
+
+    def test_pages_follow_next_and_previous_cursors(self):
+        first = self.client.get(reverse("services"))
+        self.assertEqual(self.names(first), [
+            "alterations", "Baking", "Cleaning", "Dog walking", "Errands",
+            "Furniture",
+        ])
+        self.assertFalse(first.context["page_obj"].has_previous())
+
+        cursor = first.context["page_obj"].next_cursor
+        second = self.client.get(reverse("services"), {"cursor": cursor})
+        self.assertEqual(
+            self.names(second), ["Gardening", "Hairdressing", "Ironing"]
+        )
+        self.assertFalse(second.context["page_obj"].has_next())
+
+        cursor = second.context["page_obj"].previous_cursor
+        back = self.client.get(reverse("services"), {"cursor": cursor})
+        self.assertEqual(self.names(back), self.names(first))
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(reverse("services"), {"cursor": "!!"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_feed_returns_card_fields_and_next_url(self):
+        response = self.client.get(reverse("service_feed"))
+        data = response.json()
+        self.assertEqual(len(data["results"]), 6)
+        self.assertEqual(data["results"][0], {
+            "service_name": "alterations",
+            "slug": "alterations",
+            "excerpt": "",
+            "url": "/services/alterations/",
+            "booking_url": "/bookings/alterations/",
+            "image": None,
+        })
+        self.assertIsNone(data["previous"])
+
+        data = self.client.get(data["next"]).json()
+        self.assertEqual(len(data["results"]), 3)
+        self.assertIsNone(data["next"])
+
+
+class ServiceApiTests(BookingTestMixin, TestCase):
+    """Read-only services API with sparse fieldsets and HTTP caching."""
+
+    def test_list_streams_requested_fields(self):
+        response = self.client.get(
+            reverse("api_service_list"), {"fields": "slug,service_name"}
+        )
+        self.assertTrue(response.streaming)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("ETag", response)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data, {"results": [
+            {"service_name": "Cleaning", "slug": "cleaning"},
+        ]})
+
+    def test_detail_and_revalidation(self):
+        url = reverse("api_service_detail", args=["cleaning"])
+        response = self.client.get(url)
+        self.assertEqual(response.json(), {
+            "service_name": "Cleaning",
+            "slug": "cleaning",
+            "excerpt": "",
+            "image_url": None,
+        })
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertIn("public", response["Cache-Control"])
+
+    def test_unknown_field_and_slug(self):
+        response = self.client.get(
+            reverse("api_service_list"), {"fields": "password"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("ETag", response)
+        response = self.client.get(
+            reverse("api_service_detail", args=["missing"])
+        )
+        self.assertEqual(response.status_code, 404)
+        # Errors are not kept by shared caches
+        self.assertNotIn("public", response.get("Cache-Control", ""))
+        self.assertNotIn("ETag", response)
+
+    def test_missing_service_is_not_revalidated(self):
+        # Every service shares the catalog's ETag
+        etag = self.client.get(
+            reverse("api_service_detail", args=["cleaning"])
+        )["ETag"]
+        response = self.client.get(
+            reverse("api_service_detail", args=["missing"]),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 404)
+
+        self.service.available = False
+        self.service.save()
+        response = self.client.get(
+            reverse("api_service_detail", args=["cleaning"]),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class AutocompleteSearchTests(TestCase):
+    """Search backends rank matches and are picked per database."""
+
+    def setUp(self):
+        for name in ["Deep clean", "Cleaning", "Clean", "Gardening"]:
+            Service.objects.create(
+                service_name=name, slug=slugify(name), description=name,
+            )
+
+    def names(self, backend, term):
+        results = backend.search(Service.objects.all(), ["service_name"], term)
+        return [service.service_name for service in results]
+
+    def test_exact_then_prefix_then_contains(self):
+        self.assertEqual(
+            self.names(search.ContainsSearchBackend(), "clean"),
+            ["Clean", "Cleaning", "Deep clean"],
+        )
+
+    def test_short_terms_match_anywhere(self):
+        backend = search.TrigramSearchBackend()
+        results = backend.filter(Service.objects.all(), ["service_name"], "ee")
+        self.assertEqual(
+            [service.service_name for service in results], ["Deep clean"]
+        )
+
+    def test_contains_backend_is_used_off_postgresql(self):
+        self.assertIsInstance(
+            search.get_search_backend(), search.ContainsSearchBackend
+        )
+        self.assertNotIsInstance(
+            search.get_search_backend(), search.TrigramSearchBackend
+        )
+
+    def test_trigram_backend_is_used_on_postgresql(self):
+        with mock.patch.object(connections["default"], "vendor", "postgresql"):
+            backend = search.get_search_backend()
+        self.assertIsInstance(backend, search.TrigramSearchBackend)
+
+    @override_settings(
+        AUTOCOMPLETE_SEARCH_BACKEND="core.search.TrigramSearchBackend"
+    )
+    def test_setting_overrides_the_default_backend(self):
+        self.assertIsInstance(
+            search.get_search_backend(), search.TrigramSearchBackend
+        )
+
+    def test_autocomplete_view_ranks_results(self):
+        admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "not-a-real-password"
+        )
+        self.client.force_login(admin)
+        response = self.client.get(
+            reverse("service-autocomplete"), {"q": "clean"}
+        )
+        self.assertEqual(
+            [result["text"].split(" | ")[0]
+             for result in response.json()["results"]
+             if not result.get("create_id")],
+            ["Clean", "Cleaning", "Deep clean"],
+        )
+
+    def test_benchmark_command_runs(self):
+        stdout = StringIO()
+        call_command(
+            "benchmark_autocomplete", "--rows", "10", "--repeat", "1",
+            stdout=stdout,
+        )
+        self.assertIn("10 clients", stdout.getvalue())
+        # Seeded rows are rolled back
+        self.assertFalse(ClientList.objects.exists())
+
+
+class AdminChangelistQueryCountTests(TestCase):
+    """Changelists run a fixed number of queries however many rows exist."""
+
+    # Session, user, count and page rows; bookings also run the two
+    # date_hierarchy queries (date bounds and distinct years)
+    changelists = {
+        "admin:core_booking_changelist": 6,
+        "admin:core_clientlist_changelist": 4,
+        "admin:core_contact_changelist": 4,
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "not-a-real-password"
+        )
+        self.client.force_login(self.admin)
+
+    def add_rows(self, start, stop):
+        for i in range(start, stop):
+            client = ClientList.objects.create(
+                first_name=f"First{i}",
+                last_name=f"Last{i}",
+                email=f"client{i}@example.com",
+                phone_number="01234 567890",
+            )
+            Booking.objects.create(
+                client=client,
+                booking_date=date.today() + timedelta(days=i),
+                booking_earliest="0900",
+                booking_latest="1200",
+            )
+            Contact.objects.create(
+                name=f"Visitor {i}", email="v@example.com", message="Hi"
+            )
+
+    def test_query_count_is_independent_of_row_count(self):
+        for rows in (2, 30):
+            self.add_rows(ClientList.objects.count(), rows)
+            for name, queries in self.changelists.items():
+                with self.subTest(changelist=name, rows=rows):
+                    with self.assertNumQueries(queries):
+                        response = self.client.get(reverse(name))
+                    self.assertEqual(response.status_code, 200)
+
+
+class ChangelistIndexTests(TestCase):
+    """Changelist orderings, filters and searches are backed by indexes."""
+
+    def index(self, model, name):
+        return next(
+            index for index in model._meta.indexes if index.name == name
+        )
+
+    def assertIndexLeads(self, model, name, fields):
+        """Assert that an index starts with fields, and exists as declared."""
+        index = self.index(model, name)
+        self.assertEqual(index.fields[:len(fields)], list(fields))
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, model._meta.db_table
+            )
+        self.assertEqual(constraints[name]["columns"], [
+            model._meta.get_field(field.lstrip("-")).column
+            for field in index.fields
+        ])
+
+    def test_default_orderings_are_indexed(self):
+        for model, name in [
+            (Booking, "booking_date_created_idx"),
+            (ClientList, "client_status_name_idx"),
+            (Contact, "contact_created_idx"),
+        ]:
+            with self.subTest(model=model.__name__):
+                # The changelists keep the model ordering
+                self.assertFalse(admin.site._registry[model].ordering)
+                self.assertIndexLeads(model, name, model._meta.ordering)
+
+    def test_changelist_filters_are_indexed(self):
+        booking_admin = admin.site._registry[Booking]
+        self.assertIndexLeads(
+            Booking, "booking_date_created_idx",
+            [f"-{booking_admin.date_hierarchy}"],
+        )
+        self.assertIn("is_confirmed", booking_admin.list_filter)
+        self.assertIndexLeads(
+            Booking, "booking_confirmed_date_idx",
+            ["is_confirmed", *Booking._meta.ordering],
+        )
+        client_admin = admin.site._registry[ClientList]
+        self.assertIn("is_client", client_admin.list_filter)
+        self.assertIndexLeads(
+            ClientList, "client_status_name_idx", ["is_client"]
+        )
+
+        self.assertIn("is_read", admin.site._registry[Contact].list_filter)
+        self.assertIndexLeads(
+            Contact, "contact_unread_idx", Contact._meta.ordering
+        )
+        self.assertEqual(
+            self.index(Contact, "contact_unread_idx").condition,
+            Q(is_read=False),
+        )
+
+    def test_autocomplete_search_fields_are_indexed(self):
+        for view in (ServiceAutocomplete, ClientAutocomplete):
+            # OpClass(Upper(field)) -> field name
+            indexed = {
+                index.expressions[0].get_source_expressions()[0]
+                .get_source_expressions()[0].name
+                for index in view.model._meta.indexes
+                if isinstance(index, TrigramIndex)
+            }
+            with self.subTest(view=view.__name__):
+                self.assertEqual(indexed, set(view.search_fields))
+
+
+class EstimatedCountPaginatorTests(BookingTestMixin, TestCase):
+    """Large changelists use the planner's estimate on PostgreSQL."""
+
+    def count(self, explain):
+        """Count bookings as if on PostgreSQL, EXPLAIN answering explain."""
+        queryset = Booking.objects.order_by("pk")
+        paginator = EstimatedCountPaginator(queryset, 100)
+        with mock.patch.object(
+            connections[queryset.db], "vendor", "postgresql"
+        ), mock.patch(
+            "django.db.models.query.QuerySet.explain", side_effect=explain
+        ):
+            return paginator.count
+
+    def plan(self, rows):
+        return {"Plan": {"Node Type": "Seq Scan", "Plan Rows": rows}}
+
+    def test_plan_object_is_read(self):
+        # Django's output with psycopg 3: the plan object, not a list
+        self.assertEqual(
+            self.count(lambda **kw: json.dumps(self.plan(50_000))), 50_000
+        )
+
+    def test_plan_list_is_read(self):
+        self.assertEqual(
+            self.count(lambda **kw: json.dumps([self.plan(50_000)])), 50_000
+        )
+
+    def test_small_estimate_is_counted_exactly(self):
+        self.assertEqual(self.count(lambda **kw: json.dumps(self.plan(5))), 1)
+
+    def test_unreadable_plan_falls_back_to_exact_count(self):
+        self.assertEqual(self.count(lambda **kw: '"unexpected"'), 1)
+        self.assertEqual(self.count(DatabaseError("explain failed")), 1)
+
+
+class BookingAdminActionTests(BookingTestMixin, TestCase):
+    """Bulk booking actions run one statement whatever the selection."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "not-a-real-password"
+        )
+        self.client.force_login(self.admin)
+        for i in range(3):
+            client = ClientList.objects.create(
+                first_name=f"First{i}",
+                last_name=f"Last{i}",
+                email=f"client{i}@example.com",
+                phone_number="01234 567890",
+            )
+            booking = Booking.objects.create(
+                client=client,
+                booking_date=date.today() + timedelta(days=i + 1),
+                booking_earliest="0900",
+                booking_latest="1200",
+            )
+            booking.services.add(self.service)
+
+    def run_action(self, action, **data):
+        return self.client.post(reverse("admin:core_booking_changelist"), {
+            "action": action,
+            "_selected_action": list(
+                Booking.objects.values_list("pk", flat=True)
+            ),
+            **data,
+        })
+
+    def booking_writes(self, queries):
+        return [
+            query["sql"] for query in queries
+            if query["sql"].startswith(("UPDATE", "DELETE"))
+            and "core_booking" in query["sql"]
+        ]
+
+    def test_confirm_selected_updates_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.run_action("confirm_selected")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(self.booking_writes(queries)), 1)
+        self.assertFalse(Booking.objects.filter(is_confirmed=False).exists())
+
+    def test_confirm_selected_is_seen_by_guest_lookups(self):
+        token = self.booking.access_token
+        self.assertFalse(get_booking_by_token(token).booking.is_confirmed)
+        self.run_action("confirm_selected")
+        self.assertTrue(get_booking_by_token(token).booking.is_confirmed)
+
+    @override_settings(BOOKING_SLOT_CAPACITY=4)
+    def test_reschedule_selected_moves_all_bookings(self):
+        new_date = date.today() + timedelta(days=30)
+        token = self.booking.access_token
+        get_booking_by_token(token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_action(
+                "reschedule_selected", reschedule_date=new_date.isoformat()
+            )
+        self.assertEqual(
+            set(Booking.objects.values_list("booking_date", flat=True)),
+            {new_date},
+        )
+        # The update bypasses signals; the action drops the cached ids
+        self.assertIsNone(cache.get(token_cache_key(hash_access_token(token))))
+
+    @override_settings(BOOKING_SLOT_CAPACITY=3)
+    def test_reschedule_selected_refuses_overbooking(self):
+        new_date = date.today() + timedelta(days=30)
+        self.run_action(
+            "reschedule_selected", reschedule_date=new_date.isoformat()
+        )
+        self.assertFalse(
+            Booking.objects.filter(booking_date=new_date).exists()
+        )
+
+    @override_settings(BOOKING_SLOT_CAPACITY=3)
+    def test_reschedule_selected_reads_windows_under_the_day_lock(self):
+        new_date = date.today() + timedelta(days=30)
+        lock_day = scheduling._lock_day
+
+        def edited_while_waiting(booking_date):
+            lock_day(booking_date)
+            # A guest narrowed their window before the lock was granted;
+            # the other three bookings now fit on the day
+            Booking.objects.filter(pk=self.booking.pk).update(
+                booking_earliest="1300", booking_latest="1400"
+            )
+
+        with mock.patch.object(
+            scheduling, "_lock_day", side_effect=edited_while_waiting
+        ):
+            self.run_action(
+                "reschedule_selected", reschedule_date=new_date.isoformat()
+            )
+        self.assertEqual(
+            Booking.objects.filter(booking_date=new_date).count(), 4
+        )
+
+    def test_reschedule_selected_rejects_past_dates(self):
+        past = date.today() - timedelta(days=1)
+        self.run_action("reschedule_selected", reschedule_date=past.isoformat())
+        self.assertFalse(Booking.objects.filter(booking_date=past).exists())
+
+    def test_cancel_selected_keeps_clients(self):
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.run_action("cancel_selected")
+        # One DELETE for the services, one for the bookings
+        self.assertEqual(len(self.booking_writes(queries)), 2)
+        self.assertFalse(Booking.objects.exists())
+        self.assertFalse(Booking.services.through.objects.exists())
+        self.assertEqual(ClientList.objects.count(), 4)
+
+    def test_export_csv_streams_selected_bookings(self):
+        response = self.run_action("export_csv")
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[0], "first_name")
+        self.assertEqual(len(lines), 5)
+        self.assertIn("jane@example.com", "".join(lines))
+        self.assertTrue(all(line.endswith("cleaning") for line in lines[1:]))
+
+
+class QueryBudgetTests(BookingTestMixin, TestCase):
+    """Requests over their query budget fail in tests, log in production."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    @override_settings(QUERY_BUDGET=2)
+    def test_over_budget_request_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse("booking_info"))
+
+    @override_settings(QUERY_BUDGET=2, QUERY_BUDGET_RAISE=False)
+    def test_over_budget_request_is_logged(self):
+        with self.assertLogs("core.middleware", "WARNING") as logs:
+            response = self.client.get(reverse("booking_info"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("over its budget of 2", logs.output[0])
+
+    def test_within_budget_request_passes(self):
+        response = self.client.get(reverse("booking_info"))
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(PERF_INSTRUMENTATION=True)
+class PerformanceMiddlewareTests(BookingTestMixin, TestCase):
+    """Staff get a Server-Timing breakdown; slow requests are logged."""
+
+    def test_staff_get_server_timing_header(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("services"))
+        timing = response["Server-Timing"]
+        for metric in ("db;dur=", "tpl;dur=", "cache;dur=", "total;dur="):
+            self.assertIn(metric, timing)
+        self.assertIn('desc="services"', timing)
+        self.assertRegex(timing, r'tpl;dur=[\d.]+;desc="templates"')
+        self.assertRegex(
+            timing, r'cache;dur=[\d.]+;desc="\d+ hits, \d+ misses"'
+        )
+        # The service cards are rendered and cached on the first visit
+        self.assertNotIn(" 0 misses", timing)
+
+        # ...and read back from the cache on the next one
+        timing = self.client.get(reverse("services"))["Server-Timing"]
+        self.assertIn(" 0 misses", timing)
+
+    def test_other_visitors_get_no_header(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("services"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(PERF_INSTRUMENTATION=False)
+    def test_off_unless_enabled(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("services"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(PERF_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_their_slowest_queries(self):
+        self.client.force_login(self.user)
+        with self.assertLogs("core.middleware", "WARNING") as logs:
+            self.client.get(reverse("booking_info"))
+        self.assertIn("Slow request GET", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+
+class BenchmarkRoutesTests(TestCase):
+    """The route benchmark runs, saves a baseline and flags regressions."""
+
+    options = {"clients": 20, "services": 3, "requests": 5, "warmup": 1,
+               "route": ["services", "booking_info", "contact"]}
+
+    def setUp(self):
+        cache.clear()
+        self.baseline = Path(tempfile.mkdtemp()) / "routes.json"
+
+    def run_benchmark(self, **options):
+        call_command(
+            "benchmark_routes", baseline=self.baseline, stdout=StringIO(),
+            **self.options, **options
+        )
+
+    def test_baseline_round_trip(self):
+        self.run_benchmark(save_baseline=True)
+        saved = json.loads(self.baseline.read_text())
+        self.assertEqual(set(saved["routes"]), set(self.options["route"]))
+        self.assertEqual(saved["routes"]["booking_info"]["queries"], 2)
+        # Seeded rows are rolled back
+        self.assertFalse(Service.objects.exists())
+
+        # Latency is too noisy to compare at this size; queries are not
+        self.run_benchmark(tolerance=1000)
+
+    def test_extra_queries_fail_the_run(self):
+        self.run_benchmark(save_baseline=True)
+        saved = json.loads(self.baseline.read_text())
+        saved["routes"]["booking_info"]["queries"] = 0
+        self.baseline.write_text(json.dumps(saved))
+        with self.assertRaisesMessage(CommandError, "booking_info: 2 queries"):
+            self.run_benchmark(tolerance=1000)
+
+
+class FlashMessageTests(BookingTestMixin, TestCase):
+    """Booking outcomes reach the next page without a session."""
+
+    def test_guest_edit_shows_outcome_without_session_row(self):
+        response = self.client.post(reverse("edit_booking"), {
+            "access_token": self.booking.access_token,
+            "booking_date": (date.today() + timedelta(days=8)).isoformat(),
+            "earliest_availability_hour": "10",
+            "earliest_availability_min": "00",
+            "latest_availability_hour": "11",
+            "latest_availability_min": "30",
+        })
+        self.assertIn(flash.FLASH_COOKIE_NAME, response.cookies)
+        self.assertNotIn(
+            self.booking.access_token,
+            response.cookies[flash.FLASH_COOKIE_NAME].value,
+        )
+        self.assertFalse(Session.objects.exists())
+
+        response = self.client.get(reverse("booking_info"))
+        self.assertEqual(response.context["booking"], self.booking)
+        self.assertContains(response, "Booking updated successfully!")
+        # The token is not known here; further changes ask for it
+        self.assertContains(response, 'id="edit_access_token"')
+        # Shown once: the cookie is cleared
+        self.assertEqual(response.cookies[flash.FLASH_COOKIE_NAME].value, "")
+
+    def test_tampered_cookie_is_ignored(self):
+        self.client.cookies[flash.FLASH_COOKIE_NAME] = (
+            '{"booking_view_grant":"%s"}' % self.booking.pk
+        )
+        response = self.client.get(reverse("booking_info"))
+        self.assertNotIn("booking", response.context)
+
+    def test_anonymous_sessions_are_not_saved_when_disabled(self):
+        session = sessions.SessionStore()
+        session["cart"] = "something"
+        self.assertTrue(session.is_empty())
+        session[SESSION_KEY] = str(self.user.pk)
+        self.assertFalse(session.is_empty())
+
+
+class AsyncViewTests(BookingTestMixin, TestCase):
+    """Under ASGI the booking, contact and autocomplete views run async."""
+
+    def setUp(self):
+        super().setUp()
+        with self.settings(ASYNC_VIEWS=True):
+            self.reload_urls()
+        self.addCleanup(self.reload_urls)
+
+    @staticmethod
+    def reload_urls():
+        importlib.reload(core_urls)
+        importlib.reload(core_admin_urls)
+        importlib.reload(config_urls)
+        clear_url_caches()
+
+    async def test_guest_edit_then_view(self):
+        response = await self.async_client.post(reverse("edit_booking"), {
+            "access_token": self.booking.access_token,
+            "booking_date": (date.today() + timedelta(days=8)).isoformat(),
+            "earliest_availability_hour": "10",
+            "earliest_availability_min": "00",
+            "latest_availability_hour": "11",
+            "latest_availability_min": "30",
+        })
+        self.assertTrue(iscoroutinefunction(response.resolver_match.func))
+        self.assertRedirects(
+            response, reverse("booking_info"), fetch_redirect_response=False
+        )
+
+        # The flash cookie carries the outcome and a view grant
+        self.async_client.cookies = response.cookies
+        response = await self.async_client.get(reverse("booking_info"))
+        self.assertEqual(response.context["booking"], self.booking)
+        self.assertContains(response, "Booking updated successfully!")
+        await self.booking.arefresh_from_db()
+        self.assertEqual(self.booking.booking_earliest, "1000")
+
+    async def test_book_service_as_user(self):
+        await self.booking.adelete()
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(reverse("book_service"), {
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "email_address": "jane@example.com",
+            "phone_number": "01234 567890",
+            "services": self.service.pk,
+            "booking_date": (date.today() + timedelta(days=9)).isoformat(),
+            "earliest_availability_hour": "09",
+            "earliest_availability_min": "00",
+            "latest_availability_hour": "10",
+            "latest_availability_min": "00",
+        })
+        self.assertTemplateUsed(response, "core/booking_success.html")
+        booking = await Booking.objects.select_related("client").aget()
+        self.assertEqual(booking.client.user_id, self.user.pk)
+
+    async def test_book_service_with_a_cold_catalog(self):
+        # First request after start, or after a Service save: no snapshot
+        # in this process or the shared cache, so parsing queries Service
+        cache.clear()
+        catalog._local.update(version=None, snapshot=None)
+        response = await self.async_client.post(reverse("book_service"), {
+            "first_name": "Guest",
+            "last_name": "Booker",
+            "email_address": "guest@example.com",
+            "phone_number": "01234 000000",
+            "services": self.service.pk,
+            "booking_date": (date.today() + timedelta(days=9)).isoformat(),
+            "earliest_availability_hour": "09",
+            "earliest_availability_min": "00",
+            "latest_availability_hour": "10",
+            "latest_availability_min": "00",
+        })
+        self.assertTemplateUsed(response, "core/booking_success.html")
+        booking = await Booking.objects.prefetch_related("services").aget(
+            client__email="guest@example.com"
+        )
+        self.assertEqual(
+            [service async for service in booking.services.all()],
+            [self.service],
+        )
+
+    async def test_contact_is_saved(self):
+        response = await self.async_client.post(reverse("contact"), {
+            "name": "Visitor",
+            "email": "visitor@example.com",
+            "message": "Hello there",
+        })
+        self.assertTrue(response.json()["success"])
+        self.assertTrue(await Contact.objects.filter(name="Visitor").aexists())
+
+    @override_settings(PERF_INSTRUMENTATION=True)
+    async def test_autocomplete_queries_are_counted(self):
+        self.user.is_staff = True
+        await self.user.asave()
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse("service-autocomplete"), {"q": "clean"}
+        )
+        results = response.json()["results"]
+        self.assertEqual(results[0]["id"], str(self.service.pk))
+        # Queries run in worker threads still reach the middleware
+        self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"')
+
+
+class RateLimitTests(BookingTestMixin, TestCase):
+    """Guest POST floods get 429 before any query runs."""
+
+    def guess(self, key="not-a-token", ip="203.0.113.7"):
+        return self.client.post(
+            reverse("booking_info"), {"access_key": key}, REMOTE_ADDR=ip
+        )
+
+    @override_settings(RATELIMITS={"access_key": {"ip": (3, 60)}})
+    def test_access_key_guesses_are_limited_per_ip(self):
+        for _ in range(3):
+            self.assertEqual(self.guess().status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.guess()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        # Other addresses are unaffected
+        self.assertEqual(self.guess(ip="203.0.113.8").status_code, 200)
+
+    @override_settings(
+        RATELIMITS={"access_key": {"ip": (1, 60)}}, RATELIMIT_PROXY_COUNT=1
+    )
+    def test_clients_behind_the_router_are_told_apart(self):
+        def guess(forwarded_for):
+            return self.client.post(
+                reverse("booking_info"), {"access_key": "not-a-token"},
+                REMOTE_ADDR="10.1.2.3", HTTP_X_FORWARDED_FOR=forwarded_for,
+            )
+
+        self.assertEqual(guess("203.0.113.7").status_code, 200)
+        self.assertEqual(guess("203.0.113.8").status_code, 200)
+        # Entries left of the router's own can be forged by the client
+        self.assertEqual(guess("198.51.100.1, 203.0.113.7").status_code, 429)
+
+    @override_settings(RATELIMITS={"access_key": {"token": (2, 60)}})
+    def test_token_prefix_is_limited_across_addresses(self):
+        for i in range(2):
+            self.guess(key="abcdefgh-guess", ip=f"203.0.113.{i}")
+        response = self.guess(key="abcdefgh-other", ip="198.51.100.1")
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(
+        RATELIMITS={"contact": {"ip": (1, 60)}},
+        RATELIMIT_BACKEND="core.ratelimit.LocalRateLimitBackend",
+    )
+    def test_contact_limit_answers_json(self):
+        data = {"name": "Visitor", "email": "visitor@example.com",
+                "message": "Hello there"}
+        self.client.post(reverse("contact"), data)
+        response = self.client.post(reverse("contact"), data)
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(response.json()["success"])
+
+    def test_sliding_window_counts_part_of_previous_window(self):
+        # 10 requests last window, a quarter of this one gone: 7.5 + 2
+        self.assertEqual(ratelimit._estimate(2, 10, 0.25), 9.5)
+        # Limit 10 with 9.5 counted: the next request fits after the
+        # previous window has slid out by another 0.05 of a window
+        self.assertEqual(ratelimit._retry_after(10, 100, 2, 10, 0.25), 5)
+
+
+class AssetBuildTests(TestCase):
+    """Tests for the self-hosted asset build (core/assets.py)."""
+
+    def test_page_bundles_are_built(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            call_command(
+                "build_assets", "--no-vendor", "--output", out_dir,
+                stdout=StringIO(),
+            )
+            for name in assets.BUNDLES:
+                bundle = (Path(out_dir) / "js" / name).read_text()
+                self.assertIn("function", bundle)
+
+    def test_icon_css_keeps_used_icons_only(self):
+        css = (
+            '.fa-3x {\n  font-size: 3em; }\n\n'
+            '.fa-home::before {\n  content: "\\f015"; }\n\n'
+            '.fa-anchor::before {\n  content: "\\f13d"; }\n\n'
+        )
+        with tempfile.TemporaryDirectory() as template_dir:
+            Path(template_dir, "page.html").write_text(
+                '<i class="fas fa-home fa-3x"></i>'
+            )
+            icons = assets.used_icons([template_dir])
+        self.assertEqual(icons, {"home"})
+        subset, codepoints = assets.subset_icon_css(css, icons)
+        self.assertIn(".fa-home::before", subset)
+        self.assertIn(".fa-3x", subset)
+        self.assertNotIn("fa-anchor", subset)
+        self.assertEqual(codepoints, {0xf015})
+
+    def test_critical_rules_follow_above_the_fold_markup(self):
+        rules = assets.parse_css(
+            ".hero{color:red}.footer{color:blue}"
+            "@media (min-width:768px){.hero .btn:hover{margin:0}}"
+            "[data-bs-theme=dark]{color:black}"
+        )[0]
+        markup = ({"div"}, {"hero", "btn"}, set(), {"class"})
+        self.assertEqual(
+            assets.critical_rules(rules, markup),
+            ".hero{color:red}"
+            "@media (min-width:768px){.hero .btn:hover{margin:0}}",
+        )
+
+    def test_page_styles_inline_critical_css_when_built(self):
+        with tempfile.TemporaryDirectory() as static_root:
+            with self.settings(STATIC_ROOT=static_root):
+                critical_css.cache_clear()
+                # Not built: the stylesheets block rendering as before
+                response = self.client.get(reverse("home"))
+                self.assertNotContains(response, "<style>")
+                self.assertNotContains(response, 'media="print"')
+
+                for name in assets.STYLESHEETS + ["dist/critical/index.css"]:
+                    path = Path(static_root, name)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_text(".hero{color:red}")
+                critical_css.cache_clear()
+                collected.cache_clear()
+                response = self.client.get(reverse("home"))
+            critical_css.cache_clear()
+            collected.cache_clear()
+        self.assertContains(response, "<style>.hero{color:red}</style>")
+        self.assertContains(response, 'media="print"', count=3)
+
+    def test_pages_fall_back_until_assets_are_built(self):
+        with tempfile.TemporaryDirectory() as static_root:
+            with self.settings(STATIC_ROOT=static_root):
+                collected.cache_clear()
+                response = self.client.get(reverse("bookings"))
+            collected.cache_clear()
+        self.assertContains(
+            response, "https://cdn.jsdelivr.net/npm/bootstrap@5.3.7/"
+        )
+        self.assertContains(response, 'integrity="sha384-', count=4)
+        self.assertContains(response, 'src="/static/js/booking-utils.js"')
+        self.assertContains(response, 'src="/static/js/bookings.js"')
+        self.assertNotContains(response, "/static/dist/")
+
+
+class WarmupTests(TestCase):
+    """Tests for the worker warm-up (core/warmup.py)."""
+
+    def test_warm_up_compiles_templates_into_the_cached_loader(self):
+        timings = warmup.warm_up_process()
+        self.assertEqual(
+            [name for name, _, _ in timings], ["imports", "urls", "templates"]
+        )
+        engine = engines["django"].engine
+        cached_loader = engine.template_loaders[0]
+        self.assertIn("base.html", cached_loader.get_template_cache)
+
+    def test_startup_report_sums_outermost_imports_per_package(self):
+        log = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   django.utils\n"
+            "import time:       200 |        300 | django\n"
+            "import time:        50 |         50 | allauth.account\n"
+            "import time:        25 |         25 | allauth\n"
+        )
+        self.assertEqual(
+            startup_report.Command().import_times(log),
+            {"django": 0.0003, "allauth": 0.000075},
+        )
+
+
+class AppProfileTests(TestCase):
+    """Public and admin workers only route their own part of the site."""
+
+    def setUp(self):
+        self.addCleanup(self.reload_urls)
+
+    @staticmethod
+    def reload_urls():
+        importlib.reload(config_urls)
+        clear_url_caches()
+
+    def test_public_profile_does_not_route_the_admin(self):
+        with self.settings(SERVE_ADMIN=False):
+            self.reload_urls()
+            self.assertEqual(reverse("services"), "/services/")
+            with self.assertRaises(NoReverseMatch):
+                reverse("admin:index")
+            with self.assertRaises(NoReverseMatch):
+                reverse("service-autocomplete")
+
+    def test_public_profile_pages_render_for_superusers(self):
+        # The navbar links superusers to the admin only where it is routed
+        superuser = User.objects.create_superuser(
+            "owner", "owner@example.com", "not-a-real-password"
+        )
+        self.client.force_login(superuser)
+        with self.settings(SERVE_ADMIN=False):
+            self.reload_urls()
+            for name in ("home", "services", "bookings"):
+                with self.subTest(name):
+                    response = self.client.get(reverse(name))
+                    self.assertEqual(response.status_code, 200)
+                    self.assertNotContains(response, "Admin Tools")
+
+        self.reload_urls()
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, 'href="/admin/"')
+
+    def test_admin_profile_does_not_route_the_public_pages(self):
+        with self.settings(SERVE_PUBLIC=False):
+            self.reload_urls()
+            self.assertEqual(reverse("admin:index"), "/admin/")
+            self.assertEqual(
+                reverse("service-autocomplete"), "/service-autocomplete/"
+            )
+            with self.assertRaises(NoReverseMatch):
+                reverse("home")
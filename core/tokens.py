@@ -0,0 +1,72 @@
+# ============================================================================
+# TOKENS MODULE - Guest access tokens and their stored digests
+# ============================================================================
+# Guests reach their booking with the access token shown once after booking
+# (and sent in their emailed link). Only a SHA-256 digest of the token is
+# stored, in a fixed-width indexed column, so a copy of the database does
+# not hand out access to every booking. Tokens carry 192 random bits, so a
+# plain, unsalted hash cannot be reversed by guessing.
+#
+# After a guest changes their booking, the page they are redirected to
+# must show it again without the token travelling in a cookie. The view
+# flashes a view grant instead: the booking's primary key, timestamped and
+# signed, accepted for VIEW_GRANT_MAX_AGE seconds.
+
+import hashlib
+import secrets
+
+from django.core import signing
+
+VIEW_GRANT_SALT = "core.tokens.view_grant"
+
+# Seconds a view grant is accepted after it was issued
+VIEW_GRANT_MAX_AGE = 300
+
+
+def generate_access_token():
+    """Return a new URL-safe guest access token."""
+    return secrets.token_urlsafe(24)
+
+
+def hash_access_token(token):
+    """
+    Return the stored form of an access token.
+
+    Args:
+        token (str): Access token as given to the guest
+
+    Returns:
+        str: 64-character hexadecimal SHA-256 digest
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def make_view_grant(booking_pk):
+    """
+    Return a short-lived grant to view one booking.
+
+    Args:
+        booking_pk (int): Primary key of the booking
+
+    Returns:
+        str: Signed, timestamped booking pk
+    """
+    signer = signing.TimestampSigner(salt=VIEW_GRANT_SALT)
+    return signer.sign(str(booking_pk))
+
+
+def read_view_grant(grant):
+    """
+    Return the booking pk of a view grant.
+
+    Args:
+        grant (str): Value returned by make_view_grant()
+
+    Returns:
+        int | None: Booking pk, or None if the grant is forged or expired
+    """
+    signer = signing.TimestampSigner(salt=VIEW_GRANT_SALT)
+    try:
+        return int(signer.unsign(grant, max_age=VIEW_GRANT_MAX_AGE))
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
@@ -0,0 +1,172 @@
+# ============================================================================
+# TRANSFER MODULE - Row format shared by the bulk import and export commands
+# ============================================================================
+# import_bookings and export_bookings exchange one row per client, with the
+# client's booking (if any) in the same row. Rows are streamed one at a time
+# as CSV or JSON Lines, so files of any size use constant memory. The
+# bookings admin "Export selected as CSV" action writes the same rows.
+
+import csv
+import json
+import sys
+from collections import defaultdict
+
+# Columns of every row, in file order
+COLUMNS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "is_client",
+    "linked_services",
+    "booking_date",
+    "booking_earliest",
+    "booking_latest",
+    "is_confirmed",
+    "services",
+)
+
+FORMATS = ("csv", "jsonl")
+
+# Separator between service slugs in a CSV cell
+SLUG_SEPARATOR = "|"
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+# Client and booking columns fetched per row, in COLUMNS naming
+CLIENT_FIELDS = ("first_name", "last_name", "email", "phone_number",
+                 "is_client")
+BOOKING_FIELDS = ("booking_date", "booking_earliest", "booking_latest",
+                  "is_confirmed")
+
+
+def guess_format(path):
+    """
+    Pick a file format from a path's extension.
+
+    Args:
+        path (str): File path, or "-" for standard input/output
+
+    Returns:
+        str: "jsonl" for .jsonl/.ndjson files, otherwise "csv"
+    """
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def open_stream(path, mode):
+    """
+    Open a file for streaming, treating "-" as stdin or stdout.
+
+    Args:
+        path (str): File path or "-"
+        mode (str): "r" or "w"
+
+    Returns:
+        file: Text stream (the caller closes files it opened)
+    """
+    if path == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def parse_bool(value):
+    """Interpret a CSV or JSON value as a boolean."""
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+
+def parse_slugs(value):
+    """
+    Interpret a CSV cell or JSON value as a list of service slugs.
+
+    Args:
+        value (str | list | None): "a|b" in CSV, ["a", "b"] in JSON
+
+    Returns:
+        list: Non-empty slugs
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(SLUG_SEPARATOR)
+    return [slug.strip() for slug in value if slug and slug.strip()]
+
+
+def read_rows(stream, fmt):
+    """
+    Yield rows from a CSV or JSON Lines stream one at a time.
+
+    Args:
+        stream (file): Text stream to read
+        fmt (str): "csv" or "jsonl"
+
+    Yields:
+        tuple: (line number, row dict)
+    """
+    if fmt == "jsonl":
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield line_number, json.loads(line)
+    else:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def slugs_by_owner(through, owner_field, pks):
+    """
+    Map owner pks to their service slugs with one through-table query.
+
+    Args:
+        through (Model): Many-to-many through model
+        owner_field (str): Through-table column pointing at the owner
+        pks (list): Owner primary keys
+
+    Returns:
+        defaultdict: Owner pk to list of slugs, sorted by slug
+    """
+    slugs = defaultdict(list)
+    rows = (
+        through.objects.filter(**{f"{owner_field}__in": pks})
+        .order_by(owner_field, "service__slug")
+        .values_list(owner_field, "service__slug")
+    )
+    for owner, slug in rows:
+        slugs[owner].append(slug)
+    return slugs
+
+
+class RowWriter:
+    """
+    Write rows as CSV or JSON Lines.
+
+    CSV rows get a header line first; list values are joined with
+    SLUG_SEPARATOR and booleans written as "true"/"false".
+    """
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            self.writer = csv.writer(stream)
+            self.writer.writerow(COLUMNS)
+
+    def write(self, row):
+        """Write one row given as a dict keyed by COLUMNS."""
+        if self.fmt == "jsonl":
+            ordered = {column: row[column] for column in COLUMNS}
+            self.stream.write(json.dumps(ordered, separators=(",", ":")))
+            self.stream.write("\n")
+            return
+        self.writer.writerow([self._cell(row[column]) for column in COLUMNS])
+
+    @staticmethod
+    def _cell(value):
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (list, tuple)):
+            return SLUG_SEPARATOR.join(value)
+        return "" if value is None else value
@@ -1,35 +1,35 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Views with an async twin are routed to it when running under ASGI
+booking_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     path("", views.index, name="home"),
-    path(
-        "service-autocomplete/",
-        views.ServiceAutocomplete.as_view(),
-        name="service-autocomplete",
-    ),
-    path(
-        "user-autocomplete/",
-        views.UserAutocomplete.as_view(),
-        name="user-autocomplete",
-    ),
-    path(
-        "client-autocomplete/",
-        views.ClientAutocomplete.as_view(),
-        name="client-autocomplete",
-    ),
     path("services/", views.ServiceList.as_view(), name="services"),
+    path("services/feed.json", views.service_feed, name="service_feed"),
     path("services/<slug:slug>/", views.service_detail, name="service_detail"),
     path("bookings/", views.booking_page_no_service, name="bookings"),
-    path("bookings/info/", views.booking_info, name="booking_info"),
-    path("bookings/edit/", views.edit_booking, name="edit_booking"),
+    path("bookings/info/", booking_views.booking_info, name="booking_info"),
+    path("bookings/edit/", booking_views.edit_booking, name="edit_booking"),
     path("bookings/cancel/", views.cancel_booking, name="cancel_booking"),
-    path("bookings/book-service/", views.book_service, name="book_service"),
+    path("bookings/book-service/", booking_views.book_service, name="book_service"),
     path(
         "bookings/<slug:slug>/",
         views.booking_page,
         name="bookings_with_service"
     ),
-    path("contact/", views.contact_view, name="contact"),
+    path("contact/", booking_views.contact_view, name="contact"),
+    path(
+        "api/v1/services/",
+        views.api_service_list,
+        name="api_service_list",
+    ),
+    path(
+        "api/v1/services/<slug:slug>/",
+        views.api_service_detail,
+        name="api_service_detail",
+    ),
     path("error/<str:error_code>/", views.test_error_view, name="test_error"),
 ]
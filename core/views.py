@@ -1,241 +1,157 @@
-from django.shortcuts import render, get_object_or_404, redirect
-from dal_select2.views import Select2QuerySetView
-from django.utils.text import slugify
+from django.shortcuts import render, redirect
 from django.db import transaction
-from django.db.models import Q
+from django.utils.decorators import method_decorator
 from django.views import generic
-from datetime import date, time
-from django.http import JsonResponse
-from django.contrib import messages
+from django.views.decorators.cache import cache_control
+from datetime import date
+from django.http import (
+    Http404, HttpResponse, JsonResponse, StreamingHttpResponse,
+)
+from django.urls import reverse
 from django.conf import settings
-from .models import User, Service, ClientList, Booking, Contact
+from .models import ClientList, Booking
 from .forms import ContactForm
+from . import api, catalog, scheduling, spool
+from .conditional import catalog_condition, catalog_feed_condition
+from .pagination import InvalidCursor, paginate_keyset
+from .ratelimit import rate_limit
+from .resolvers import (
+    get_booking_by_grant, get_booking_by_token, get_request_booking,
+    get_request_owned_booking,
+)
+from .tokens import make_view_grant
 
 
 # ============================================================================
-# AUTOCOMPLETE VIEWS - Used in admin interface for dynamic form fields
+# PUBLIC FACING VIEWS - Main application functionality
 # ============================================================================
 
-class GenericAutocomplete(Select2QuerySetView):
-    """
-    Base autocomplete view providing search functionality for any model.
-
-    This class serves as a foundation for all autocomplete views in the admin.
-    It provides secure, authenticated search functionality that can be extended
-    by subclasses for specific models.
-
-    Attributes:
-        search_fields (list): List of model fields to search against.
-                             Must be overridden in subclasses.
-
-    Security:
-        - Only authenticated users can access autocomplete functionality
-        - Returns empty queryset for unauthenticated requests
+@catalog_condition
+def index(request):
     """
+    Render the homepage/landing page.
 
-    search_fields = []  # Override this in subclasses
-
-    def get_queryset(self):
-        """
-        Return filtered queryset for authenticated users only.
+    Simple view that displays the main index template. This is typically
+    the first page visitors see when they access the website. Repeat
+    visits are answered with 304 Not Modified (see core/conditional.py).
 
-        Performs case-insensitive search across all defined search_fields
-        using the search term (self.q) provided by the Select2 widget.
+    Args:
+        request: HTTP request object
 
-        Returns:
-            QuerySet: Filtered results matching search criteria, or empty
-                     queryset if user is not authenticated.
-        """
-        if not self.request.user.is_authenticated:
-            return self.model.objects.none()
+    Returns:
+        HttpResponse: Rendered index.html template
 
-        qs = self.model.objects.all()
-        if self.q and self.search_fields:
-            # Build Q objects for multiple field search
-            query = Q()
-            for field in self.search_fields:
-                query |= Q(**{f"{field}__icontains": self.q})
-            qs = qs.filter(query)
-        return qs
+    Template: core/index.html
+    """
+    return render(request, "core/index.html")
 
 
-class CreatableAutocomplete(GenericAutocomplete):
+@method_decorator(catalog_condition, name="dispatch")
+class ServiceList(generic.ListView):
     """
-    Extended autocomplete view with object creation functionality.
+    Display paginated list of available services.
 
-    Inherits search functionality from GenericAutocomplete and adds the ability
-    to create new objects directly from the autocomplete interface. This is
-    useful for admin forms where users need to quickly add new entries.
+    Generic ListView that shows all available services (available=1) with
+    cursor pagination. Used for the main services catalog page where
+    visitors can browse all offered services. Services are read from the
+    cached catalog and pages are found by binary search on the service name,
+    so no page needs a COUNT(*) or an OFFSET. Repeat visits are answered
+    with 304 Not Modified.
 
     Attributes:
-        create_field (str): Field name to use when creating new objects.
-                           Must be overridden in subclasses if using default
-                           create_object method.
-    """
+        template_name: Template to render the service list
+        context_object_name: Name of the service list in the context
+        paginate_by: Number of services per page for pagination
 
-    create_field = None  # Override this in subclasses
+    Template: core/services.html
+    Context: 'object_list' or 'service_list' containing Service objects,
+             'page_obj' with next_cursor/previous_cursor
+    """
+    template_name = "core/services.html"
+    context_object_name = "service_list"
+    paginate_by = 6
 
-    def get_create_option(self, context, q):
+    def get_queryset(self):
         """
-        Add create option for new entries in the autocomplete dropdown.
-
-        Args:
-            context: Template context (unused in this implementation)
-            q (str): Search query string
+        Return the available services from the cached catalog.
 
         Returns:
-            list: List containing create option dict, or empty list if no query
+            tuple: Available Service instances in catalog order
         """
-        if not q:
-            return []
-
-        return [
-            {
-                "id": q,
-                "text": f'Create "{q}"',
-                "create_id": True,
-            }
-        ]
+        return catalog.available_services()
 
-    def create_object(self, text):
+    def paginate_queryset(self, queryset, page_size):
         """
-        Create new model instance from autocomplete input.
-
-        Default implementation creates object using the create_field attribute.
-        Override this method in subclasses for custom object creation logic.
-
-        Args:
-            text (str): The text entered by user to create new object
-
-        Returns:
-            Model instance: Newly created object
+        Return the page named by the ?cursor= parameter.
 
         Raises:
-            NotImplementedError: If create_field is not set and method not
-                               overridden
-        """
-        if self.create_field:
-            return self.model.objects.create(**{self.create_field: text})
-        raise NotImplementedError(
-            "Subclasses must implement create_object method"
-        )
-
-
-# ============================================================================
-# SPECIFIC AUTOCOMPLETE IMPLEMENTATIONS
-# ============================================================================
-
-class ServiceAutocomplete(CreatableAutocomplete):
-    """
-    Service autocomplete with create functionality for admin interface.
-
-    Allows administrators to search existing services or create new ones
-    directly from form fields. When creating new services, automatically
-    generates slug, description, and excerpt fields.
-
-    Used in: Admin forms that reference Service model
-    """
-
-    model = Service
-    search_fields = ["service_name"]
-    create_field = "service_name"
-
-    def create_object(self, text):
+            Http404: If the cursor is malformed
         """
-        Create a new Service with auto-generated fields.
-
-        Args:
-            text (str): Service name entered by user
-
-        Returns:
-            Service: Newly created service instance with generated fields
-        """
-        return Service.objects.create(
-            service_name=text,
-            slug=slugify(text),
-            description=f"Service: {text}",
-            excerpt=f"New service: {text}",
-        )
-
-
-class UserAutocomplete(GenericAutocomplete):
-    """
-    User autocomplete for admin interface - search only, no creation.
-
-    Provides search functionality across user fields for forms that need
-    to reference User objects. Creation disabled as users should be created
-    through proper user management flows.
-
-    Used in: Admin forms that reference User model
-    """
-
-    model = User
-    search_fields = ["username", "first_name", "last_name", "email"]
-
-
-class ClientAutocomplete(GenericAutocomplete):
-    """
-    Client autocomplete for admin interface - search only, no creation.
+        try:
+            page = paginate_keyset(
+                queryset, self.request.GET.get("cursor"), page_size,
+                key=catalog.service_sort_key,
+            )
+        except InvalidCursor:
+            raise Http404("Invalid page.")
+        return (None, page, page.object_list, page.has_other_pages())
 
-    Allows searching existing clients by name and email for admin forms.
-    Creation disabled to maintain data integrity and proper client onboarding.
 
-    Used in: Admin forms that reference ClientList model
+@catalog_feed_condition
+def service_feed(request):
     """
+    Return one page of service cards as JSON, for infinite scroll.
 
-    model = ClientList
-    search_fields = ["first_name", "last_name", "email"]
-
-
-# ============================================================================
-# PUBLIC FACING VIEWS - Main application functionality
-# ============================================================================
-
-def index(request):
-    """
-    Render the homepage/landing page.
-
-    Simple view that displays the main index template. This is typically
-    the first page visitors see when they access the website.
+    Pages through the catalog with the same cursors as ServiceList and
+    returns only the fields a service card needs.
 
     Args:
-        request: HTTP request object
+        request: HTTP request object, with an optional ?cursor= parameter
 
     Returns:
-        HttpResponse: Rendered index.html template
-
-    Template: core/index.html
+        JsonResponse: {"results": [...], "next": url, "previous": url},
+        or a 400 response for a malformed cursor
     """
-    return render(request, "core/index.html")
-
-
-class ServiceList(generic.ListView):
-    """
-    Display paginated list of available services.
-
-    Generic ListView that shows all available services (available=1) with
-    pagination support. Used for the main services catalog page where
-    visitors can browse all offered services.
+    try:
+        page = paginate_keyset(
+            catalog.available_services(), request.GET.get("cursor"),
+            ServiceList.paginate_by, key=catalog.service_sort_key,
+        )
+    except InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    Attributes:
-        queryset: Filtered to show only available services
-        template_name: Template to render the service list
-        paginate_by: Number of services per page for pagination
+    def page_url(cursor):
+        if cursor is None:
+            return None
+        return f"{reverse('service_feed')}?cursor={cursor}"
 
-    Template: core/services.html
-    Context: 'object_list' or 'service_list' containing Service objects
-    """
-    queryset = Service.objects.filter(available=1)
-    template_name = "core/services.html"
-    paginate_by = 6
+    return JsonResponse({
+        "results": [
+            {
+                "service_name": service.service_name,
+                "slug": service.slug,
+                "excerpt": service.excerpt,
+                "url": reverse("service_detail", args=[service.slug]),
+                "booking_url": reverse(
+                    "bookings_with_service", args=[service.slug]
+                ),
+                "image": service.image_variants.get("card"),
+            }
+            for service in page
+        ],
+        "next": page_url(page.next_cursor),
+        "previous": page_url(page.previous_cursor),
+    })
 
 
+@catalog_condition
 def service_detail(request, slug):
     """
     Display detailed view of a specific service.
 
     Shows complete information about a single service including description,
     images, and booking options. Only displays services marked as available.
+    Repeat visits are answered with 304 Not Modified.
 
     Args:
         request: HTTP request object
@@ -254,8 +170,7 @@ def service_detail(request, slug):
     **Template**
     :template:`core/service_detail.html`
     """
-    queryset = Service.objects.filter(available=1)
-    service = get_object_or_404(queryset, slug=slug)
+    service = catalog.get_available_service(slug)
 
     return render(
         request,
@@ -290,31 +205,15 @@ def booking_page(request, slug):
         - selected_service: The pre-selected service object
         - slug: Service slug for URL tracking
     """
-    queryset = Service.objects.filter(available=1)
-    selected_service = get_object_or_404(queryset, slug=slug)
+    selected_service = catalog.get_available_service(slug)
+    
+    # Authenticated users with an existing booking (linked to their account
+    # or matched by email) are sent to their booking info instead
+    if get_request_booking(request):
+        return redirect('booking_info')
     
-    # Check if authenticated user already has a booking
-    if request.user.is_authenticated:
-        try:
-            client = ClientList.objects.get(user=request.user)
-            Booking.objects.get(client=client)
-            # User has existing booking, redirect to booking info
-            return redirect('booking_info')
-        except (ClientList.DoesNotExist, Booking.DoesNotExist):
-            # No direct user association, try to find booking by email match
-            try:
-                client = ClientList.objects.get(email=request.user.email)
-                Booking.objects.get(client=client)
-                # User has existing booking by email, redirect to booking info
-                return redirect('booking_info')
-            except (ClientList.DoesNotExist, Booking.DoesNotExist):
-                # User has no booking, continue to show booking form
-                pass
-    
-    all_services = queryset.all()
-
     context = {
-        "service_list": all_services,
+        "service_list": catalog.available_services(),
         "selected_service": selected_service,
         "slug": slug,
     }
@@ -349,37 +248,20 @@ def booking_page_no_service(request):
     Context:
         - service_list: All available services for the dropdown
         - selected_service: None (no pre-selection)
-        - booking_success: Success message from session (if any)
-        - booking_error: Error message from session (if any)
+        - booking_success: Success message from the flash cookie (if any)
+        - booking_error: Error message from the flash cookie (if any)
     """
-    # Check for session messages from booking operations
-    booking_success = request.session.pop('booking_success', None)
-    booking_error = request.session.pop('booking_error', None)
+    # Check for flash messages from booking operations
+    booking_success = request.flash.pop('booking_success', None)
+    booking_error = request.flash.pop('booking_error', None)
+    
+    # Authenticated users with an existing booking are sent to their
+    # booking info; booking_info handles linking bookings matched by email
+    if get_request_booking(request):
+        return redirect('booking_info')
     
-    # Check if authenticated user already has a booking
-    if request.user.is_authenticated:
-        try:
-            client = ClientList.objects.get(user=request.user)
-            Booking.objects.get(client=client)
-            # User has existing booking, redirect to booking info
-            return redirect('booking_info')
-        except (ClientList.DoesNotExist, Booking.DoesNotExist):
-            # No direct user association, try to find booking by email match
-            try:
-                client = ClientList.objects.get(email=request.user.email)
-                Booking.objects.get(client=client)
-                # User has existing booking by email, redirect to booking info
-                # The booking_info view will handle the account linking
-                return redirect('booking_info')
-            except (ClientList.DoesNotExist, Booking.DoesNotExist):
-                # User has no booking, continue to show booking form
-                pass
-    
-    queryset = Service.objects.filter(available=1)
-    all_services = queryset.all()
-
     context = {
-        "service_list": all_services,
+        "service_list": catalog.available_services(),
         "selected_service": None,
     }
     
@@ -391,7 +273,7 @@ def booking_page_no_service(request):
             "email": request.user.email,
         }
     
-    # Add session messages if they exist
+    # Add flash messages if they exist
     if booking_success:
         context["booking_success"] = booking_success
     if booking_error:
@@ -400,85 +282,163 @@ def booking_page_no_service(request):
     return render(request, "core/bookings.html", context)
 
 
-def book_service(request):
-    if request.method == "POST":
-        # Get form data - field names match JavaScript form
-        first_name = request.POST.get("first_name")
-        last_name = request.POST.get("last_name")
-        email = request.POST.get("email_address")
-        phone = request.POST.get("phone_number")
-
-        service = request.POST.get("services")
-        booking_date_str = request.POST.get("booking_date")
-        earliest_h = request.POST.get("earliest_availability_hour")
-        earliest_m = request.POST.get("earliest_availability_min")
-        latest_h = request.POST.get("latest_availability_hour")
-        latest_m = request.POST.get("latest_availability_min")
-
-        # Validate all required fields are present
-        if not all([first_name, last_name, email, phone,
-                   booking_date_str, earliest_h, earliest_m,
-                   latest_h, latest_m]):
-            error_msg = "All fields are required. Please fill out the form."
-            return render(request, "core/booking_error.html", {
-                "error_message": error_msg
-            })
+def parse_booking_post(post):
+    """
+    Read and validate the booking form fields.
 
-        try:
-            # Parse and validate date
-            booking_date_obj = date.fromisoformat(booking_date_str)
+    Args:
+        post (QueryDict): request.POST of the booking form
+
+    Returns:
+        tuple: (fields, error_message); fields is None when invalid
+    """
+    # Get form data - field names match JavaScript form
+    first_name = post.get("first_name")
+    last_name = post.get("last_name")
+    email = post.get("email_address")
+    phone = post.get("phone_number")
+
+    service = post.get("services")
+    booking_date_str = post.get("booking_date")
+    earliest_h = post.get("earliest_availability_hour")
+    earliest_m = post.get("earliest_availability_min")
+    latest_h = post.get("latest_availability_hour")
+    latest_m = post.get("latest_availability_min")
+
+    # Validate all required fields are present
+    if not all([first_name, last_name, email, phone,
+               booking_date_str, earliest_h, earliest_m,
+               latest_h, latest_m]):
+        return None, "All fields are required. Please fill out the form."
+
+    try:
+        # Parse and validate date
+        booking_date_obj = date.fromisoformat(booking_date_str)
+
+        # Convert time to string format for CharField storage (HHMM)
+        earliest_time = f"{int(earliest_h):02d}{int(earliest_m):02d}"
+        latest_time = f"{int(latest_h):02d}{int(latest_m):02d}"
+
+    except (ValueError, TypeError) as e:
+        return None, f"Invalid date or time format: {e}"
+
+    # Refuse services that are unknown or no longer offered, rather than
+    # booking without one
+    service_obj = None
+    if service:
+        service_obj = catalog.get_available_service_by_id(service)
+        if service_obj is None:
+            return None, (
+                "The selected service is not available. "
+                "Please choose another service."
+            )
+
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "phone": phone,
+        "service": service_obj,
+        "booking_date": booking_date_obj,
+        "earliest": earliest_time,
+        "latest": latest_time,
+    }, None
+
+
+def save_booking(user, fields):
+    """
+    Create the client (if new) and their booking in one transaction.
+
+    Args:
+        user (User): The visitor, possibly anonymous
+        fields (dict): Validated fields from parse_booking_post()
+
+    Returns:
+        tuple: (booking, client)
+
+    Raises:
+        SlotUnavailable: If the window would overbook the day
+    """
+    with transaction.atomic():
+        # Prepare default values for client creation
+        client_defaults = {
+            "first_name": fields["first_name"],
+            "last_name": fields["last_name"],
+            "phone_number": fields["phone"],
+            "is_client": False,
+        }
 
-            # Convert time to string format for CharField storage (HHMM)
-            earliest_time = f"{int(earliest_h):02d}{int(earliest_m):02d}"
-            latest_time = f"{int(latest_h):02d}{int(latest_m):02d}"
+        # If user is authenticated, link to user account
+        if user.is_authenticated:
+            client_defaults["user"] = user
+
+        # Create or get client
+        client, created = ClientList.objects.get_or_create(
+            email=fields["email"],
+            defaults=client_defaults
+        )
 
-        except (ValueError, TypeError) as e:
+        # If client exists but user wasn't linked before, link now
+        if not created and user.is_authenticated and not client.user:
+            client.user = user
+            client.save()
+
+        # Refuse windows that would overbook the day; the day stays locked
+        # until the booking is committed
+        scheduling.reserve_capacity(
+            fields["booking_date"], fields["earliest"], fields["latest"]
+        )
+
+        # Create booking record
+        booking = Booking.objects.create(
+            client=client,
+            booking_date=fields["booking_date"],
+            booking_earliest=fields["earliest"],
+            booking_latest=fields["latest"],
+            is_confirmed=False
+        )
+
+        # Add service to booking if provided
+        if fields["service"]:
+            booking.services.add(fields["service"])
+
+    return booking, client
+
+
+def reschedule_booking(booking, booking_date, earliest, latest):
+    """
+    Move a booking to a new date and window, if the slot has room.
+
+    Args:
+        booking (Booking): Booking being edited
+        booking_date (date): New booking date
+        earliest (str): New earliest time as "HHMM"
+        latest (str): New latest time as "HHMM"
+
+    Raises:
+        ValueError: If the times are invalid
+        SlotUnavailable: If the window would overbook the day
+    """
+    with transaction.atomic():
+        scheduling.reserve_capacity(
+            booking_date, earliest, latest, exclude=booking.pk
+        )
+        booking.booking_date = booking_date
+        booking.booking_earliest = earliest
+        booking.booking_latest = latest
+        booking.save()
+
+
+def book_service(request):
+    if request.method == "POST":
+        fields, error_msg = parse_booking_post(request.POST)
+        if fields is None:
             return render(request, "core/booking_error.html", {
-                "error_message": f"Invalid date or time format: {e}"
+                "error_message": error_msg
             })
 
         try:
-            with transaction.atomic():
-                # Prepare default values for client creation
-                client_defaults = {
-                    "first_name": first_name,
-                    "last_name": last_name,
-                    "phone_number": phone,
-                    "is_client": False,
-                }
-
-                # If user is authenticated, link to user account
-                if request.user.is_authenticated:
-                    client_defaults["user"] = request.user
-
-                # Create or get client
-                client, created = ClientList.objects.get_or_create(
-                    email=email,
-                    defaults=client_defaults
-                )
-
-                # If client exists but user wasn't linked before, link now
-                if (not created and request.user.is_authenticated and
-                        not client.user):
-                    client.user = request.user
-                    client.save()
-
-                # Create booking record
-                booking = Booking.objects.create(
-                    client=client,
-                    booking_date=booking_date_obj,
-                    booking_earliest=earliest_time,
-                    booking_latest=latest_time,
-                    is_confirmed=False
-                )
-
-                # Add service to booking if provided
-                if service:
-                    try:
-                        service_obj = Service.objects.get(id=service)
-                        booking.services.add(service_obj)
-                    except Service.DoesNotExist:
-                        pass  # Service not found, continue without adding
+            booking, client = save_booking(request.user, fields)
 
             return render(request, "core/booking_success.html", {
                 "booking": booking,
@@ -486,6 +446,11 @@ def book_service(request):
                 "redirect_url": "booking_info"
             })
 
+        except scheduling.SlotUnavailable as e:
+            return render(request, "core/booking_error.html", {
+                "error_message": str(e)
+            })
+
         except Exception as e:
             error_msg = f"An error occurred while processing your booking: {e}"
             return render(request, "core/booking_error.html", {
@@ -496,6 +461,7 @@ def book_service(request):
     return redirect('bookings')
 
 
+@rate_limit("access_key", token_field="access_key")
 def booking_info(request):
     """
     Display booking information for authenticated users or guests with access key.
@@ -510,82 +476,58 @@ def booking_info(request):
         HttpResponse: Rendered booking info template with booking data or
         access form
     """
-    # Check for session messages from edit operation
-    success_message = request.session.pop('booking_update_success', None)
-    error_message = request.session.pop('booking_update_error', None)
-    session_access_token = request.session.pop('access_token_for_view', None)
+    # Check for flash messages from edit operation
+    success_message = request.flash.pop('booking_update_success', None)
+    error_message = request.flash.pop('booking_update_error', None)
+    view_grant = request.flash.pop('booking_view_grant', None)
     
     if request.user.is_authenticated:
-        # Try to find booking for authenticated user
-        try:
-            client = ClientList.objects.get(user=request.user)
-            booking = Booking.objects.get(client=client)
-            
+        # Find the booking linked to the user, or matched by email
+        resolved = get_request_booking(request)
+        if resolved:
             context = {
-                "booking": booking,
-                "client": client,
+                "booking": resolved.booking,
+                "client": resolved.client,
                 "is_authenticated": True
             }
-            
-            # Add session messages if they exist
+
+            if resolved.linked_by_email:
+                # Link the client to the user account for future access
+                resolved.client.user = request.user
+                resolved.client.save()
+                context["success_message"] = (
+                    "We found your booking and linked it to your account!"
+                )
+
+            # Add flash messages if they exist
             if success_message:
                 context["success_message"] = success_message
             if error_message:
                 context["error_message"] = error_message
-                
+
             return render(request, "core/booking_info.html", context)
-        except (ClientList.DoesNotExist, Booking.DoesNotExist):
-            # No direct user association, try to find booking by email match
-            try:
-                client = ClientList.objects.get(email=request.user.email)
-                booking = Booking.objects.get(client=client)
-                
-                # Link the client to the user account for future access
-                client.user = request.user
-                client.save()
-                
-                context = {
-                    "booking": booking,
-                    "client": client,
-                    "is_authenticated": True,
-                    "success_message": (
-                        "We found your booking and linked it to your account!"
-                    )
-                }
-                
-                # Add session messages if they exist
-                if success_message:
-                    context["success_message"] = success_message
-                if error_message:
-                    context["error_message"] = error_message
-                    
-                return render(request, "core/booking_info.html", context)
-            except (ClientList.DoesNotExist, Booking.DoesNotExist):
-                # User has no booking by user association or email match
-                # Fall through to show access key form
-                pass
-    
-    # Handle guest access - check for session token first
-    if session_access_token:
-        try:
-            booking = Booking.objects.get(access_token=session_access_token)
-            
+        # User has no booking by user association or email match
+        # Fall through to show access key form
+    
+    # Handle guest access - check for a flashed view grant first
+    if view_grant:
+        resolved = get_booking_by_grant(view_grant)
+        if resolved:
             context = {
-                "booking": booking,
-                "client": booking.client,
+                "booking": resolved.booking,
+                "client": resolved.client,
                 "is_authenticated": False,
                 "access_key_used": True
             }
             
-            # Add session messages if they exist
+            # Add flash messages if they exist
             if success_message:
                 context["success_message"] = success_message
             if error_message:
                 context["error_message"] = error_message
                 
             return render(request, "core/booking_info.html", context)
-        except Booking.DoesNotExist:
-            pass  # Fall through to normal flow
+        # Expired grant or cancelled booking, fall through to normal flow
     
     # Handle guest access key submission
     if request.method == "POST":
@@ -597,32 +539,32 @@ def booking_info(request):
                 "is_authenticated": request.user.is_authenticated
             })
         
-        try:
-            booking = Booking.objects.get(access_token=access_key)
-            
+        resolved = get_booking_by_token(access_key)
+        if resolved:
             return render(request, "core/booking_info.html", {
-                "booking": booking,
-                "client": booking.client,
+                "booking": resolved.booking,
+                "client": resolved.client,
                 "is_authenticated": request.user.is_authenticated,
                 "access_key_used": True
             })
-        except Booking.DoesNotExist:
-            error_msg = "Invalid access key. Please check and try again."
-            return render(request, "core/booking_info.html", {
-                "error_message": error_msg,
-                "is_authenticated": request.user.is_authenticated
-            })
+
+        error_msg = "Invalid access key. Please check and try again."
+        return render(request, "core/booking_info.html", {
+            "error_message": error_msg,
+            "is_authenticated": request.user.is_authenticated
+        })
     
     # GET request - show access key form
     context = {"is_authenticated": request.user.is_authenticated}
     
-    # Add any error messages from session
+    # Add any error messages from the flash cookie
     if error_message:
         context["error_message"] = error_message
         
     return render(request, "core/booking_info.html", context)
 
 
+@rate_limit("booking_change", token_field="access_token")
 def edit_booking(request):
     """
     Handle booking edit form submissions.
@@ -639,30 +581,19 @@ def edit_booking(request):
     if request.method != "POST":
         return redirect('booking_info')
     
-    # Get booking based on user authentication or access token
-    booking = None
-    
+    # Get booking based on user authentication or access token; users may
+    # only change the booking linked to their account
     if request.user.is_authenticated:
-        try:
-            client = ClientList.objects.get(user=request.user)
-            booking = Booking.objects.get(client=client)
-        except (ClientList.DoesNotExist, Booking.DoesNotExist):
+        resolved = get_request_owned_booking(request)
+        if not resolved:
             return redirect('bookings')
     else:
-        # For guests, we need to identify the booking somehow
-        # This could be through a hidden field in the form or session
-        # For now, let's handle it through a hidden field in the form
-        access_token = request.POST.get('access_token')
-        if access_token:
-            try:
-                booking = Booking.objects.get(access_token=access_token)
-            except Booking.DoesNotExist:
-                return redirect('booking_info')
-        else:
+        # Guests identify their booking through a hidden access_token field
+        resolved = get_booking_by_token(request.POST.get('access_token'))
+        if not resolved:
             return redirect('booking_info')
-    
-    if not booking:
-        return redirect('booking_info')
+
+    booking = resolved.booking
     
     # Get form data
     booking_date = request.POST.get('booking_date')
@@ -688,40 +619,36 @@ def edit_booking(request):
         earliest_time = f"{earliest_hour.zfill(2)}{earliest_min.zfill(2)}"
         latest_time = f"{latest_hour.zfill(2)}{latest_min.zfill(2)}"
         
-        # Validate time range
-        if latest_time <= earliest_time:
-            raise ValueError("Latest time must be after earliest time")
-        
-        # Update booking
-        booking.booking_date = booking_date
-        booking.booking_earliest = earliest_time
-        booking.booking_latest = latest_time
-        booking.save()
+        # Validate the time range and update the booking, refusing windows
+        # that would overbook
+        booking_date = date.fromisoformat(booking_date)
+        reschedule_booking(booking, booking_date, earliest_time, latest_time)
         
         # Redirect back to booking_info with success message
         success_msg = "Booking updated successfully!"
         if request.user.is_authenticated:
-            request.session['booking_update_success'] = success_msg
+            request.flash['booking_update_success'] = success_msg
             return redirect('booking_info')
         else:
-            # For guests, we need to pass the access token to show the booking
-            # We'll use session to store a success message
-            request.session['booking_update_success'] = success_msg
-            request.session['access_token_for_view'] = booking.access_token
+            # Guests get a short-lived grant to see the booking after the
+            # redirect; the token itself never goes in the cookie
+            request.flash['booking_update_success'] = success_msg
+            request.flash['booking_view_grant'] = make_view_grant(booking.pk)
             return redirect('booking_info')
         
     except Exception as e:
-        # Handle errors by redirecting back with error in session
+        # Handle errors by redirecting back with error in the flash cookie
         error_msg = f"Error updating booking: {str(e)}"
         if request.user.is_authenticated:
-            request.session['booking_update_error'] = error_msg
+            request.flash['booking_update_error'] = error_msg
             return redirect('booking_info')
         else:
-            request.session['booking_update_error'] = error_msg
-            request.session['access_token_for_view'] = booking.access_token
+            request.flash['booking_update_error'] = error_msg
+            request.flash['booking_view_grant'] = make_view_grant(booking.pk)
             return redirect('booking_info')
 
 
+@rate_limit("booking_change", token_field="access_token")
 def cancel_booking(request):
     """
     Handle booking cancellation by deleting the client record.
@@ -739,34 +666,26 @@ def cancel_booking(request):
     if request.method != "POST":
         return redirect('booking_info')
     
-    # Get the client and booking based on user authentication or access token
-    client = None
-    booking = None
-    
+    # Get the client and booking based on user authentication or access
+    # token; users may only cancel the booking linked to their account
     if request.user.is_authenticated:
-        try:
-            client = ClientList.objects.get(user=request.user)
-            booking = Booking.objects.get(client=client)
-        except (ClientList.DoesNotExist, Booking.DoesNotExist):
-            request.session['booking_error'] = "No booking found to cancel."
+        resolved = get_request_owned_booking(request)
+        if not resolved:
+            request.flash['booking_error'] = "No booking found to cancel."
             return redirect('bookings')
     else:
         # For guests, get access token from form
         access_token = request.POST.get('access_token')
-        if access_token:
-            try:
-                booking = Booking.objects.get(access_token=access_token)
-                client = booking.client
-            except Booking.DoesNotExist:
-                request.session['booking_error'] = "Invalid access token."
-                return redirect('bookings')
-        else:
-            request.session['booking_error'] = "Access token required."
+        if not access_token:
+            request.flash['booking_error'] = "Access token required."
             return redirect('bookings')
-    
-    if not client or not booking:
-        request.session['booking_error'] = "No booking found to cancel."
-        return redirect('bookings')
+        resolved = get_booking_by_token(access_token)
+        if not resolved:
+            request.flash['booking_error'] = "Invalid access token."
+            return redirect('bookings')
+
+    client = resolved.client
+    booking = resolved.booking
     
     try:
         # Store booking details for confirmation message
@@ -775,29 +694,32 @@ def cancel_booking(request):
         # Delete the client record (this will cascade delete the booking)
         client.delete()
         
-        # Set success message in session
+        # Set success message in the flash cookie
         success_msg = (
             f"Your booking for {booking_date.strftime('%B %d, %Y')} has been "
             f"successfully cancelled."
         )
-        request.session['booking_success'] = success_msg
+        request.flash['booking_success'] = success_msg
         
         return redirect('bookings')
         
     except Exception as e:
         # Handle any errors during deletion
         error_msg = f"Error cancelling booking: {str(e)}"
-        request.session['booking_error'] = error_msg
+        request.flash['booking_error'] = error_msg
         return redirect('booking_info')
 
 
+@rate_limit("contact", json=True)
 def contact_view(request):
     """
     Handle contact form submissions via AJAX.
     
     Processes contact form data submitted through the modal form,
-    validates the input, saves the message to the database, and
-    returns a JSON response indicating success or failure.
+    validates the input, queues the message in the contact spool, and
+    returns a JSON response indicating success or failure. Queued
+    messages are inserted in batches by `manage.py flush_contacts`
+    (see core/spool.py).
     
     Args:
         request: HTTP request object containing form data
@@ -809,8 +731,8 @@ def contact_view(request):
         try:
             form = ContactForm(request.POST)
             if form.is_valid():
-                # Save the contact message
-                form.save()
+                # Queue the message; the flush worker inserts it in a batch
+                spool.spool_contact(form.cleaned_data)
                 return JsonResponse({
                     'success': True,
                     'message': ('Thank you for your message! '
@@ -836,6 +758,78 @@ def contact_view(request):
     })
 
 
+# ============================================================================
+# API VIEWS - Versioned, read-only JSON API for services
+# ============================================================================
+
+# The catalog ETag is the same for every service and fieldset, so the
+# conditional GET check and the public caching headers only wrap responses
+# whose request has been validated and whose service has been found:
+# errors are neither answered with 304 nor cached by shared caches.
+
+@cache_control(public=True, max_age=settings.API_CACHE_MAX_AGE)
+@catalog_feed_condition
+def _api_list_response(request, fields):
+    """Stream the service list, or answer a conditional GET with 304."""
+    return StreamingHttpResponse(
+        api.stream_list(fields), content_type="application/json"
+    )
+
+
+@cache_control(public=True, max_age=settings.API_CACHE_MAX_AGE)
+@catalog_feed_condition
+def _api_detail_response(request, encoded, fields):
+    """Return one encoded service, or answer a conditional GET with 304."""
+    return HttpResponse(
+        api.render_object(encoded, fields), content_type="application/json"
+    )
+
+
+def api_service_list(request):
+    """
+    Return every available service as JSON, streamed.
+
+    Query parameters:
+        fields: Comma-separated sparse fieldset (default: all fields)
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        StreamingHttpResponse: {"results": [{...}, ...]}, or a 400 JSON
+        response for an unknown field
+    """
+    try:
+        fields = api.parse_fields(request.GET.get("fields"))
+    except api.InvalidFields as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return _api_list_response(request, fields)
+
+
+def api_service_detail(request, slug):
+    """
+    Return one available service as JSON.
+
+    Query parameters:
+        fields: Comma-separated sparse fieldset (default: all fields)
+
+    Args:
+        request: HTTP request object
+        slug (str): URL-friendly identifier for the service
+
+    Returns:
+        HttpResponse: The service object, or a 400/404 JSON response
+    """
+    try:
+        fields = api.parse_fields(request.GET.get("fields"))
+    except api.InvalidFields as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    encoded = api.encoded_catalog().get(slug)
+    if encoded is None:
+        return JsonResponse({"error": "Service not found."}, status=404)
+    return _api_detail_response(request, encoded, fields)
+
+
 # ============================================================================
 # ERROR HANDLER VIEWS - Custom error pages for HTTP status codes
 # ============================================================================
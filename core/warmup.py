@@ -0,0 +1,162 @@
+# ============================================================================
+# WARMUP MODULE - Pay first-request costs before a worker takes traffic
+# ============================================================================
+# A fresh gunicorn worker imports most views and forms on its first request,
+# builds the URL resolvers' reverse lookups on its first reverse(), compiles
+# each template the first time it is rendered (the cached loader keeps it
+# afterwards) and connects to the database and the cache. Whoever sends the
+# first requests after a deploy or a worker recycle waits for all of it.
+#
+# warm_up_process() does the per-process work ahead of time. It opens no
+# connections, so config/gunicorn.conf.py runs it once in the master when
+# the app is preloaded, and forked workers inherit the warm state.
+# warm_up_connections() runs in each worker, as connections must not be
+# shared across a fork. Run "python manage.py startup_report" to see what
+# each part costs.
+
+import time
+from importlib import import_module
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import get_resolver
+from django.utils.module_loading import module_has_submodule
+
+# App submodules imported up front, when an app has them
+APP_MODULES = ("views", "forms", "api")
+
+# Files compiled as templates
+TEMPLATE_SUFFIXES = (".html", ".txt")
+
+
+def import_apps():
+    """Import the URLconf and the views and forms of every app."""
+    count = 0
+    for app_config in apps.get_app_configs():
+        for name in APP_MODULES:
+            if module_has_submodule(app_config.module, name):
+                import_module(f"{app_config.name}.{name}")
+                count += 1
+    import_module(settings.ROOT_URLCONF)
+    return f"{count} modules"
+
+
+def populate_urls():
+    """Build the reverse lookups of every URL resolver."""
+    def populate(resolver):
+        names = len(resolver.reverse_dict)
+        for _, sub_resolver in resolver.namespace_dict.values():
+            names += populate(sub_resolver)
+        return names
+
+    return f"{populate(get_resolver())} names"
+
+
+def _template_names(engine):
+    """Yield the name of every template file the engine's loaders find."""
+    seen = set()
+    for loader in engine.template_loaders:
+        # The cached loader wraps the filesystem and app loaders
+        for inner in getattr(loader, "loaders", [loader]):
+            for directory in inner.get_dirs():
+                for path in sorted(Path(directory).rglob("*")):
+                    if path.suffix not in TEMPLATE_SUFFIXES:
+                        continue
+                    name = path.relative_to(directory).as_posix()
+                    if name not in seen and path.is_file():
+                        seen.add(name)
+                        yield name
+
+
+def compile_templates():
+    """Compile every template into the cached loader."""
+    compiled = skipped = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in _template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+                compiled += 1
+            except TemplateSyntaxError:
+                # Templates of app features the site does not use, which
+                # load tag libraries that are not installed
+                skipped += 1
+    return f"{compiled} templates, {skipped} skipped"
+
+
+def open_connections(serving_thread):
+    """
+    Connect to the databases and the cache.
+
+    Connections are per thread, so a plain connection is only opened when
+    the calling thread goes on to serve requests and keeps connections
+    between them. Pooled connections go back to the pool, which any thread
+    can take them from.
+
+    Args:
+        serving_thread (bool): Whether this thread will serve requests
+    """
+    opened = 0
+    for connection in connections.all(initialized_only=False):
+        pooled = "pool" in connection.settings_dict.get("OPTIONS", {})
+        persistent = connection.settings_dict["CONN_MAX_AGE"] != 0
+        if pooled or (serving_thread and persistent):
+            connection.ensure_connection()
+            if pooled:
+                connection.close()
+            opened += 1
+    cache.get("core:warmup")
+    return f"{opened} database connections"
+
+
+def _run(steps):
+    """Run steps, returning (name, seconds, detail) for each."""
+    timings = []
+    for name, step in steps:
+        start = time.perf_counter()
+        detail = step()
+        timings.append((name, time.perf_counter() - start, detail))
+    return timings
+
+
+def warm_up_process():
+    """
+    Import, resolve and compile everything, without opening connections.
+
+    Returns:
+        list: (step name, seconds, detail) per step
+    """
+    return _run([
+        ("imports", import_apps),
+        ("urls", populate_urls),
+        ("templates", compile_templates),
+    ])
+
+
+def warm_up_connections(serving_thread=True):
+    """
+    Open the connections a worker's first request would open.
+
+    Args:
+        serving_thread (bool): Whether this thread will serve requests
+
+    Returns:
+        list: (step name, seconds, detail) per step
+    """
+    return _run([
+        ("connections", lambda: open_connections(serving_thread)),
+    ])
+
+
+def format_timings(timings):
+    """Format warm-up timings for a log line."""
+    return "; ".join(
+        f"{name} {seconds * 1000:.0f} ms ({detail})"
+        for name, seconds, detail in timings
+    )
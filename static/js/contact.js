@@ -0,0 +1,72 @@
+// ============================================================================
+// CONTACT.JS - Contact modal form submission
+// ============================================================================
+// Sends the contact form in the base template's modal with fetch and shows
+// the outcome in the modal, closing it shortly after a successful send.
+
+function handleContactForm(e) {
+  e.preventDefault();
+
+  const form = document.getElementById('contactForm');
+  const formData = new FormData(form);
+  const errorDiv = document.getElementById('contactFormErrors');
+  const successDiv = document.getElementById('contactFormSuccess');
+  const submitBtn = document.querySelector('button[form="contactForm"]');
+
+  // Reset alerts
+  errorDiv.classList.add('d-none');
+  successDiv.classList.add('d-none');
+
+  // Disable submit button
+  submitBtn.disabled = true;
+  submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Sending...';
+
+  fetch(form.action, {
+    method: 'POST',
+    body: formData,
+    headers: {
+      'X-CSRFToken': formData.get('csrfmiddlewaretoken')
+    }
+  })
+  .then(response => response.json())
+  .then(data => {
+    if (data.success) {
+      successDiv.textContent = data.message;
+      successDiv.classList.remove('d-none');
+      form.reset();
+
+      // Close modal after 2 seconds
+      setTimeout(() => {
+        bootstrap.Modal.getInstance(document.getElementById('contactModal')).hide();
+        successDiv.classList.add('d-none');
+      }, 2000);
+    } else {
+      if (data.errors) {
+        let errorText = 'Please correct the following errors:\\n';
+        for (const [field, errors] of Object.entries(data.errors)) {
+          errorText += `${field}: ${errors.join(', ')}\\n`;
+        }
+        errorDiv.textContent = errorText;
+      } else {
+        errorDiv.textContent = data.message;
+      }
+      errorDiv.classList.remove('d-none');
+    }
+  })
+  .catch(error => {
+    console.error('Error:', error);
+    errorDiv.textContent = 'An error occurred. Please try again.';
+    errorDiv.classList.remove('d-none');
+  })
+  .finally(() => {
+    // Re-enable submit button
+    submitBtn.disabled = false;
+    submitBtn.innerHTML = '<i class="fas fa-paper-plane me-2"></i>Send Message';
+  });
+}
+
+// Attach event listeners
+document.addEventListener('DOMContentLoaded', function() {
+  document.getElementById('contactForm').addEventListener('submit', handleContactForm);
+  document.querySelector('button[form="contactForm"]').addEventListener('click', handleContactForm);
+});